@@ -0,0 +1,75 @@
+# benchmarks/bench_dialogue_wrap.py
+
+"""
+Compara el ajuste de diálogos anterior (reconstruir la línea candidata y
+pasarle una expresión regular por cada palabra) con wrap_dialogues, y
+comprueba que el resultado es el mismo con las reglas por defecto.
+
+Uso: python benchmarks/bench_dialogue_wrap.py [N ...]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from guion_editor.utils.dialog_wrap import WrapRules, wrap_dialogues, PARENTHESES, BRACKETS
+
+WORDS = "hola qué tal estoy bien gracias vamos a la playa mañana por la tarde pues-no-lo-sé".split()
+NOTES = ["(ríe)", "(susurrando muy bajo)", "[OFF]"]
+
+
+def contar_caracteres(dialogo):
+    dialogo_limpio = re.sub(r'\([^)]*\)', '', dialogo)
+    return len(dialogo_limpio)
+
+
+def ajustar_dialogo(dialogo):
+    palabras = dialogo.split()
+    linea_actual = ""
+    lineas_ajustadas = []
+    for palabra in palabras:
+        test_linea = linea_actual + (" " if linea_actual else "") + palabra
+        if contar_caracteres(test_linea) > 60:
+            lineas_ajustadas.append(linea_actual)
+            linea_actual = palabra
+        else:
+            linea_actual = test_linea
+    if linea_actual:
+        lineas_ajustadas.append(linea_actual)
+    return "\n".join(lineas_ajustadas)
+
+
+def make_dialogues(n):
+    random.seed(1)
+    dialogues = []
+    for _ in range(n):
+        words = random.choices(WORDS, k=random.randint(3, 60))
+        if random.random() < 0.2:  # Una de cada cinco intervenciones lleva acotación
+            words.insert(random.randrange(len(words)), random.choice(NOTES))
+        dialogues.append(" ".join(words))
+    return dialogues
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(sizes):
+    print(f"{'líneas':>8} {'anterior ms':>12} {'nuevo ms':>9} {'con [ ] ms':>11}")
+    for n in sizes:
+        dialogues = make_dialogues(n)
+        old_time, expected = timed(lambda: [ajustar_dialogo(text) for text in dialogues])
+        new_time, wrapped = timed(wrap_dialogues, dialogues)
+        assert wrapped == expected
+        brackets_time, _ = timed(wrap_dialogues, dialogues, WrapRules(60, (PARENTHESES, BRACKETS)))
+        print(f"{n:>8} {old_time * 1000:>12.1f} {new_time * 1000:>9.1f} {brackets_time * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
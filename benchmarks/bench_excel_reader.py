@@ -0,0 +1,111 @@
+# benchmarks/bench_excel_reader.py
+
+"""
+Compara la lectura de guiones .xlsx con pd.read_excel (ruta anterior) y con
+ExcelScriptReader (openpyxl en modo read_only con proyección de columnas).
+
+Cada lectura se ejecuta en un proceso aparte para medir su pico de memoria
+(RSS máximo por encima del proceso ya inicializado) además del tiempo. Las
+hojas de prueba llevan una columna de notas que el editor no usa.
+
+Uso: python benchmarks/bench_excel_reader.py [N ...]
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from openpyxl import Workbook
+
+from guion_editor.utils.timecode import format_time_code
+
+CHARACTERS = ["ANA", "BORJA", "CARLA", "DANI", "EDURNE", "FERMÍN", "GORKA", "HODEI"]
+WORDS = "hola qué tal estoy bien gracias (ríe) vamos a la playa mañana por la tarde".split()
+
+
+def make_sheet(path, n):
+    random.seed(1)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['SCENE', 'IN', 'OUT', 'PERSONAJE', 'DIÁLOGO', 'NOTAS'])
+    for i in range(n):
+        start = i * 75
+        sheet.append([
+            1 + i // 50,
+            format_time_code(start),
+            format_time_code(start + 50),
+            random.choice(CHARACTERS),
+            " ".join(random.choices(WORDS, k=random.randint(3, 30))),
+            " ".join(random.choices(WORDS, k=5)),
+        ])
+    workbook.save(path)
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def read_pandas(path):
+    import pandas as pd
+    return len(pd.read_excel(path))
+
+
+def read_streaming(path):
+    from guion_editor.utils.excel_reader import ExcelScriptReader
+    return sum(1 for _ in ExcelScriptReader(path))
+
+
+def read_streaming_dataframe(path):
+    from guion_editor.utils.excel_reader import read_script_excel
+    return len(read_script_excel(path))
+
+
+METHODS = {
+    'pd.read_excel': read_pandas,
+    'ExcelScriptReader': read_streaming,
+    'read_script_excel': read_streaming_dataframe,
+}
+
+
+def child(method, path):
+    # Importar antes de medir para que la línea base incluya las bibliotecas
+    import pandas  # noqa: F401
+    import guion_editor.utils.excel_reader  # noqa: F401
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    rows = METHODS[method](path)
+    elapsed = time.perf_counter() - start
+    print(rows, elapsed, peak_rss_kb() - baseline)
+
+
+def run(method, path):
+    output = subprocess.run(
+        [sys.executable, __file__, '--child', method, path],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    return int(output[0]), float(output[1]), int(output[2]) / 1024
+
+
+def main(sizes):
+    print(f"{'filas':>7} {'método':>18} {'tiempo ms':>10} {'pico RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"guion_{n}.xlsx")
+            make_sheet(path, n)
+            for method in METHODS:
+                rows, elapsed, rss = run(method, path)
+                assert rows == n, (method, rows)
+                print(f"{n:>7} {method:>18} {elapsed * 1000:>10.1f} {rss:>12.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
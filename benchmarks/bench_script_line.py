@@ -0,0 +1,105 @@
+# benchmarks/bench_script_line.py
+
+"""
+Compara la representación anterior del guion (DataFrame con tiempos como texto
+"HH:MM:SS:FF") con ScriptStore/ScriptLine (tiempos en fotogramas enteros).
+
+Mide la memoria ocupada por N líneas y el rendimiento de la operación que
+repite select_next_row_and_set_in: leer el OUT de una fila y fijarlo como IN de
+la siguiente.
+
+Uso: python benchmarks/bench_script_line.py [N ...]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.utils.timecode import format_time_code
+
+CHARACTERS = ["ANA", "BORJA", "CARLA", "DANI", "EDURNE", "FERMÍN", "GORKA", "HODEI"]
+WORDS = "hola qué tal estoy bien gracias (ríe) vamos a la playa mañana por la tarde".split()
+
+
+def make_rows(n):
+    random.seed(1)
+    rows = []
+    for i in range(n):
+        start = i * 75
+        rows.append({
+            'ID': i,
+            'SCENE': 1 + i // 50,
+            'IN': format_time_code(start),
+            'OUT': format_time_code(start + 50),
+            'PERSONAJE': random.choice(CHARACTERS),
+            'DIÁLOGO': " ".join(random.choices(WORDS, k=random.randint(3, 30))),
+        })
+    return rows
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+# --- Representación anterior ---
+
+def ms_from_time_code(time_code):
+    hours, minutes, seconds, frames = map(int, time_code.split(':'))
+    return (hours * 3600 + minutes * 60 + seconds) * 1000 + int((frames / 25) * 1000)
+
+
+def time_code_from_ms(ms):
+    total_seconds = ms // 1000
+    frames = int((ms % 1000) / (1000 / 25))
+    return f"{total_seconds // 3600:02}:{(total_seconds // 60) % 60:02}:{total_seconds % 60:02}:{frames:02}"
+
+
+def chain_dataframe(df):
+    for row in range(df.shape[0] - 1):
+        out_ms = ms_from_time_code(df.at[row, 'OUT'])
+        time_code = time_code_from_ms(out_ms)
+        if time_code != df.at[row + 1, 'IN']:
+            df.at[row + 1, 'IN'] = time_code
+
+
+# --- ScriptStore ---
+
+def chain_store(store):
+    for row in range(len(store) - 1):
+        out_frames = store.get(row, ScriptStore.COL_OUT)
+        if out_frames != store.get(row + 1, ScriptStore.COL_IN):
+            store.set(row + 1, ScriptStore.COL_IN, out_frames)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'líneas':>8} {'DataFrame MB':>13} {'Store MB':>9} {'DataFrame ms':>13} {'Store ms':>9}")
+    for n in sizes:
+        # Cada representación se construye desde cero para contar también sus textos
+        df, df_size = measure(lambda: pd.DataFrame(make_rows(n)))
+        store, store_size = measure(lambda: ScriptStore.from_dataframe(pd.DataFrame(make_rows(n))))
+        df_time = timed(chain_dataframe, df)
+        store_time = timed(chain_store, store)
+        print(f"{n:>8} {df_size / 1e6:>13.2f} {store_size / 1e6:>9.2f} "
+              f"{df_time * 1000:>13.1f} {store_time * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000])
@@ -0,0 +1,85 @@
+# benchmarks/bench_text_index.py
+
+"""
+Compara la búsqueda anterior de FindReplaceDialog (recorrer todas las filas
+pasando cada texto a minúsculas) con las consultas al TextIndex, por subcadena
+y por inicio de palabra. También mide la construcción del índice y el coste de
+mantenerlo al editar una fila.
+
+Uso: python benchmarks/bench_text_index.py [N ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.models.text_index import TextIndex, PREFIX
+from guion_editor.utils.timecode import format_time_code
+
+CHARACTERS = ["ANA", "BORJA", "CARLA", "DANI", "EDURNE", "FERMÍN", "GORKA", "HODEI"]
+WORDS = "hola qué tal estoy bien gracias (ríe) vamos a la playa mañana por la tarde".split()
+QUERIES = ["playa mañana", "gracias", "ríe", "zzz"]
+REPEAT = 20
+
+
+def make_store(n):
+    random.seed(1)
+    rows = []
+    for i in range(n):
+        start = i * 75
+        rows.append({
+            'SCENE': 1 + i // 50,
+            'IN': format_time_code(start),
+            'OUT': format_time_code(start + 50),
+            'PERSONAJE': random.choice(CHARACTERS),
+            'DIÁLOGO': " ".join(random.choices(WORDS, k=random.randint(3, 30))),
+        })
+    return ScriptStore.from_dataframe(pd.DataFrame(rows))
+
+
+def scan(store, query):
+    query = query.lower()
+    return [
+        row for row in range(len(store))
+        if query in store.get(row, ScriptStore.COL_CHARACTER).lower()
+        or query in store.get(row, ScriptStore.COL_DIALOGUE).lower()
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(*args)
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main(sizes):
+    print(f"{'líneas':>8} {'consulta':>14} {'recorrido ms':>13} {'índice ms':>10} {'prefijo ms':>11}")
+    for n in sizes:
+        store = make_store(n)
+        index = TextIndex()
+        index.attach(store)
+        start = time.perf_counter()
+        index.search("x")
+        build_time = time.perf_counter() - start
+        for query in QUERIES:
+            scan_time, expected = timed(scan, store, query)
+            index_time, found = timed(index.search, query)
+            prefix_time, _ = timed(index.search, query, TextIndex.COLUMNS, PREFIX)
+            assert found == expected
+            print(f"{n:>8} {query:>14} {scan_time * 1000:>13.2f} {index_time * 1000:>10.3f} {prefix_time * 1000:>11.3f}")
+        start = time.perf_counter()
+        for row in range(100):
+            store.set(row, ScriptStore.COL_DIALOGUE, "texto editado en la fila")
+        edit_time = (time.perf_counter() - start) / 100
+        print(f"{n:>8} construcción {build_time * 1000:.1f} ms, reindexar una fila {edit_time * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
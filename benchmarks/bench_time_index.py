@@ -0,0 +1,80 @@
+# benchmarks/bench_time_index.py
+
+"""
+Compara buscar las filas activas en un fotograma recorriendo todo el guion
+con la consulta al TimeIndex, como haría "seguir reproducción" en cada
+fotograma del video. También mide la construcción del índice y el coste de
+mantenerlo al editar un OUT.
+
+Uso: python benchmarks/bench_time_index.py [N ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.models.time_index import TimeIndex
+from guion_editor.utils.timecode import format_time_code
+
+TICKS = 1000
+
+
+def make_store(n):
+    random.seed(1)
+    rows = []
+    for i in range(n):
+        start = i * 75
+        rows.append({
+            'SCENE': 1 + i // 50,
+            'IN': format_time_code(start),
+            'OUT': format_time_code(start + random.randint(20, 120)),  # Algunas se solapan
+            'PERSONAJE': "ANA",
+            'DIÁLOGO': "hola",
+        })
+    return ScriptStore.from_dataframe(pd.DataFrame(rows))
+
+
+def scan(store, frame):
+    active = []
+    for position in range(len(store)):
+        line = store.row(position)
+        if line.in_frames <= frame < line.out_frames:
+            active.append(line.id)
+    return active
+
+
+def main(sizes):
+    print(f"{'líneas':>8} {'recorrido µs':>13} {'índice µs':>10} {'construcción ms':>16} {'editar OUT µs':>14}")
+    for n in sizes:
+        store = make_store(n)
+        frames = [random.randrange(n * 75) for _ in range(TICKS)]
+        index = TimeIndex()
+        index.attach(store)
+        start = time.perf_counter()
+        index.ensure_built()
+        build_time = time.perf_counter() - start
+
+        ticks = frames[:50]
+        start = time.perf_counter()
+        expected = [scan(store, frame) for frame in ticks]
+        scan_time = (time.perf_counter() - start) / len(ticks)
+        start = time.perf_counter()
+        found = [index.active_rows(frame) for frame in frames]
+        index_time = (time.perf_counter() - start) / len(frames)
+        assert [sorted(rows) for rows in found[:50]] == [sorted(rows) for rows in expected]
+
+        start = time.perf_counter()
+        for position in range(100):
+            store.set(position, ScriptStore.COL_OUT, store.get(position, ScriptStore.COL_OUT) + 10)
+        edit_time = (time.perf_counter() - start) / 100
+        print(f"{n:>8} {scan_time * 1e6:>13.0f} {index_time * 1e6:>10.1f} {build_time * 1000:>16.1f} {edit_time * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
@@ -1,13 +1,19 @@
 # guion_editor/delegates/custom_delegates.py
 
-from PyQt5.QtWidgets import QStyledItemDelegate, QLineEdit, QMessageBox, QCompleter
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QStyledItemDelegate, QLineEdit, QMessageBox, QStyle,
+    QStyleOptionViewItem, QApplication
+)
+from PyQt5.QtCore import Qt, QRect, QSize, QPointF
+from PyQt5.QtGui import QPalette, QTextLayout, QTextOption, QTextCharFormat, QFontMetrics
 from guion_editor.widgets.time_code_edit import TimeCodeEdit
+from guion_editor.widgets.custom_text_edit import CustomTextEdit
+from guion_editor.utils.text_metrics import TextHeightCache
 
 
 class TimeCodeDelegate(QStyledItemDelegate):
     def createEditor(self, parent, option, index):
-        editor = TimeCodeEdit(parent)
+        editor = TimeCodeEdit(parent, frame_rate=index.model().store.frame_rate)
         return editor
 
     def setEditorData(self, editor, index):
@@ -22,17 +28,20 @@ class TimeCodeDelegate(QStyledItemDelegate):
         editor.setGeometry(option.rect)
 
 class CharacterDelegate(QStyledItemDelegate):
-    
-    def __init__(self, get_names_callback=None, parent=None):
+    """
+    Editor de PERSONAJE. Todos los editores usan el mismo QCompleter, cuyo
+    modelo de nombres se mantiene al día por separado, así que abrir un editor
+    no depende del tamaño del guion.
+    """
+
+    def __init__(self, completer=None, parent=None):
         super().__init__(parent)
-        self.get_names_callback = get_names_callback
+        self.completer = completer
 
     def createEditor(self, parent, option, index):
         editor = QLineEdit(parent)
-        if self.get_names_callback:
-            completer = QCompleter(self.get_names_callback())
-            completer.setCaseSensitivity(Qt.CaseInsensitive)
-            editor.setCompleter(completer)
+        if self.completer is not None:
+            editor.setCompleter(self.completer)
         return editor
 
     def setEditorData(self, editor, index):
@@ -48,3 +57,109 @@ class CharacterDelegate(QStyledItemDelegate):
 
     def updateEditorGeometry(self, editor, option, index):
         editor.setGeometry(option.rect)
+
+class DialogueDelegate(QStyledItemDelegate):
+    """
+    Pinta el diálogo como texto con ajuste de línea y solo crea un
+    CustomTextEdit para la celda que se está editando. Las alturas medidas se
+    guardan en una TextHeightCache.
+    """
+    TEXT_MARGIN = 4
+    TEXT_FLAGS = Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.height_cache = TextHeightCache()
+        self.closed_cursor = None  # (ID de fila, texto, posición del cursor) del último editor cerrado
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        painter.save()
+        if opt.state & QStyle.State_Selected:
+            painter.setPen(opt.palette.color(QPalette.HighlightedText))
+        else:
+            painter.setPen(opt.palette.color(QPalette.Text))
+        painter.setFont(opt.font)
+        model = index.model()
+        spans = index.data(model.MATCH_SPANS_ROLE)
+        if spans:
+            self.draw_highlighted_text(painter, self.text_rect(option.rect), opt.font, text, spans, model.MATCH_COLOR)
+        else:
+            painter.drawText(self.text_rect(option.rect), self.TEXT_FLAGS, text)
+        painter.restore()
+
+    def draw_highlighted_text(self, painter, rect, font, text, spans, color):
+        # Mismo ajuste de línea que drawText, con fondo en las coincidencias de búsqueda.
+        # QTextLayout solo corta en U+2028; el cambio no altera las posiciones de spans
+        layout = QTextLayout(text.replace('\n', '\u2028'), font)
+        text_option = QTextOption()
+        text_option.setWrapMode(QTextOption.WordWrap)
+        layout.setTextOption(text_option)
+        highlight = QTextCharFormat()
+        highlight.setBackground(color)
+        ranges = []
+        for start, end in spans:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = end - start
+            format_range.format = highlight
+            ranges.append(format_range)
+        layout.setFormats(ranges)
+        layout.beginLayout()
+        y = 0
+        while True:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(rect.width())
+            line.setPosition(QPointF(0, y))
+            y += line.height()
+        layout.endLayout()
+        painter.setClipRect(rect)
+        layout.draw(painter, QPointF(rect.topLeft()))
+
+    def sizeHint(self, option, index):
+        text = index.data(Qt.DisplayRole) or ""
+        width = max(option.rect.width(), 50)
+        return QSize(width, self.text_height(option.font, width, text))
+
+    def text_rect(self, rect):
+        m = self.TEXT_MARGIN
+        return rect.adjusted(m, m, -m, -m)
+
+    def text_height(self, font, width, text):
+        return self.height_cache.height(text, width, font.key(), lambda: self.measure_text_height(font, width, text))
+
+    def measure_text_height(self, font, width, text):
+        bounds = QFontMetrics(font).boundingRect(
+            QRect(0, 0, width - 2 * self.TEXT_MARGIN, 1 << 20), self.TEXT_FLAGS, text or " "
+        )
+        return bounds.height() + 2 * self.TEXT_MARGIN + 6
+
+    def createEditor(self, parent, option, index):
+        editor = CustomTextEdit(parent)
+        editor.setFont(option.font)
+        return editor
+
+    def setEditorData(self, editor, index):
+        text = index.model().data(index, Qt.EditRole)
+        editor.setPlainText(text)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.toPlainText(), Qt.EditRole)
+
+    def destroyEditor(self, editor, index):
+        # Separar Intervención puede necesitar el cursor después de que se cierre el editor
+        cursor = editor.textCursor()
+        position = cursor.selectionEnd() if cursor.hasSelection() else cursor.position()
+        self.closed_cursor = (index.model().get_value(index.row(), 0), editor.toPlainText(), position)
+        super().destroyEditor(editor, index)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
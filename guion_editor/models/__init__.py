@@ -0,0 +1,4 @@
+# guion_editor/models/__init__.py
+
+from .script_store import ScriptStore
+from .script_table_model import ScriptTableModel
@@ -0,0 +1,112 @@
+# guion_editor/models/character_index.py
+
+"""
+Índice personaje -> filas del guion.
+
+Para cada ID de personaje (índice en la tabla de nombres del ScriptStore)
+guarda el conjunto de IDs de sus filas. Como las filas van por ID, insertar,
+eliminar o mover filas solo toca las entradas de esas filas. Se construye la
+primera vez que se consulta y después se mantiene escuchando las escrituras
+del ScriptStore.
+"""
+
+from guion_editor.models.script_store import ScriptStore
+
+
+class CharacterIndex:
+    def __init__(self):
+        self.store = None
+        self._rows_by_character = None  # ID de personaje -> {ID de fila}; None hasta construir
+        self._character_of = {}         # ID de fila -> ID de personaje
+        self._names = None              # Nombres con alguna fila, ordenados (caché)
+
+    def attach(self, store):
+        if self.store is not None:
+            self.store.remove_listener(self._on_store_changed)
+        self.store = store
+        self._rows_by_character = None
+        self._character_of = {}
+        self._names = None
+        store.add_listener(self._on_store_changed)
+
+    def ensure_built(self):
+        if self._rows_by_character is not None or self.store is None:
+            return
+        self._rows_by_character = {}
+        self._character_of = {}
+        store = self.store
+        for position in range(len(store)):
+            line = store.row(position)
+            self._add(line.id, line.character_id)
+
+    # --- Consulta ---
+
+    def names(self):
+        """Nombres de los personajes con al menos una fila, en orden alfabético."""
+        self.ensure_built()
+        if self._names is None:
+            store = self.store
+            self._names = sorted(
+                store.character_name(character_id)
+                for character_id, rows in self._rows_by_character.items() if rows
+            )
+        return self._names
+
+    def row_ids(self, name):
+        self.ensure_built()
+        character_id = self.store.character_id(name)
+        if character_id is None:
+            return set()
+        return self._rows_by_character.get(character_id, set())
+
+    def positions(self, name):
+        """Posiciones, en orden, de las filas del personaje."""
+        return self.store.positions_of(self.row_ids(name))
+
+    # --- Mantenimiento ---
+
+    def _add(self, row_id, character_id):
+        rows = self._rows_by_character.setdefault(character_id, set())
+        if not rows:
+            self._names = None
+        rows.add(row_id)
+        self._character_of[row_id] = character_id
+
+    def _discard(self, row_id):
+        character_id = self._character_of.pop(row_id, None)
+        if character_id is None:
+            return
+        rows = self._rows_by_character[character_id]
+        rows.discard(row_id)
+        if not rows:
+            self._names = None
+
+    def _update(self, line):
+        if self._character_of.get(line.id) != line.character_id:
+            self._discard(line.id)
+            self._add(line.id, line.character_id)
+
+    def _on_store_changed(self, operation, args):
+        if self._rows_by_character is None:
+            return
+        store = self.store
+        if operation == 'set':
+            position, column, _ = args
+            if column == ScriptStore.COL_ID:
+                self._rows_by_character = None
+                self._names = None
+            elif column == ScriptStore.COL_CHARACTER:
+                self._update(store.row(position))
+        elif operation == 'set_many':
+            column, positions, _ = args
+            if column == ScriptStore.COL_CHARACTER:
+                for position in positions:
+                    self._update(store.row(position))
+        elif operation == 'insert':
+            _, lines = args
+            for line in lines:
+                self._add(line.id, line.character_id)
+        elif operation == 'remove':
+            _, _, removed = args
+            for line in removed:
+                self._discard(line.id)
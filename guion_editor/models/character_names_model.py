@@ -0,0 +1,76 @@
+# guion_editor/models/character_names_model.py
+
+from bisect import bisect_left
+
+from PyQt5.QtCore import QModelIndex, QStringListModel
+
+from guion_editor.models.character_stats import LINES
+
+
+class CharacterNamesModel(QStringListModel):
+    """
+    Nombres de personaje para el QCompleter compartido del editor de PERSONAJE,
+    ordenados por número de intervenciones (los que más hablan primero).
+
+    Se actualiza con las notificaciones de CharacterStats: cuando cambia el
+    número de intervenciones de un personaje solo se mueve su entrada, y las
+    entradas se añaden o quitan cuando un personaje aparece o desaparece.
+
+    La lista completa no se calcula al asignar un guion, sino la primera vez
+    que el QCompleter pide las filas: abrir un guion no obliga a leer todas
+    sus líneas para las estadísticas.
+    """
+
+    def __init__(self, stats, parent=None):
+        super().__init__(parent)
+        self.stats = stats
+        self._keys = []  # Clave de orden de cada fila de la lista: (-intervenciones, nombre)
+        self._dirty = True  # La lista se calcula en el primer rowCount
+        stats.add_listener(self.on_stats_changed)
+
+    def _key(self, character_id):
+        return -self.stats.totals(character_id)[LINES], self.stats.store.character_name(character_id)
+
+    def rowCount(self, parent=QModelIndex()):
+        self.ensure_built()
+        return super().rowCount(parent)
+
+    def ensure_built(self):
+        if not self._dirty or self.stats.store is None:
+            return
+        self._dirty = False
+        self.rebuild()
+
+    def rebuild(self):
+        keys = sorted(self._key(character_id) for character_id in self.stats.characters())
+        keys = [key for key in keys if key[1]]  # Las filas sin personaje no aportan sugerencias
+        self._keys = keys
+        self.setStringList([name for _, name in keys])
+
+    def on_stats_changed(self, characters):
+        if self._dirty:
+            return  # Se calculará todo al pedir las filas
+        if characters is None:
+            # Vaciar sin calcular: la lista nueva se hace cuando se vuelva a pedir
+            self._keys = []
+            self.setStringList([])
+            self._dirty = True
+            return
+        for character_id in characters:
+            self._reposition(character_id)
+
+    def _reposition(self, character_id):
+        key = self._key(character_id)
+        name = key[1]
+        # Las claves no guardan el número anterior: buscar la entrada por nombre
+        row = next((row for row, (_, current) in enumerate(self._keys) if current == name), None)
+        if row is not None:
+            if self._keys[row] == key:
+                return
+            self.removeRows(row, 1)
+            del self._keys[row]
+        if key[0] < 0 and name:
+            row = bisect_left(self._keys, key)
+            self.insertRows(row, 1)
+            self.setData(self.index(row), name)
+            self._keys.insert(row, key)
@@ -0,0 +1,138 @@
+# guion_editor/models/character_stats.py
+
+"""
+Estadísticas por personaje: intervenciones, palabras, caracteres y tiempo de
+habla (suma de OUT - IN, en fotogramas).
+
+Se calculan una vez la primera vez que se consultan y después se mantienen
+escuchando las escrituras del ScriptStore. Para cada fila se guarda lo que
+aporta a su personaje, así que cada cambio resta la aportación anterior de la
+fila y suma la nueva: el coste depende de las filas modificadas, no del
+tamaño del guion.
+"""
+
+from guion_editor.models.script_store import ScriptStore
+
+LINES, WORDS, CHARS, FRAMES = range(4)
+
+
+def line_stats(line):
+    return (
+        line.character_id,
+        len(line.dialogue.split()),
+        len(line.dialogue),
+        max(0, line.out_frames - line.in_frames)
+    )
+
+
+class CharacterStats:
+    def __init__(self):
+        self.store = None
+        self._rows = None  # ID de fila -> (personaje, palabras, caracteres, fotogramas); None hasta construir
+        self._totals = {}  # ID de personaje -> [intervenciones, palabras, caracteres, fotogramas]
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """callback(personajes) con los IDs de personaje que han cambiado, o None si ha cambiado todo."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, characters):
+        for callback in list(self._listeners):
+            callback(characters)
+
+    def attach(self, store):
+        if self.store is not None:
+            self.store.remove_listener(self._on_store_changed)
+        self.store = store
+        self._rows = None
+        self._totals = {}
+        store.add_listener(self._on_store_changed)
+        self._notify(None)
+
+    def ensure_built(self):
+        if self._rows is not None or self.store is None:
+            return
+        self._rows = {}
+        self._totals = {}
+        store = self.store
+        for position in range(len(store)):
+            self._add(store.row(position))
+
+    # --- Consulta ---
+
+    def characters(self):
+        """IDs de los personajes con al menos una intervención."""
+        self.ensure_built()
+        return [character_id for character_id, totals in self._totals.items() if totals[LINES]]
+
+    def totals(self, character_id):
+        """(intervenciones, palabras, caracteres, fotogramas) del personaje."""
+        self.ensure_built()
+        return tuple(self._totals.get(character_id, (0, 0, 0, 0)))
+
+    # --- Mantenimiento ---
+
+    def _add(self, line):
+        stats = line_stats(line)
+        self._rows[line.id] = stats
+        totals = self._totals.setdefault(stats[0], [0, 0, 0, 0])
+        totals[LINES] += 1
+        totals[WORDS] += stats[1]
+        totals[CHARS] += stats[2]
+        totals[FRAMES] += stats[3]
+        return stats[0]
+
+    def _discard(self, row_id):
+        stats = self._rows.pop(row_id, None)
+        if stats is None:
+            return None
+        totals = self._totals[stats[0]]
+        totals[LINES] -= 1
+        totals[WORDS] -= stats[1]
+        totals[CHARS] -= stats[2]
+        totals[FRAMES] -= stats[3]
+        return stats[0]
+
+    def _update(self, lines):
+        changed = set()
+        for line in lines:
+            changed.add(self._discard(line.id))
+            changed.add(self._add(line))
+        changed.discard(None)
+        return changed
+
+    def _on_store_changed(self, operation, args):
+        if operation == 'frame_rate':
+            # Los totales van en fotogramas; solo cambia cómo se muestran
+            self._notify(None)
+            return
+        if self._rows is None:
+            return
+        store = self.store
+        if operation == 'set':
+            position, column, _ = args
+            if column == ScriptStore.COL_ID:
+                self._rows = None
+                self._notify(None)
+                return
+            changed = self._update([store.row(position)])
+        elif operation == 'set_many':
+            column, positions, _ = args
+            changed = self._update([store.row(position) for position in positions])
+        elif operation == 'time_columns':
+            changed = self._update([store.row(position) for position in range(len(store))])
+        elif operation == 'insert':
+            _, lines = args
+            changed = {self._add(line) for line in lines}
+        elif operation == 'remove':
+            _, _, removed = args
+            changed = {self._discard(line.id) for line in removed}
+            changed.discard(None)
+        else:
+            return
+        if changed:
+            self._notify(changed)
@@ -0,0 +1,31 @@
+# guion_editor/models/script_line.py
+
+
+class ScriptLine:
+    """
+    Registro compacto de una línea del guion.
+
+    IN y OUT se guardan en fotogramas, el personaje como índice en la tabla de
+    nombres del ScriptStore y la escena y el ID como enteros. Con __slots__
+    cada línea ocupa una fracción de lo que ocupa una fila de DataFrame.
+    """
+    __slots__ = ('id', 'scene', 'in_frames', 'out_frames', 'character_id', 'dialogue', 'extra')
+
+    def __init__(self, id, scene, in_frames, out_frames, character_id, dialogue, extra=None):
+        self.id = id
+        self.scene = scene
+        self.in_frames = in_frames
+        self.out_frames = out_frames
+        self.character_id = character_id
+        self.dialogue = dialogue
+        self.extra = extra  # Valores de columnas extra del archivo importado (tupla) o None
+
+    def copy(self):
+        return ScriptLine(
+            self.id, self.scene, self.in_frames, self.out_frames,
+            self.character_id, self.dialogue, self.extra
+        )
+
+    def __repr__(self):
+        return (f"ScriptLine(id={self.id}, scene={self.scene}, in={self.in_frames}, "
+                f"out={self.out_frames}, character={self.character_id}, dialogue={self.dialogue!r})")
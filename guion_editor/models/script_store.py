@@ -0,0 +1,373 @@
+# guion_editor/models/script_store.py
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from guion_editor.models.script_line import ScriptLine
+from guion_editor.utils.timecode import (
+    DEFAULT_FRAME_RATE, parse_time_code, parse_time_codes, format_time_codes
+)
+
+
+class ScriptStore:
+    """
+    Almacén de las líneas del guion en orden.
+
+    Cada línea es un ScriptLine. Insertar, eliminar o mover una fila no
+    reconstruye ninguna tabla: solo se desplazan referencias en la lista y el
+    índice ID -> posición se revalida de forma perezosa a partir de la primera
+    posición afectada. Mover una fila a una posición contigua
+    (Alt+Arriba/Abajo) es O(1).
+
+    Los nombres de personaje se guardan una sola vez en una tabla de nombres y
+    las líneas solo guardan su índice. Los tiempos se guardan en fotogramas;
+    los códigos de tiempo y el DataFrame solo se generan al mostrar, guardar o
+    exportar (to_dataframe).
+
+    Cada escritura se notifica a los oyentes registrados con add_listener como
+    (operación, argumentos), por ejemplo ('set', (posición, columna, valor)).
+    """
+    COLUMNS = ['ID', 'SCENE', 'IN', 'OUT', 'PERSONAJE', 'DIÁLOGO']
+    COL_ID = 0
+    COL_SCENE = 1
+    COL_IN = 2
+    COL_OUT = 3
+    COL_CHARACTER = 4
+    COL_DIALOGUE = 5
+    TIME_COLUMNS = (COL_IN, COL_OUT)
+
+    def __init__(self, extra_columns=None, frame_rate=DEFAULT_FRAME_RATE):
+        self._listeners = []
+        self._frame_rate = frame_rate
+        # Columnas del archivo importado que no usa el editor; se conservan al exportar
+        self._extra_columns = list(extra_columns or [])
+        self.character_names = []  # ID de personaje -> nombre
+        self._character_ids = {}   # nombre -> ID de personaje
+        self._rows = []
+        self._positions = {}  # ID -> posición, válido por debajo de _dirty_from
+        self._dirty_from = 0
+        self._next_id = 0
+        self.source_path = None  # Archivo del que se leen las filas bajo demanda, si lo hay
+
+    # --- Oyentes ---
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, operation, args):
+        for callback in self._listeners:
+            callback(operation, args)
+
+    @property
+    def frame_rate(self):
+        return self._frame_rate
+
+    @frame_rate.setter
+    def frame_rate(self, frame_rate):
+        self._frame_rate = frame_rate
+        self._notify('frame_rate', (frame_rate,))
+
+    @property
+    def extra_columns(self):
+        return self._extra_columns
+
+    @extra_columns.setter
+    def extra_columns(self, columns):
+        self._extra_columns = list(columns)
+        self._notify('extra_columns', (self._extra_columns,))
+
+    # --- Conversión con DataFrame ---
+
+    @classmethod
+    def from_dataframe(cls, df, frame_rate=DEFAULT_FRAME_RATE):
+        extra_columns = [col for col in df.columns if col not in cls.COLUMNS]
+        store = cls(extra_columns, frame_rate)
+        if 'ID' not in df.columns:
+            df = df.assign(ID=range(len(df)))
+        if 'SCENE' not in df.columns:
+            df = df.assign(SCENE=1)  # Como al cargar en el editor
+        columns = [df[col].tolist() for col in cls.COLUMNS]
+        # Los tiempos se convierten a fotogramas en una sola pasada por columna
+        for col in cls.TIME_COLUMNS:
+            columns[col] = parse_time_codes(columns[col], frame_rate).tolist()
+        extras = zip(*[df[col].tolist() for col in extra_columns]) if extra_columns else None
+        rows = []
+        for values in zip(*columns):
+            line = store.make_line(values)
+            if extras is not None:
+                line.extra = next(extras)
+            rows.append(line)
+        store._rows = rows
+        store._next_id = max((line.id for line in rows), default=-1) + 1
+        return store
+
+    @classmethod
+    def from_rows(cls, rows, character_names, extra_columns=None, frame_rate=DEFAULT_FRAME_RATE, next_id=None):
+        """
+        Crea un store sobre una secuencia de filas ya construida, por ejemplo
+        una que decodifica cada ScriptLine la primera vez que se consulta.
+        """
+        store = cls(extra_columns, frame_rate)
+        for name in character_names:
+            store.intern_character(name)
+        store._rows = rows
+        store._next_id = next_id if next_id is not None else max((line.id for line in rows), default=-1) + 1
+        return store
+
+    def release_source(self):
+        """Decodifica las filas pendientes y suelta el archivo del que se leían."""
+        release = getattr(self._rows, 'release', None)
+        if release is not None:
+            release()
+        self.source_path = None
+
+    def to_dataframe(self, include_id=False):
+        rows = self._rows
+        names = self.character_names
+        data = {}
+        if include_id:
+            data['ID'] = [line.id for line in rows]
+        data['SCENE'] = [line.scene for line in rows]
+        in_frames, out_frames = self.time_columns()
+        data['IN'] = format_time_codes(in_frames, self.frame_rate)
+        data['OUT'] = format_time_codes(out_frames, self.frame_rate)
+        data['PERSONAJE'] = [names[line.character_id] for line in rows]
+        data['DIÁLOGO'] = [line.dialogue for line in rows]
+        for i, col in enumerate(self.extra_columns):
+            data[col] = [line.extra[i] if line.extra else '' for line in rows]
+        return pd.DataFrame(data)
+
+    def export_columns(self):
+        """Columnas de exportación (sin ID), en el orden de export_rows."""
+        return self.COLUMNS[1:] + self.extra_columns
+
+    def export_rows(self, chunk_size=1000):
+        """
+        Recorre las filas listas para exportar sin construir un DataFrame.
+        Los tiempos se formatean por bloques de chunk_size filas.
+        """
+        names = self.character_names
+        blank_extra = ('',) * len(self.extra_columns)
+        for start in range(0, len(self._rows), chunk_size):
+            block = self._rows[start:start + chunk_size]
+            in_codes = format_time_codes([line.in_frames for line in block], self.frame_rate)
+            out_codes = format_time_codes([line.out_frames for line in block], self.frame_rate)
+            for line, time_in, time_out in zip(block, in_codes, out_codes):
+                row = [line.scene, time_in, time_out, names[line.character_id], line.dialogue]
+                if blank_extra:
+                    row.extend(line.extra or blank_extra)
+                yield row
+
+    def make_line(self, values):
+        """Crea un ScriptLine a partir de valores en el orden de COLUMNS, normalizando los tipos."""
+        row_id, scene, time_in, time_out, character, dialogue = values
+        return ScriptLine(
+            self._to_int(row_id, 0),
+            self._to_int(scene, 1),
+            self._to_frames(time_in),
+            self._to_frames(time_out),
+            self.intern_character(self._to_text(character)),
+            self._to_text(dialogue),
+            ('',) * len(self.extra_columns) if self.extra_columns else None
+        )
+
+    @staticmethod
+    def _to_int(value, default):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    @staticmethod
+    def _to_text(value):
+        if value is None or (isinstance(value, float) and value != value):
+            return ''
+        return str(value)
+
+    def _to_frames(self, value):
+        if isinstance(value, int):
+            return value
+        try:
+            return parse_time_code(value, self.frame_rate)
+        except (TypeError, ValueError):
+            return 0
+
+    # --- Personajes ---
+
+    def intern_character(self, name):
+        character_id = self._character_ids.get(name)
+        if character_id is None:
+            character_id = len(self.character_names)
+            self.character_names.append(sys.intern(name))
+            self._character_ids[name] = character_id
+        return character_id
+
+    def character_name(self, character_id):
+        return self.character_names[character_id]
+
+    def character_id(self, name):
+        """ID del personaje, o None si el nombre no está en la tabla de nombres."""
+        return self._character_ids.get(name)
+
+    # --- Lectura ---
+
+    def __len__(self):
+        return len(self._rows)
+
+    def row(self, position):
+        return self._rows[position]
+
+    def copy_rows(self):
+        """Copia de todas las líneas, que se puede leer desde otro hilo."""
+        return [line.copy() for line in self._rows]
+
+    def get(self, position, column):
+        line = self._rows[position]
+        if column == self.COL_DIALOGUE:
+            return line.dialogue
+        if column == self.COL_CHARACTER:
+            return self.character_names[line.character_id]
+        if column == self.COL_IN:
+            return line.in_frames
+        if column == self.COL_OUT:
+            return line.out_frames
+        if column == self.COL_SCENE:
+            return line.scene
+        return line.id
+
+    def column(self, column):
+        return [self.get(position, column) for position in range(len(self._rows))]
+
+    def time_columns(self):
+        """Devuelve (IN, OUT) como arrays de fotogramas."""
+        count = len(self._rows)
+        in_frames = np.fromiter((line.in_frames for line in self._rows), dtype=np.int64, count=count)
+        out_frames = np.fromiter((line.out_frames for line in self._rows), dtype=np.int64, count=count)
+        return in_frames, out_frames
+
+    def timing_arrays(self):
+        """(ID, IN, OUT, personaje) por posición como arrays; con un .dlgp, sin decodificar las filas."""
+        timing_arrays = getattr(self._rows, 'timing_arrays', None)
+        if timing_arrays is not None:
+            return timing_arrays()
+        count = len(self._rows)
+        return tuple(
+            np.fromiter((getattr(line, name) for line in self._rows), dtype=np.int64, count=count)
+            for name in ('id', 'in_frames', 'out_frames', 'character_id')
+        )
+
+    def next_id(self):
+        return self._next_id
+
+    def position_of(self, row_id):
+        position = self._positions.get(row_id)
+        if position is not None and position < self._dirty_from and self._rows[position].id == row_id:
+            return position
+        # Revalidar el índice desde la primera posición afectada por un cambio
+        for position in range(self._dirty_from, len(self._rows)):
+            self._positions[self._rows[position].id] = position
+        self._dirty_from = len(self._rows)
+        position = self._positions.get(row_id)
+        if position is not None and self._rows[position].id == row_id:
+            return position
+        return None
+
+    def positions_of(self, row_ids):
+        """Devuelve en orden las posiciones de un conjunto de IDs; omite los que no existen."""
+        if len(row_ids) * 8 > len(self._rows):
+            # Muchos IDs: un recorrido de las filas ya sale ordenado
+            return [position for position, line in enumerate(self._rows) if line.id in row_ids]
+        positions = (self.position_of(row_id) for row_id in row_ids)
+        return sorted(position for position in positions if position is not None)
+
+    # --- Escritura ---
+
+    def set(self, position, column, value):
+        line = self._rows[position]
+        if column == self.COL_DIALOGUE:
+            line.dialogue = str(value)
+        elif column == self.COL_CHARACTER:
+            line.character_id = self.intern_character(str(value))
+        elif column == self.COL_IN:
+            line.in_frames = int(value)
+        elif column == self.COL_OUT:
+            line.out_frames = int(value)
+        elif column == self.COL_SCENE:
+            line.scene = int(value)
+        else:
+            line.id = int(value)
+            self._invalidate(position)
+            self._next_id = max(self._next_id, line.id + 1)
+        self._notify('set', (position, column, self.get(position, column)))
+
+    def set_many(self, column, positions, values):
+        """Escribe varios valores de una columna y lo notifica una sola vez."""
+        positions = list(positions)
+        values = list(values)
+        rows = self._rows
+        if column == self.COL_DIALOGUE:
+            for position, value in zip(positions, values):
+                rows[position].dialogue = str(value)
+        elif column == self.COL_CHARACTER:
+            for position, value in zip(positions, values):
+                rows[position].character_id = self.intern_character(str(value))
+        elif column == self.COL_SCENE:
+            for position, value in zip(positions, values):
+                rows[position].scene = int(value)
+        elif column == self.COL_IN:
+            for position, value in zip(positions, values):
+                rows[position].in_frames = int(value)
+        elif column == self.COL_OUT:
+            for position, value in zip(positions, values):
+                rows[position].out_frames = int(value)
+        else:
+            for position, value in zip(positions, values):
+                self.set(position, column, value)
+            return
+        self._notify('set_many', (column, positions, [self.get(position, column) for position in positions]))
+
+    def set_time_columns(self, in_frames, out_frames):
+        for line, time_in, time_out in zip(self._rows, in_frames.tolist(), out_frames.tolist()):
+            line.in_frames = time_in
+            line.out_frames = time_out
+        self._notify('time_columns', (in_frames, out_frames))
+
+    def insert(self, position, lines):
+        lines = list(lines)
+        self._rows[position:position] = lines
+        for line in lines:
+            self._next_id = max(self._next_id, line.id + 1)
+        self._invalidate(position)
+        self._notify('insert', (position, lines))
+
+    def remove(self, position, count=1):
+        removed = self._rows[position:position + count]
+        del self._rows[position:position + count]
+        for line in removed:
+            self._positions.pop(line.id, None)
+        self._invalidate(position)
+        self._notify('remove', (position, count, removed))
+        return removed
+
+    def move(self, from_position, to_position):
+        if from_position == to_position:
+            return
+        rows = self._rows
+        if abs(from_position - to_position) == 1:
+            rows[from_position], rows[to_position] = rows[to_position], rows[from_position]
+            if max(from_position, to_position) < self._dirty_from:
+                self._positions[rows[from_position].id] = from_position
+                self._positions[rows[to_position].id] = to_position
+        else:
+            rows.insert(to_position, rows.pop(from_position))
+            self._invalidate(min(from_position, to_position))
+        self._notify('move', (from_position, to_position))
+
+    def _invalidate(self, position):
+        self._dirty_from = min(self._dirty_from, position)
@@ -0,0 +1,211 @@
+# guion_editor/models/script_table_model.py
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, pyqtSignal
+from PyQt5.QtGui import QColor
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.utils.timecode import format_time_code
+
+
+class ScriptTableModel(QAbstractTableModel):
+    """
+    Modelo de tabla sobre los datos del guion.
+    La vista solo pide los datos de las celdas visibles, por lo que no se crea
+    ningún widget por fila.
+    """
+    # Emite (fila, columna, nuevo_valor) cuando la vista edita una celda.
+    # El TableWindow decide si crear un comando de deshacer.
+    edit_requested = pyqtSignal(int, int, object)
+
+    SCENE_CHANGE_COLOR = QColor("#FFD700")  # Amarillo dorado
+    MATCH_COLOR = QColor("#FFF59D")  # Coincidencias de búsqueda
+    PLAYBACK_COLOR = QColor("#BBDEFB")  # Filas activas en la posición del video
+    HIGHLIGHT_TEXT_COLOR = QColor("#000000")  # Texto sobre cualquiera de los fondos anteriores
+    # Lista de (inicio, fin) de las coincidencias de la búsqueda actual en la celda, o None
+    MATCH_SPANS_ROLE = Qt.UserRole + 1
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self.store = ScriptStore()
+        self.scene_change_ids = set()  # IDs de filas marcadas como cambio de escena
+        self.match_spans = {}  # (ID, columna) -> [(inicio, fin), ...] de la búsqueda actual
+        self.preview_values = {}  # (ID, columna) -> valor mostrado sin escribirlo en el store
+        self.playback_ids = set()  # IDs de las filas activas en la posición del video
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            value = self.get_value(index.row(), index.column())
+            if self.preview_values:
+                value = self.preview_values.get((self.get_value(index.row(), 0), index.column()), value)
+            if index.column() in ScriptStore.TIME_COLUMNS:
+                # Los tiempos se guardan en fotogramas; el texto solo se genera al mostrarlos
+                return format_time_code(value, self.store.frame_rate)
+            return str(value)
+        if role == Qt.BackgroundRole:
+            return self.background_color(index.row(), index.column())
+        if role == Qt.ForegroundRole and self.background_color(index.row(), index.column()) is not None:
+            # Los fondos resaltados son claros: texto oscuro también con el tema "Oscuro"
+            return self.HIGHLIGHT_TEXT_COLOR
+        if role == self.MATCH_SPANS_ROLE and self.match_spans:
+            return self.match_spans.get((self.get_value(index.row(), 0), index.column()))
+        return None
+
+    def background_color(self, row, column):
+        row_id = self.get_value(row, 0)
+        # La coincidencia va primero: si no, el color de la fila la taparía
+        if column == ScriptStore.COL_CHARACTER and self.match_spans:
+            if (row_id, column) in self.match_spans:
+                return self.MATCH_COLOR
+        if self.playback_ids and row_id in self.playback_ids:
+            return self.PLAYBACK_COLOR
+        if row_id in self.scene_change_ids:
+            return self.SCENE_CHANGE_COLOR
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        self.edit_requested.emit(index.row(), index.column(), value)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columns[section]
+        return str(section + 1)
+
+    # --- Acceso a los datos ---
+
+    def set_store(self, store, scene_change_ids=()):
+        self.beginResetModel()
+        self.store = store
+        self.scene_change_ids = set(scene_change_ids)
+        self.match_spans = {}
+        self.preview_values = {}
+        self.playback_ids = set()
+        self.endResetModel()
+
+    def get_value(self, row, column):
+        return self.store.get(row, column)
+
+    def set_value(self, row, column, value):
+        if self.match_spans:
+            # Las posiciones resaltadas dejan de valer al cambiar el texto
+            self.match_spans.pop((self.store.get(row, 0), column), None)
+        self.store.set(row, column, value)
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index)
+
+    def set_values(self, column, rows, values):
+        """Escribe varias filas de una columna con una sola notificación a la vista."""
+        rows = list(rows)
+        if not rows:
+            return
+        if self.match_spans:
+            for row in rows:
+                self.match_spans.pop((self.store.get(row, 0), column), None)
+        self.store.set_many(column, rows, values)
+        self.dataChanged.emit(self.index(min(rows), column), self.index(max(rows), column))
+
+    def set_preview_value(self, row, column, value):
+        """Muestra value en la celda sin escribirlo en el store ni en la pila de deshacer."""
+        self.preview_values[(self.store.get(row, 0), column)] = value
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index)
+
+    def clear_preview_values(self):
+        if not self.preview_values:
+            return
+        rows = self.store.positions_of({row_id for row_id, _ in self.preview_values})
+        columns = [column for _, column in self.preview_values]
+        self.preview_values = {}
+        if rows:
+            self.dataChanged.emit(self.index(rows[0], min(columns)), self.index(rows[-1], max(columns)))
+
+    def set_playback_rows(self, row_ids):
+        """Resalta las filas activas en la posición del video; solo repinta las que cambian."""
+        row_ids = set(row_ids)
+        changed = row_ids ^ self.playback_ids
+        self.playback_ids = row_ids
+        for row in self.store.positions_of(changed):
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1), [Qt.BackgroundRole, Qt.ForegroundRole])
+
+    def add_match_spans(self, hits):
+        """Añade coincidencias de búsqueda: lista de (ID, columna, [(inicio, fin), ...])."""
+        for row_id, column, spans in hits:
+            self.match_spans[(row_id, column)] = spans
+        rows = self.store.positions_of({row_id for row_id, _, _ in hits})
+        if rows:
+            self.dataChanged.emit(
+                self.index(rows[0], ScriptStore.COL_CHARACTER),
+                self.index(rows[-1], ScriptStore.COL_DIALOGUE)
+            )
+
+    def clear_match_spans(self):
+        if self.match_spans:
+            self.match_spans = {}
+            self.notify_columns_changed(ScriptStore.COL_CHARACTER, ScriptStore.COL_DIALOGUE)
+
+    def notify_columns_changed(self, first_column, last_column):
+        """Avisa a la vista de que han cambiado columnas enteras, con una sola notificación."""
+        if self.rowCount() > 0:
+            self.dataChanged.emit(
+                self.index(0, first_column),
+                self.index(self.rowCount() - 1, last_column)
+            )
+
+    def row_data(self, row):
+        return self.store.row(row).copy()
+
+    def insert_rows(self, row, rows):
+        self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+        self.store.insert(row, rows)
+        self.endInsertRows()
+
+    def remove_rows(self, row, count=1):
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        removed = self.store.remove(row, count)
+        self.endRemoveRows()
+        return removed
+
+    def move_row(self, from_row, to_row):
+        if from_row == to_row:
+            return
+        # beginMoveRows espera la posición de destino antes de retirar la fila
+        destination = to_row + 1 if to_row > from_row else to_row
+        self.beginMoveRows(QModelIndex(), from_row, from_row, QModelIndex(), destination)
+        self.store.move(from_row, to_row)
+        self.endMoveRows()
+
+    def set_scene_change(self, row_id, marked):
+        if marked:
+            self.scene_change_ids.add(row_id)
+        else:
+            self.scene_change_ids.discard(row_id)
+        row = self.find_row_by_id(row_id)
+        if row is not None:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+
+    def find_row_by_id(self, id_value):
+        return self.store.position_of(id_value)
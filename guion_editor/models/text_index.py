@@ -0,0 +1,189 @@
+# guion_editor/models/text_index.py
+
+"""
+Índice invertido de texto sobre PERSONAJE y DIÁLOGO.
+
+Para cada columna guarda el texto de cada fila en minúsculas y sin acentos, un índice de
+trigramas (para búsquedas por subcadena) y un índice de palabras (para
+búsquedas por inicio de palabra). Las entradas van por ID de fila, que no
+cambia al insertar, eliminar o mover filas, así que mover una fila no toca el
+índice.
+
+El índice se construye la primera vez que se consulta y a partir de ahí se
+mantiene al día escuchando las escrituras del ScriptStore: cada cambio solo
+reindexa las filas afectadas.
+"""
+
+import re
+from bisect import bisect_left
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.utils.search_engine import strip_accents
+
+WORD_RE = re.compile(r'\w+')
+
+SUBSTRING = 'substring'
+PREFIX = 'prefix'
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _ColumnIndex:
+    def __init__(self):
+        self.texts = {}   # ID -> texto en minúsculas y sin acentos
+        self.grams = {}   # trigrama -> {ID}
+        self.words = {}   # palabra -> {ID}
+        self._sorted_words = None
+
+    def add(self, row_id, text):
+        text = strip_accents(text.lower())
+        self.texts[row_id] = text
+        for gram in trigrams(text):
+            self.grams.setdefault(gram, set()).add(row_id)
+        for word in set(WORD_RE.findall(text)):
+            ids = self.words.get(word)
+            if ids is None:
+                self.words[word] = ids = set()
+                self._sorted_words = None
+            ids.add(row_id)
+
+    def discard(self, row_id):
+        text = self.texts.pop(row_id, None)
+        if text is None:
+            return
+        for gram in trigrams(text):
+            ids = self.grams[gram]
+            ids.discard(row_id)
+            if not ids:
+                del self.grams[gram]
+        for word in set(WORD_RE.findall(text)):
+            ids = self.words[word]
+            ids.discard(row_id)
+            if not ids:
+                del self.words[word]
+                self._sorted_words = None
+
+    def find_substring(self, query):
+        if len(query) < 3:
+            # Sin trigramas que cruzar: basta con recorrer los textos ya en minúsculas
+            return {row_id for row_id, text in self.texts.items() if query in text}
+        postings = []
+        for gram in trigrams(query):
+            ids = self.grams.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return candidates
+        # Los trigramas pueden coincidir en otro orden: confirmar sobre el texto
+        texts = self.texts
+        return {row_id for row_id in candidates if query in texts[row_id]}
+
+    def find_prefix(self, query):
+        words = WORD_RE.findall(query)
+        if not words:
+            return self.find_substring(query)
+        if self._sorted_words is None:
+            self._sorted_words = sorted(self.words)
+        sorted_words = self._sorted_words
+        # Las palabras completas deben existir; la última puede ser solo el inicio
+        result = None
+        for word in words[:-1]:
+            ids = self.words.get(word)
+            if not ids:
+                return set()
+            result = set(ids) if result is None else result & ids
+        prefix = words[-1]
+        matches = set()
+        for index in range(bisect_left(sorted_words, prefix), len(sorted_words)):
+            word = sorted_words[index]
+            if not word.startswith(prefix):
+                break
+            matches |= self.words[word]
+        return matches if result is None else result & matches
+
+
+class TextIndex:
+    COLUMNS = (ScriptStore.COL_CHARACTER, ScriptStore.COL_DIALOGUE)
+
+    def __init__(self):
+        self.store = None
+        self._columns = None  # None hasta la primera consulta
+        self.version = 0      # Aumenta con cada cambio que puede alterar los resultados
+
+    def attach(self, store):
+        """Indexa store (de forma perezosa) y sigue sus cambios."""
+        if self.store is not None:
+            self.store.remove_listener(self._on_store_changed)
+        self.store = store
+        self._columns = None
+        self.version += 1
+        store.add_listener(self._on_store_changed)
+
+    def search(self, text, columns=COLUMNS, mode=SUBSTRING):
+        """
+        Devuelve las posiciones, en orden, de las filas que contienen text en
+        alguna de las columnas indicadas, sin distinguir mayúsculas ni acentos.
+        Con mode=PREFIX las palabras de text deben coincidir con palabras del
+        texto, la última solo por su inicio.
+        """
+        query = strip_accents(text.lower())
+        if not query or self.store is None:
+            return []
+        self.ensure_built()
+        row_ids = set()
+        for column in columns:
+            index = self._columns[column]
+            row_ids |= index.find_prefix(query) if mode == PREFIX else index.find_substring(query)
+        return self.store.positions_of(row_ids)
+
+    def ensure_built(self):
+        if self._columns is not None:
+            return
+        self._columns = {column: _ColumnIndex() for column in self.COLUMNS}
+        store = self.store
+        for position in range(len(store)):
+            self._index_line(store.row(position))
+
+    def _index_line(self, line):
+        self._columns[ScriptStore.COL_CHARACTER].add(line.id, self.store.character_name(line.character_id))
+        self._columns[ScriptStore.COL_DIALOGUE].add(line.id, line.dialogue)
+
+    def _reindex(self, position, column):
+        row_id = self.store.row(position).id
+        index = self._columns[column]
+        index.discard(row_id)
+        index.add(row_id, self.store.get(position, column))
+
+    def _on_store_changed(self, operation, args):
+        if operation in ('set', 'set_many', 'insert', 'remove', 'move'):
+            self.version += 1
+        if self._columns is None:
+            return
+        if operation == 'set':
+            position, column, _ = args
+            if column in self._columns:
+                self._reindex(position, column)
+            elif column == ScriptStore.COL_ID:
+                # Cambio de ID: más simple reconstruir en la próxima consulta
+                self._columns = None
+        elif operation == 'set_many':
+            column, positions, _ = args
+            if column in self._columns:
+                for position in positions:
+                    self._reindex(position, column)
+        elif operation == 'insert':
+            _, lines = args
+            for line in lines:
+                self._index_line(line)
+        elif operation == 'remove':
+            _, _, removed = args
+            for line in removed:
+                for index in self._columns.values():
+                    index.discard(line.id)
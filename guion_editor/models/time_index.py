@@ -0,0 +1,121 @@
+# guion_editor/models/time_index.py
+
+"""
+Índice de intervalos IN/OUT para saber qué filas están activas en un
+fotograma (modo "seguir reproducción").
+
+Las filas se guardan en una lista ordenada de (IN, ID). Una fila está activa
+en un fotograma si IN <= fotograma < OUT, así que solo pueden estarlo las que
+empiezan como mucho LONG_SPAN fotogramas antes: la consulta es una búsqueda
+binaria más el recorrido de esa ventana. Las pocas filas más largas que
+LONG_SPAN se guardan aparte y se comprueban siempre. Las filas sin duración
+(p. ej. con IN y OUT a cero) no se indexan. Se construye la primera vez que
+se consulta y después se mantiene escuchando las escrituras del ScriptStore.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+
+from guion_editor.models.script_store import ScriptStore
+
+LONG_SPAN = 1500  # Fotogramas (un minuto a 25 fps)
+
+
+class TimeIndex:
+    def __init__(self):
+        self.store = None
+        self._starts = None  # [(IN, ID)] ordenada; None hasta construir
+        self._spans = {}     # ID indexado -> (IN, OUT)
+        self._long = set()   # IDs con OUT - IN > LONG_SPAN
+
+    def attach(self, store):
+        if self.store is not None:
+            self.store.remove_listener(self._on_store_changed)
+        self.store = store
+        self._starts = None
+        self._spans = {}
+        self._long = set()
+        store.add_listener(self._on_store_changed)
+
+    def ensure_built(self):
+        if self._starts is not None or self.store is None:
+            return
+        starts = []
+        self._spans = {}
+        self._long = set()
+        store = self.store
+        for position in range(len(store)):
+            line = store.row(position)
+            if line.out_frames > line.in_frames:
+                starts.append((line.in_frames, line.id))
+                self._spans[line.id] = (line.in_frames, line.out_frames)
+                if line.out_frames - line.in_frames > LONG_SPAN:
+                    self._long.add(line.id)
+        starts.sort()
+        self._starts = starts
+
+    # --- Consulta ---
+
+    def active_rows(self, frame):
+        """IDs de las filas activas en frame (IN <= frame < OUT), por IN."""
+        self.ensure_built()
+        starts = self._starts
+        spans = self._spans
+        low = bisect_left(starts, (frame - LONG_SPAN,))
+        high = bisect_right(starts, (frame, float('inf')))
+        active = [row_id for _, row_id in starts[low:high] if spans[row_id][1] > frame]
+        extra = [
+            row_id for row_id in self._long
+            if spans[row_id][0] < frame - LONG_SPAN and frame < spans[row_id][1]
+        ]
+        if extra:
+            active = sorted(active + extra, key=lambda row_id: spans[row_id][0])
+        return active
+
+    # --- Mantenimiento ---
+
+    def _add(self, line):
+        if line.out_frames <= line.in_frames:
+            return
+        insort(self._starts, (line.in_frames, line.id))
+        self._spans[line.id] = (line.in_frames, line.out_frames)
+        if line.out_frames - line.in_frames > LONG_SPAN:
+            self._long.add(line.id)
+
+    def _discard(self, row_id):
+        span = self._spans.pop(row_id, None)
+        if span is None:
+            return
+        position = bisect_left(self._starts, (span[0], row_id))
+        del self._starts[position]
+        self._long.discard(row_id)
+
+    def _update(self, line):
+        if self._spans.get(line.id) != (line.in_frames, line.out_frames):
+            self._discard(line.id)
+            self._add(line)
+
+    def _on_store_changed(self, operation, args):
+        if self._starts is None:
+            return
+        store = self.store
+        if operation == 'set':
+            position, column, _ = args
+            if column == ScriptStore.COL_ID:
+                self._starts = None
+            elif column in ScriptStore.TIME_COLUMNS:
+                self._update(store.row(position))
+        elif operation == 'set_many':
+            column, positions, _ = args
+            if column in ScriptStore.TIME_COLUMNS:
+                for position in positions:
+                    self._update(store.row(position))
+        elif operation == 'time_columns':
+            self._starts = None
+        elif operation == 'insert':
+            _, lines = args
+            for line in lines:
+                self._add(line)
+        elif operation == 'remove':
+            _, _, removed = args
+            for line in removed:
+                self._discard(line.id)
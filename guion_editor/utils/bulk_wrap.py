@@ -0,0 +1,148 @@
+# guion_editor/utils/bulk_wrap.py
+
+"""
+Ajuste masivo de diálogos repartido por bloques entre procesos.
+
+wrap_parallel reparte los diálogos en bloques de CHUNK_SIZE entre los
+procesos de un ProcessPoolExecutor y junta los resultados en orden; por
+debajo de POOL_THRESHOLD diálogos no compensa arrancar procesos y se ajusta
+en el propio hilo. BulkWrapTask lo hace desde el QThreadPool para el guion
+abierto, y adjust_folder (o "python -m guion_editor.utils.bulk_wrap") ajusta
+sin interfaz todos los .xlsx/.json de una carpeta.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import repeat
+
+import pandas as pd
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.utils.dialog_wrap import DEFAULT_WRAP_RULES, WrapRules, wrap_dialogues, PARENTHESES, BRACKETS
+from guion_editor.utils.excel_reader import REQUIRED_COLUMNS
+from guion_editor.utils.excel_writer import write_script_excel, DEFAULT_COLUMN_STYLES
+from guion_editor.utils.process_pool import make_executor
+from guion_editor.utils.script_loader import ROW_SOURCES
+
+CHUNK_SIZE = 5000
+POOL_THRESHOLD = 20000
+SCRIPT_KINDS = {'.xlsx': 'excel', '.json': 'json'}
+
+
+def wrap_parallel(texts, rules=DEFAULT_WRAP_RULES, executor=None, chunk_size=CHUNK_SIZE):
+    """Ajusta texts en los procesos de executor, por bloques. Devuelve la lista ajustada en el mismo orden."""
+    if executor is None or len(texts) <= chunk_size:
+        return wrap_dialogues(texts, rules)
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    wrapped = []
+    for chunk in executor.map(wrap_dialogues, chunks, repeat(rules)):
+        wrapped.extend(chunk)
+    return wrapped
+
+
+class BulkWrapSignals(QObject):
+    # (diálogos ajustados, {'lines': n, 'seconds': s})
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+
+class BulkWrapTask(QRunnable):
+    """Ajusta una columna de diálogos en un hilo del QThreadPool, con procesos si es grande."""
+
+    def __init__(self, texts, rules=DEFAULT_WRAP_RULES):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.texts = texts
+        self.rules = rules
+        self.signals = BulkWrapSignals()
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            if len(self.texts) > POOL_THRESHOLD:
+                with make_executor() as executor:
+                    wrapped = wrap_parallel(self.texts, self.rules, executor)
+            else:
+                wrapped = wrap_dialogues(self.texts, self.rules)
+            stats = {'lines': len(self.texts), 'seconds': time.perf_counter() - start}
+            self.signals.finished.emit(wrapped, stats)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+def lines_per_second(stats):
+    return stats['lines'] / stats['seconds'] if stats['seconds'] else float(stats['lines'])
+
+
+# --- Sin interfaz ---
+
+def adjust_script_file(path, output_path, rules=DEFAULT_WRAP_RULES, executor=None):
+    """Ajusta los diálogos de un guion .xlsx/.json y lo guarda en output_path. Devuelve (filas, filas ajustadas)."""
+    kind = SCRIPT_KINDS[os.path.splitext(path)[1].lower()]
+    rows = list(ROW_SOURCES[kind](path, rules))
+    if not rows:
+        return 0, 0
+    if any(col not in rows[0] for col in REQUIRED_COLUMNS):
+        raise ValueError("Faltan columnas requeridas en los datos.")
+    store = ScriptStore.from_dataframe(pd.DataFrame(rows))
+    texts = store.column(ScriptStore.COL_DIALOGUE)
+    wrapped = wrap_parallel(texts, rules, executor)
+    positions = [position for position, (old, new) in enumerate(zip(texts, wrapped)) if old != new]
+    store.set_many(ScriptStore.COL_DIALOGUE, positions, [wrapped[position] for position in positions])
+    if kind == 'excel':
+        write_script_excel(output_path, store, DEFAULT_COLUMN_STYLES)
+    else:
+        # Mismo formato que TableWindow.save_to_json_file
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(store.to_dataframe().to_dict(orient='records'), f, ensure_ascii=False, indent=4)
+    return len(texts), len(positions)
+
+
+def adjust_folder(folder, output_folder, rules=DEFAULT_WRAP_RULES, workers=None, report=print):
+    """Ajusta todos los guiones de folder con un mismo grupo de procesos. Devuelve {'lines', 'seconds'}."""
+    paths = sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if os.path.splitext(name)[1].lower() in SCRIPT_KINDS
+    )
+    os.makedirs(output_folder, exist_ok=True)
+    total_lines = 0
+    start = time.perf_counter()
+    with make_executor(workers) as executor:
+        for path in paths:
+            file_start = time.perf_counter()
+            try:
+                lines, changed = adjust_script_file(
+                    path, os.path.join(output_folder, os.path.basename(path)), rules, executor
+                )
+            except Exception as e:
+                report(f"{os.path.basename(path)}: error, no se ha ajustado ({e})")
+                continue
+            stats = {'lines': lines, 'seconds': time.perf_counter() - file_start}
+            report(f"{os.path.basename(path)}: {lines} líneas, {changed} ajustadas, "
+                   f"{lines_per_second(stats):.0f} líneas/s")
+            total_lines += lines
+    stats = {'lines': total_lines, 'seconds': time.perf_counter() - start}
+    report(f"Total: {len(paths)} guiones, {total_lines} líneas en {stats['seconds']:.2f} s, "
+           f"{lines_per_second(stats):.0f} líneas/s")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ajusta los diálogos de todos los guiones (.xlsx/.json) de una carpeta.")
+    parser.add_argument('carpeta')
+    parser.add_argument('--salida', help="Carpeta donde se guardan los guiones ajustados (por defecto CARPETA/ajustados)")
+    parser.add_argument('--ancho', type=int, default=DEFAULT_WRAP_RULES.width, help="Caracteres por línea")
+    parser.add_argument('--corchetes', action='store_true', help="No contar las anotaciones [ ]")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+    hidden_pairs = (PARENTHESES, BRACKETS) if args.corchetes else (PARENTHESES,)
+    output = args.salida or os.path.join(args.carpeta, 'ajustados')
+    adjust_folder(args.carpeta, output, WrapRules(args.ancho, hidden_pairs), args.procesos)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# guion_editor/utils/dialog_wrap.py
+
+"""
+Ajuste de los diálogos a un ancho de línea.
+
+Cada diálogo se divide en palabras una sola vez y la anchura visible de la
+línea en curso se lleva de forma incremental: añadir una palabra solo recorre
+esa palabra. Lo que va entre paréntesis (acotaciones como "(ríe)") no cuenta
+para el ancho: se descuenta desde el primer paréntesis abierto hasta el
+siguiente cierre, y un paréntesis sin cerrar cuenta como texto visible.
+WrapRules permite añadir otras parejas, por ejemplo corchetes para
+anotaciones. Una palabra más ancha que la línea ocupa una línea propia.
+"""
+
+import re
+
+PARENTHESES = ('(', ')')
+BRACKETS = ('[', ']')
+
+
+class WrapRules:
+    def __init__(self, width=60, hidden_pairs=(PARENTHESES,)):
+        self.width = width
+        self.hidden_pairs = tuple(hidden_pairs)  # (apertura, cierre) de lo que no cuenta para el ancho
+        self.marks = frozenset(char for pair in self.hidden_pairs for char in pair)
+        self.no_pending = (None,) * len(self.hidden_pairs)
+        # Sin acotaciones el ancho visible es la longitud: la línea más larga
+        # que cabe termina justo antes de un espacio o al final del texto
+        self.plain_line = re.compile(r'(.{1,%d})(?: |$)' % width)
+
+    def __repr__(self):
+        return f"WrapRules(width={self.width}, hidden_pairs={self.hidden_pairs})"
+
+
+DEFAULT_WRAP_RULES = WrapRules()
+
+
+def _scan(word, offset, hidden, pending, rules):
+    """
+    Avanza el estado de la línea sobre word, que empieza en offset. hidden es
+    el número de caracteres ocultos ya cerrados y pending la posición de la
+    apertura pendiente de cada pareja (o None).
+    """
+    if rules.marks.isdisjoint(word):
+        return hidden, pending
+    pending = list(pending)
+    for index, char in enumerate(word):
+        if char not in rules.marks:
+            continue
+        for pair, (opening, closing) in enumerate(rules.hidden_pairs):
+            if char == opening and pending[pair] is None:
+                pending[pair] = offset + index
+            elif char == closing and pending[pair] is not None:
+                hidden += offset + index - pending[pair] + 1
+                pending[pair] = None
+    return hidden, tuple(pending)
+
+
+def visible_width(text, rules=DEFAULT_WRAP_RULES):
+    """Anchura de text sin contar las acotaciones."""
+    hidden, _ = _scan(text, 0, 0, rules.no_pending, rules)
+    return len(text) - hidden
+
+
+def wrap_dialogue(text, rules=DEFAULT_WRAP_RULES):
+    """Reparte las palabras de text en líneas de como mucho rules.width caracteres visibles."""
+    words = text.split()
+    if not words:
+        return ""
+    width = rules.width
+    if len(text) <= width:
+        # Ninguna línea puede superar el ancho: basta con normalizar los espacios
+        return " ".join(words)
+    if rules.marks.isdisjoint(text) and max(map(len, words)) <= width:
+        return "\n".join(rules.plain_line.findall(" ".join(words)))
+    lines = []
+    current = [words[0]]
+    length = len(words[0])
+    hidden, pending = _scan(words[0], 0, 0, rules.no_pending, rules)
+    for word in words[1:]:
+        new_length = length + 1 + len(word)
+        new_hidden, new_pending = _scan(word, length + 1, hidden, pending, rules)
+        if new_length - new_hidden > width:
+            lines.append(" ".join(current))
+            current = [word]
+            length = len(word)
+            hidden, pending = _scan(word, 0, 0, rules.no_pending, rules)
+        else:
+            current.append(word)
+            length = new_length
+            hidden, pending = new_hidden, new_pending
+    lines.append(" ".join(current))
+    return "\n".join(lines)
+
+
+def wrap_dialogues(texts, rules=DEFAULT_WRAP_RULES):
+    """Ajusta una columna entera de diálogos."""
+    return [wrap_dialogue(text, rules) for text in texts]
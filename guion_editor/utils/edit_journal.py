@@ -0,0 +1,284 @@
+# guion_editor/utils/edit_journal.py
+
+"""
+Autoguardado incremental con un diario de cambios.
+
+El diario escucha las escrituras del ScriptStore (ver ScriptStore.add_listener)
+y añade un registro JSON por cada una a journal.jsonl. Como todos los comandos
+de deshacer (y sus undo/redo) modifican el guion a través del store, cada
+acción del usuario queda registrada y el coste es proporcional al cambio, no
+al tamaño del guion.
+
+La escritura se hace en un hilo aparte, que mantiene su propia copia del guion
+aplicando los mismos registros. Cada cierto número de registros esa copia se
+guarda como instantánea (snapshot.dlgp, en el formato nativo) y el diario se
+vacía. Cada registro lleva un número de secuencia y la instantánea guarda el
+último que incluye, así que un corte entre los dos pasos no duplica cambios.
+
+Al arrancar, recover() reconstruye el guion a partir de la instantánea y los
+registros posteriores.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+
+import numpy as np
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.utils.project_file import open_project, write_project
+from guion_editor.utils.timecode import get_frame_rate
+
+AUTOSAVE_DIR = os.path.join(os.path.expanduser('~'), '.dialogapp', 'autosave')
+SNAPSHOT_NAME = 'snapshot.dlgp'
+JOURNAL_NAME = 'journal.jsonl'
+
+logger = logging.getLogger(__name__)
+
+
+def encode_line(store, line):
+    return [
+        line.id, line.scene, line.in_frames, line.out_frames,
+        store.character_name(line.character_id), line.dialogue,
+        list(line.extra) if line.extra else None
+    ]
+
+
+def decode_line(store, values):
+    line = store.make_line(values[:6])
+    if values[6] is not None:
+        line.extra = tuple(values[6])
+    return line
+
+
+def encode_change(store, operation, args):
+    """Convierte una notificación del store en un registro del diario."""
+    if operation == 'set':
+        position, column, value = args
+        return {'o': 'set', 'p': position, 'c': column, 'v': value}
+    if operation == 'set_many':
+        column, positions, values = args
+        return {'o': 'set_many', 'c': column, 'p': positions, 'v': values}
+    if operation == 'insert':
+        position, lines = args
+        return {'o': 'insert', 'p': position, 'r': [encode_line(store, line) for line in lines]}
+    if operation == 'remove':
+        position, count, _ = args
+        return {'o': 'remove', 'p': position, 'n': count}
+    if operation == 'move':
+        from_position, to_position = args
+        return {'o': 'move', 'f': from_position, 't': to_position}
+    if operation == 'time_columns':
+        in_frames, out_frames = args
+        return {'o': 'time_columns', 'in': np.asarray(in_frames).tolist(), 'out': np.asarray(out_frames).tolist()}
+    if operation == 'frame_rate':
+        return {'o': 'frame_rate', 'r': args[0].label}
+    if operation == 'extra_columns':
+        return {'o': 'extra_columns', 'c': list(args[0])}
+    return None
+
+
+def apply_change(store, record):
+    """Aplica un registro del diario a un store."""
+    operation = record['o']
+    if operation == 'set':
+        store.set(record['p'], record['c'], record['v'])
+    elif operation == 'set_many':
+        store.set_many(record['c'], record['p'], record['v'])
+    elif operation == 'insert':
+        store.insert(record['p'], [decode_line(store, values) for values in record['r']])
+    elif operation == 'remove':
+        store.remove(record['p'], record['n'])
+    elif operation == 'move':
+        store.move(record['f'], record['t'])
+    elif operation == 'time_columns':
+        store.set_time_columns(np.array(record['in'], dtype=np.int64), np.array(record['out'], dtype=np.int64))
+    elif operation == 'frame_rate':
+        store.frame_rate = get_frame_rate(record['r'])
+    elif operation == 'extra_columns':
+        store.extra_columns = record['c']
+
+
+class EditJournal:
+    SNAPSHOT_EVERY = 5000           # Registros entre instantáneas
+    SNAPSHOT_BYTES = 8 * 1024 ** 2  # Tamaño del diario que fuerza una instantánea
+
+    def __init__(self, directory=AUTOSAVE_DIR):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self.journal_path = os.path.join(directory, JOURNAL_NAME)
+        self._store = None
+        self._sequence = 0
+        self._info = {}
+        self._queue = queue.Queue()
+        self._thread = None
+
+    # --- Hilo de la interfaz ---
+
+    def attach(self, store):
+        """Empieza a registrar los cambios de store, que pasa a ser la base del diario."""
+        if self._store is not None:
+            self._store.remove_listener(self._on_store_changed)
+        self._store = store
+        store.add_listener(self._on_store_changed)
+        if store.source_path:
+            # Proyecto nativo: el hilo lo vuelve a abrir en vez de copiar las filas
+            base = {'source': store.source_path}
+        else:
+            # Las líneas se modifican en su sitio: el hilo recibe una copia
+            base = {
+                'lines': store.copy_rows(),
+                'character_names': list(store.character_names),
+                'frame_rate': store.frame_rate.label,
+                'extra_columns': list(store.extra_columns),
+            }
+        self._put(dict(base, o='reset'))
+
+    def is_active(self):
+        return self._store is not None
+
+    def note_info(self, **info):
+        """Guarda datos de la sesión (nombre del guion, si hay cambios sin guardar...)."""
+        if any(self._info.get(key) != value for key, value in info.items()):
+            self._info.update(info)
+            self._put({'o': 'info', 'i': dict(self._info)})
+
+    def close(self, discard=True):
+        """Termina el hilo de escritura. Con discard=True borra el autoguardado (cierre limpio)."""
+        if self._store is not None:
+            self._store.remove_listener(self._on_store_changed)
+            self._store = None
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if discard:
+            discard_autosave(self.directory)
+
+    def _on_store_changed(self, operation, args):
+        record = encode_change(self._store, operation, args)
+        if record is not None:
+            self._put(record)
+
+    def _put(self, record):
+        self._sequence += 1
+        record['q'] = self._sequence
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='EditJournal', daemon=True)
+            self._thread.start()
+        self._queue.put(record)
+
+    # --- Hilo de escritura ---
+
+    def _run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._shadow = None
+        self._shadow_info = {}
+        self._shadow_unsaved = False  # Hay cambios posteriores al último guardado
+        self._journal = None
+        self._pending = 0
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                batch = batch[:batch.index(None)]
+                running = False
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(f"Error al escribir el autoguardado: {e}")
+        if self._journal is not None:
+            self._journal.close()
+
+    def _write_batch(self, batch):
+        for record in batch:
+            if record['o'] == 'reset':
+                # Nueva base: instantánea y diario vacío
+                self._shadow = self._build_shadow(record)
+                self._shadow_unsaved = False
+                self._compact(record['q'])
+                continue
+            if record['o'] == 'info':
+                self._shadow_info = record['i']
+                self._shadow_unsaved = record['i'].get('unsaved', True)
+            elif self._shadow is not None:
+                apply_change(self._shadow, record)
+                self._shadow_unsaved = True
+            if self._journal is not None:
+                self._journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+                self._pending += 1
+        if self._journal is None or not batch:
+            return
+        self._journal.flush()
+        if self._pending >= self.SNAPSHOT_EVERY or self._journal.tell() >= self.SNAPSHOT_BYTES:
+            self._compact(batch[-1]['q'])
+
+    def _compact(self, sequence):
+        if self._journal is not None:
+            self._journal.close()
+        write_project(
+            self.snapshot_path, self._shadow,
+            has_scene_numbers=self._shadow_info.get('has_scene_numbers', False),
+            extra_metadata={'sequence': sequence, 'info': self._shadow_info, 'unsaved': self._shadow_unsaved}
+        )
+        self._journal = open(self.journal_path, 'w', encoding='utf-8')
+        self._pending = 0
+
+    @staticmethod
+    def _build_shadow(record):
+        if record.get('source'):
+            shadow, _ = open_project(record['source'])
+            # La copia no debe mantener mapeado el archivo del usuario
+            shadow.release_source()
+            return shadow
+        return ScriptStore.from_rows(
+            record['lines'], record['character_names'], record['extra_columns'], get_frame_rate(record['frame_rate'])
+        )
+
+
+def discard_autosave(directory=AUTOSAVE_DIR):
+    for name in (SNAPSHOT_NAME, JOURNAL_NAME):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def recover(directory=AUTOSAVE_DIR):
+    """
+    Reconstruye el guion de una sesión que no se cerró correctamente.
+    Devuelve (store, info) o None si no hay nada que recuperar.
+    """
+    snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+    journal_path = os.path.join(directory, JOURNAL_NAME)
+    if not os.path.exists(snapshot_path):
+        return None
+    store, metadata = open_project(snapshot_path)
+    store.release_source()
+    sequence = metadata.get('sequence', 0)
+    info = metadata.get('info', {})
+    unsaved = metadata.get('unsaved', True)
+    if os.path.exists(journal_path):
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for text in f:
+                try:
+                    record = json.loads(text)
+                except ValueError:
+                    break  # Último registro a medio escribir
+                if record['q'] <= sequence:
+                    continue
+                if record['o'] == 'info':
+                    info = record['i']
+                    unsaved = info.get('unsaved', True)
+                else:
+                    apply_change(store, record)
+                    unsaved = True
+    if not unsaved or len(store) == 0:
+        return None
+    return store, info
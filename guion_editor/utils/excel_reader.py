@@ -0,0 +1,108 @@
+# guion_editor/utils/excel_reader.py
+
+from openpyxl import load_workbook
+import pandas as pd
+
+# Columnas que usa el editor y cómo se normaliza cada una
+SCRIPT_COLUMNS = ['ID', 'SCENE', 'IN', 'OUT', 'PERSONAJE', 'DIÁLOGO']
+REQUIRED_COLUMNS = ['IN', 'OUT', 'PERSONAJE', 'DIÁLOGO']
+
+
+def _to_int(value, default):
+    if isinstance(value, int):
+        return value
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+COERCERS = {
+    'ID': lambda value: _to_int(value, None),
+    'SCENE': lambda value: _to_int(value, 1),
+    'IN': _to_text,
+    'OUT': _to_text,
+    'PERSONAJE': _to_text,
+    'DIÁLOGO': _to_text,
+}
+
+
+class ExcelScriptReader:
+    """
+    Lector de guiones .xlsx sobre openpyxl en modo read_only.
+
+    Recorre la primera hoja fila a fila sin cargar el libro entero, lee solo
+    las columnas del guion (IN, OUT, PERSONAJE, DIÁLOGO y, si existen, SCENE e
+    ID) y normaliza los tipos en la misma pasada: SCENE e ID como enteros y el
+    resto como texto. Las filas vacías (por ejemplo las que quedan al final de
+    una hoja con formato) se descartan.
+
+    Con keep_extra_columns=True se conservan también el resto de columnas, sin
+    convertir, para poder volver a exportarlas.
+    """
+
+    def __init__(self, path, keep_extra_columns=False):
+        self.path = path
+        self.keep_extra_columns = keep_extra_columns
+        self.columns = []        # Columnas leídas, en el orden de las filas devueltas
+        self.extra_columns = []  # Columnas leídas que no son del guion
+        self.row_count = 0       # Filas según las dimensiones de la hoja (0 si no se conocen)
+
+    def __iter__(self):
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0]
+            self.row_count = max(0, (sheet.max_row or 1) - 1)
+            header = next(sheet.iter_rows(max_row=1, values_only=True), None)
+            if header is None:
+                return
+            positions = self._project(header)
+            last_column = max(positions) + 1
+            coercers = [COERCERS.get(col) for col in self.columns]
+            # Las celdas a la derecha de la última columna leída no se recorren
+            for values in sheet.iter_rows(min_row=2, max_col=last_column, values_only=True):
+                if len(values) < last_column:
+                    values = values + (None,) * (last_column - len(values))
+                picked = [values[position] for position in positions]
+                if all(value is None or value == '' for value in picked):
+                    continue
+                yield {
+                    col: coerce(value) if coerce else value
+                    for col, coerce, value in zip(self.columns, coercers, picked)
+                }
+        finally:
+            workbook.close()
+
+    def _project(self, header):
+        header = [str(col).strip() if col is not None else '' for col in header]
+        missing = [col for col in REQUIRED_COLUMNS if col not in header]
+        if missing:
+            raise ValueError("Faltan columnas requeridas en los datos.")
+        self.columns = [col for col in SCRIPT_COLUMNS if col in header]
+        self.extra_columns = []
+        if self.keep_extra_columns:
+            self.extra_columns = [col for col in header if col and col not in SCRIPT_COLUMNS]
+        self.columns += self.extra_columns
+        return [header.index(col) for col in self.columns]
+
+    def read_dataframe(self):
+        """Lee la hoja entera a un DataFrame con los tipos ya normalizados."""
+        rows = list(self)
+        df = pd.DataFrame(rows, columns=self.columns)
+        if 'SCENE' in df.columns:
+            df['SCENE'] = df['SCENE'].astype('int64')
+        if 'ID' in df.columns and df['ID'].notna().all():
+            df['ID'] = df['ID'].astype('int64')
+        return df
+
+
+def read_script_excel(path, keep_extra_columns=False):
+    return ExcelScriptReader(path, keep_extra_columns).read_dataframe()
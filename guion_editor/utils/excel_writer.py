@@ -0,0 +1,77 @@
+# guion_editor/utils/excel_writer.py
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+HEADER_FONT = Font(bold=True)
+
+# Anchos por defecto al exportar el guion; no añaden coste por celda
+DEFAULT_COLUMN_STYLES = {
+    'SCENE': {'width': 8},
+    'IN': {'width': 13},
+    'OUT': {'width': 13},
+    'PERSONAJE': {'width': 20},
+    'DIÁLOGO': {'width': 80},
+}
+
+
+def write_script_excel(path, store, column_styles=None):
+    """
+    Exporta el guion a .xlsx con un libro openpyxl en modo write_only.
+
+    Las filas salen directamente del ScriptStore y se escriben a medida que se
+    generan, sin DataFrame intermedio, así que la memoria no crece con el
+    tamaño del guion.
+
+    column_styles: {columna: {'width': ..., 'font': Font, 'alignment': Alignment,
+    'number_format': str}}. El ancho se aplica a la columna; el resto de claves
+    se aplica a cada celda de la columna.
+    """
+    column_styles = column_styles or {}
+    columns = store.export_columns()
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+
+    # En modo write_only los anchos deben fijarse antes de escribir filas
+    for position, col in enumerate(columns, start=1):
+        width = column_styles.get(col, {}).get('width')
+        if width:
+            sheet.column_dimensions[get_column_letter(position)].width = width
+
+    header = []
+    for col in columns:
+        cell = WriteOnlyCell(sheet, value=col)
+        cell.font = HEADER_FONT
+        header.append(cell)
+    sheet.append(header)
+
+    cell_styles = [_cell_style(column_styles.get(col)) for col in columns]
+    if any(cell_styles):
+        for row in store.export_rows():
+            sheet.append([
+                _styled_cell(sheet, value, style) if style else value
+                for value, style in zip(row, cell_styles)
+            ])
+    else:
+        for row in store.export_rows():
+            sheet.append(row)
+
+    workbook.save(path)
+
+
+def _cell_style(style):
+    if not style:
+        return None
+    cell_style = {key: value for key, value in style.items() if key in ('font', 'alignment', 'number_format')}
+    return cell_style or None
+
+
+def _styled_cell(sheet, value, style):
+    cell = WriteOnlyCell(sheet, value=value)
+    for key, style_value in style.items():
+        setattr(cell, key, style_value)
+    return cell
+
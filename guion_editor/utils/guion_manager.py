@@ -3,6 +3,8 @@
 import pandas as pd
 import json
 
+from guion_editor.utils.excel_reader import read_script_excel
+
 class GuionManager:
     REQUIRED_COLUMNS = ['IN', 'OUT', 'PERSONAJE', 'DIÁLOGO']
 
@@ -10,9 +12,8 @@ class GuionManager:
         self.dataframe = pd.DataFrame(columns=self.REQUIRED_COLUMNS)
 
     def load_from_excel(self, path: str) -> pd.DataFrame:
-        df = pd.read_excel(path)
-        if not self.validate_columns(df):
-            raise ValueError("Faltan columnas requeridas en los datos.")
+        # Solo se leen las columnas del guion, ya con sus tipos (falla si falta alguna requerida)
+        df = read_script_excel(path)
         # Añadir la columna "Escena" si no existe
         if "Escena" not in df.columns:
             df.insert(0, "Escena", 1)
@@ -0,0 +1,9 @@
+# guion_editor/utils/process_pool.py
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def make_executor(workers=None):
+    # 'spawn': los procesos no heredan el estado de Qt ni los hilos del proceso principal
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
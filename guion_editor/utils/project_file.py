@@ -0,0 +1,271 @@
+# guion_editor/utils/project_file.py
+
+"""
+Formato de proyecto nativo de DialogApp (.dlgp).
+
+Es un contenedor binario por columnas pensado para abrirse con mmap:
+
+    cabecera       '<8sHHII': MAGIC, versión, reservado, filas, nº de secciones
+    tabla          (desplazamiento, longitud) '<QQ' por sección
+    secciones      alineadas a 8 bytes, en el orden de SECTIONS
+
+Las columnas numéricas se leen con np.frombuffer directamente sobre el mapa de
+memoria. Los diálogos se guardan en un único bloque UTF-8 con un array de
+desplazamientos, y los personajes en una tabla de nombres a la que apuntan las
+filas. Al abrir solo se leen la cabecera, los metadatos y la tabla de nombres;
+cada fila se decodifica la primera vez que se consulta.
+
+Excel y JSON siguen siendo los formatos de importación y exportación.
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import MutableSequence
+
+import numpy as np
+
+from guion_editor.models.script_line import ScriptLine
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.utils.timecode import get_frame_rate
+
+PROJECT_EXTENSION = '.dlgp'
+MAGIC = b'DLGAPPRJ'
+VERSION = 1
+
+HEADER = struct.Struct('<8sHHII')
+SECTION_ENTRY = struct.Struct('<QQ')
+
+# (nombre, dtype) en el orden en que se escriben; dtype None para bloques de bytes
+SECTIONS = [
+    ('metadata', None),
+    ('ids', np.int64),
+    ('scenes', np.int32),
+    ('in_frames', np.int64),
+    ('out_frames', np.int64),
+    ('character_ids', np.int32),
+    ('dialogue_offsets', np.uint64),
+    ('dialogue_blob', None),
+    ('name_offsets', np.uint64),
+    ('name_blob', None),
+    ('extra_offsets', np.uint64),
+    ('extra_blob', None),
+]
+
+
+def _pack_strings(values):
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    if encoded:
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, b''.join(encoded)
+
+
+def write_project(path, store, scene_change_ids=(), has_scene_numbers=False, extra_metadata=None):
+    """
+    Guarda el guion en formato nativo. Se escribe a un archivo temporal que
+    después sustituye al destino, así que un fallo no deja el proyecto a medias.
+    """
+    rows = [store.row(position) for position in range(len(store))]
+    metadata = {
+        'frame_rate': store.frame_rate.label,
+        'extra_columns': store.extra_columns,
+        'scene_change_ids': sorted(scene_change_ids),
+        'has_scene_numbers': has_scene_numbers,
+    }
+    metadata.update(extra_metadata or {})
+    dialogue_offsets, dialogue_blob = _pack_strings([line.dialogue for line in rows])
+    name_offsets, name_blob = _pack_strings(store.character_names)
+    if store.extra_columns:
+        extra_offsets, extra_blob = _pack_strings([
+            json.dumps(line.extra, ensure_ascii=False, default=str) if line.extra else ''
+            for line in rows
+        ])
+    else:
+        extra_offsets, extra_blob = np.zeros(len(rows) + 1, dtype=np.uint64), b''
+
+    count = len(rows)
+    sections = [
+        json.dumps(metadata, ensure_ascii=False).encode('utf-8'),
+        np.fromiter((line.id for line in rows), dtype=np.int64, count=count),
+        np.fromiter((line.scene for line in rows), dtype=np.int32, count=count),
+        np.fromiter((line.in_frames for line in rows), dtype=np.int64, count=count),
+        np.fromiter((line.out_frames for line in rows), dtype=np.int64, count=count),
+        np.fromiter((line.character_id for line in rows), dtype=np.int32, count=count),
+        dialogue_offsets,
+        dialogue_blob,
+        name_offsets,
+        name_blob,
+        extra_offsets,
+        extra_blob,
+    ]
+    payloads = [section.tobytes() if isinstance(section, np.ndarray) else section for section in sections]
+
+    table = []
+    offset = HEADER.size + SECTION_ENTRY.size * len(payloads)
+    for payload in payloads:
+        offset += -offset % 8
+        table.append((offset, len(payload)))
+        offset += len(payload)
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, count, len(payloads)))
+        for entry in table:
+            f.write(SECTION_ENTRY.pack(*entry))
+        for (section_offset, _), payload in zip(table, payloads):
+            f.write(b'\0' * (section_offset - f.tell()))
+            f.write(payload)
+    # Si el destino es el archivo mapeado por el guion abierto, soltarlo antes de reemplazarlo
+    if store.source_path and os.path.abspath(store.source_path) == os.path.abspath(path):
+        store.release_source()
+    os.replace(temp_path, path)
+
+
+class ProjectReader:
+    """Acceso por columnas a un proyecto .dlgp mapeado en memoria."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_sections()
+        except Exception:
+            self._map.close()
+            raise
+
+    def _read_sections(self):
+        if len(self._map) < HEADER.size:
+            raise ValueError("El archivo no es un proyecto de DialogApp.")
+        magic, version, _, count, section_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("El archivo no es un proyecto de DialogApp.")
+        if version > VERSION:
+            raise ValueError(f"Versión de proyecto no soportada ({version}).")
+        self.row_count = count
+        buffer = memoryview(self._map)
+        self._buffer = buffer
+        for index, (name, dtype) in enumerate(SECTIONS[:section_count]):
+            offset, length = SECTION_ENTRY.unpack_from(self._map, HEADER.size + index * SECTION_ENTRY.size)
+            if offset + length > len(self._map):
+                raise ValueError("El proyecto está dañado o incompleto.")
+            data = buffer[offset:offset + length]
+            setattr(self, name, np.frombuffer(data, dtype=dtype) if dtype is not None else data)
+        self.metadata = json.loads(bytes(self.metadata).decode('utf-8'))
+
+    def character_names(self):
+        offsets = self.name_offsets.tolist()
+        blob = self.name_blob
+        return [bytes(blob[offsets[i]:offsets[i + 1]]).decode('utf-8') for i in range(len(offsets) - 1)]
+
+    def line(self, position):
+        start, end = int(self.dialogue_offsets[position]), int(self.dialogue_offsets[position + 1])
+        extra = None
+        extra_start, extra_end = int(self.extra_offsets[position]), int(self.extra_offsets[position + 1])
+        if extra_end > extra_start:
+            extra = tuple(json.loads(bytes(self.extra_blob[extra_start:extra_end]).decode('utf-8')))
+        return ScriptLine(
+            int(self.ids[position]),
+            int(self.scenes[position]),
+            int(self.in_frames[position]),
+            int(self.out_frames[position]),
+            int(self.character_ids[position]),
+            bytes(self.dialogue_blob[start:end]).decode('utf-8'),
+            extra
+        )
+
+    def close(self):
+        # Los arrays y vistas sobre el mapa deben soltarse antes de cerrarlo
+        for name, _ in SECTIONS:
+            if name != 'metadata':
+                setattr(self, name, None)
+        self._buffer.release()
+        self._map.close()
+
+
+class MappedRows(MutableSequence):
+    """
+    Lista de ScriptLine respaldada por un ProjectReader. Mientras una fila no
+    se consulta, la lista guarda solo su posición en el archivo.
+    """
+
+    def __init__(self, reader):
+        self.reader = reader
+        self._items = list(range(reader.row_count))
+
+    def _decode(self, index):
+        item = self._items[index]
+        if type(item) is int:
+            item = self.reader.line(item)
+            self._items[index] = item
+        return item
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self._items)))]
+        return self._decode(index)
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def insert(self, index, value):
+        self._items.insert(index, value)
+
+    def __iter__(self):
+        for index in range(len(self._items)):
+            yield self._decode(index)
+
+    def timing_arrays(self):
+        """(ID, IN, OUT, personaje) de todas las filas como arrays, sin decodificar los diálogos."""
+        count = len(self._items)
+        # Posición en el archivo de cada fila, o -1 si ya está decodificada (puede haber cambiado)
+        mapped = np.fromiter((item if type(item) is int else -1 for item in self._items), dtype=np.int64, count=count)
+        decoded = np.flatnonzero(mapped < 0)
+        if self.reader is not None:
+            source = np.maximum(mapped, 0)
+            arrays = [
+                getattr(self.reader, name)[source].astype(np.int64)
+                for name in ('ids', 'in_frames', 'out_frames', 'character_ids')
+            ]
+        else:
+            arrays = [np.zeros(count, dtype=np.int64) for _ in range(4)]
+        for position in decoded.tolist():
+            line = self._items[position]
+            for array, value in zip(arrays, (line.id, line.in_frames, line.out_frames, line.character_id)):
+                array[position] = value
+        return tuple(arrays)
+
+    def release(self):
+        """Decodifica las filas pendientes y cierra el archivo mapeado."""
+        if self.reader is None:
+            return
+        for index in range(len(self._items)):
+            self._decode(index)
+        self.reader.close()
+        self.reader = None
+
+
+def open_project(path):
+    """
+    Abre un proyecto .dlgp. Devuelve (store, metadata); las filas del store se
+    decodifican a medida que se consultan.
+    """
+    reader = ProjectReader(path)
+    metadata = reader.metadata
+    store = ScriptStore.from_rows(
+        MappedRows(reader),
+        reader.character_names(),
+        extra_columns=metadata.get('extra_columns', []),
+        frame_rate=get_frame_rate(metadata.get('frame_rate')),
+        next_id=int(reader.ids.max()) + 1 if reader.row_count else 0
+    )
+    store.source_path = path
+    return store, metadata
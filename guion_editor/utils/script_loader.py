@@ -0,0 +1,130 @@
+# guion_editor/utils/script_loader.py
+
+import json
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.utils.dialog_utils import iter_guion
+from guion_editor.utils.dialog_wrap import DEFAULT_WRAP_RULES
+from guion_editor.utils.excel_reader import ExcelScriptReader, REQUIRED_COLUMNS
+from guion_editor.utils.timecode import DEFAULT_FRAME_RATE, parse_time_codes
+
+
+def iter_json_rows(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from data
+
+
+ROW_SOURCES = {
+    # Las columnas del .xlsx que no usa el editor se conservan para volver a exportarlas
+    'excel': lambda path, wrap_rules: ExcelScriptReader(path, keep_extra_columns=True),
+    'json': lambda path, wrap_rules: iter_json_rows(path),
+    # Los diálogos del .docx se ajustan al ancho de línea configurado
+    'docx': iter_guion,
+}
+
+
+class ScriptLoadSignals(QObject):
+    # Lista de (valores en el orden de ScriptStore.COLUMNS, extras) ya normalizados
+    chunk_loaded = pyqtSignal(object)
+    # Columnas del archivo que no usa el editor; se emite antes del primer bloque
+    columns_found = pyqtSignal(object)
+    progress = pyqtSignal(int, int)  # filas leídas, total estimado (0 si no se conoce)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ScriptLoadTask(QRunnable):
+    """
+    Lee un guion en un hilo del QThreadPool y lo envía por bloques al hilo de
+    la interfaz. Los tiempos se convierten a fotogramas aquí, bloque a bloque,
+    para que el hilo de la interfaz solo tenga que añadir las líneas al modelo.
+    """
+    FIRST_CHUNK_SIZE = 100  # Bloque pequeño para mostrar cuanto antes las primeras filas
+    CHUNK_SIZE = 1000
+
+    def __init__(self, path, kind, frame_rate=DEFAULT_FRAME_RATE, wrap_rules=DEFAULT_WRAP_RULES):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.path = path
+        self.kind = kind
+        self.frame_rate = frame_rate
+        self.wrap_rules = wrap_rules
+        self.signals = ScriptLoadSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            self._load()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+    def _load(self):
+        source = ROW_SOURCES[self.kind](self.path, self.wrap_rules)
+        rows = iter(source)
+        first = next(rows, None)
+        total = getattr(source, 'row_count', 0)
+        if first is None:
+            self.signals.finished.emit({'rows': 0, 'has_scene_numbers': False})
+            return
+        missing = [col for col in REQUIRED_COLUMNS if col not in first]
+        if missing:
+            raise ValueError("Faltan columnas requeridas en los datos.")
+        extra_columns = [col for col in first if col not in ScriptStore.COLUMNS]
+        self.signals.columns_found.emit(extra_columns)
+
+        has_id = 'ID' in first
+        has_scene = 'SCENE' in first
+        has_scene_numbers = False
+        loaded = 0
+        chunk = [first]
+        chunk_size = self.FIRST_CHUNK_SIZE
+        for row in rows:
+            if self._cancelled:
+                self.signals.cancelled.emit()
+                return
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                has_scene_numbers |= self._emit_chunk(chunk, loaded, has_id, has_scene, extra_columns)
+                loaded += len(chunk)
+                self.signals.progress.emit(loaded, total)
+                chunk = []
+                chunk_size = self.CHUNK_SIZE
+        if self._cancelled:
+            self.signals.cancelled.emit()
+            return
+        if chunk:
+            has_scene_numbers |= self._emit_chunk(chunk, loaded, has_id, has_scene, extra_columns)
+            loaded += len(chunk)
+            self.signals.progress.emit(loaded, total)
+        self.signals.finished.emit({'rows': loaded, 'has_scene_numbers': has_scene_numbers})
+
+    def _emit_chunk(self, chunk, offset, has_id, has_scene, extra_columns):
+        """Normaliza un bloque y lo envía. Devuelve True si hay alguna escena distinta de 1."""
+        in_frames = parse_time_codes([row.get('IN') for row in chunk], self.frame_rate).tolist()
+        out_frames = parse_time_codes([row.get('OUT') for row in chunk], self.frame_rate).tolist()
+        has_scene_numbers = False
+        lines = []
+        for i, row in enumerate(chunk):
+            scene = ScriptStore._to_int(row.get('SCENE'), 1) if has_scene else 1
+            if scene != 1:
+                has_scene_numbers = True
+            row_id = row.get('ID') if has_id else None
+            values = (
+                offset + i if row_id is None else row_id,
+                scene,
+                in_frames[i],
+                out_frames[i],
+                row.get('PERSONAJE'),
+                row.get('DIÁLOGO'),
+            )
+            extras = tuple(row.get(col, '') for col in extra_columns) if extra_columns else None
+            lines.append((values, extras))
+        self.signals.chunk_loaded.emit(lines)
+        return has_scene_numbers
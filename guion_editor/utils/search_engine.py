@@ -0,0 +1,209 @@
+# guion_editor/utils/search_engine.py
+
+"""
+Motor de búsqueda del guion: texto o expresión regular, palabra completa,
+mayúsculas y acentos opcionales y filtros por personaje y rango de escenas.
+
+Sin distinguir acentos, la búsqueda se hace sobre el texto sin marcas
+diacríticas (NFD sin caracteres combinantes) y las posiciones encontradas se
+traducen a posiciones del texto original, para poder resaltarlas y
+reemplazarlas sin perder los acentos del resto de la línea.
+
+SearchTask recorre las filas en un hilo del QThreadPool y envía los resultados
+por bloques al hilo de la interfaz.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from guion_editor.models.script_store import ScriptStore
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(char):
+    return ''.join(c for c in unicodedata.normalize('NFD', char) if not unicodedata.combining(c))
+
+
+def strip_accents(text):
+    if text.isascii():
+        return text
+    return ''.join(_fold_char(char) for char in text)
+
+
+def fold_with_offsets(text):
+    """
+    Devuelve (texto sin acentos, posiciones), donde posiciones[i] es el índice
+    en text del carácter i del resultado, más una entrada final. Para texto
+    ASCII las posiciones no cambian y se devuelve None.
+    """
+    if text.isascii():
+        return text, None
+    chars = []
+    offsets = []
+    for position, char in enumerate(text):
+        folded = _fold_char(char)
+        chars.append(folded)
+        offsets.extend([position] * len(folded))
+    offsets.append(len(text))
+    return ''.join(chars), offsets
+
+
+def _original_span(offsets, start, end):
+    if offsets is None:
+        return start, end
+    if end == start:
+        return offsets[start], offsets[start]
+    return offsets[start], offsets[end - 1] + 1
+
+
+class SearchQuery:
+    """Parámetros de una búsqueda. compile() lanza re.error si la expresión no es válida."""
+
+    def __init__(self, text, regex=False, whole_word=False, word_start=False, case_sensitive=False,
+                 ignore_accents=True, columns=(ScriptStore.COL_CHARACTER, ScriptStore.COL_DIALOGUE),
+                 characters=None, scene_range=None):
+        self.text = text
+        self.regex = regex
+        self.whole_word = whole_word
+        self.word_start = word_start
+        self.case_sensitive = case_sensitive
+        self.ignore_accents = ignore_accents
+        self.columns = tuple(columns)
+        self.characters = set(characters) if characters else None  # None: todos
+        self.scene_range = scene_range  # (primera, última) incluidas, o None
+        self.pattern = None
+
+    def compile(self):
+        source = self.text if self.regex else re.escape(self.text)
+        if self.ignore_accents:
+            source = strip_accents(source)
+        if self.whole_word:
+            source = rf'\b(?:{source})\b'
+        elif self.word_start:
+            source = rf'\b(?:{source})'
+        self.pattern = re.compile(source, 0 if self.case_sensitive else re.IGNORECASE)
+        return self.pattern
+
+    def in_scope(self, scene, character):
+        if self.characters is not None and character not in self.characters:
+            return False
+        if self.scene_range is not None:
+            first, last = self.scene_range
+            if not first <= scene <= last:
+                return False
+        return True
+
+    def _finditer(self, text):
+        if self.pattern is None:
+            self.compile()
+        if self.ignore_accents:
+            folded, offsets = fold_with_offsets(text)
+        else:
+            folded, offsets = text, None
+        for match in self.pattern.finditer(folded):
+            if match.end() > match.start():  # Las coincidencias vacías no se resaltan ni reemplazan
+                yield match, offsets
+
+    def find_spans(self, text):
+        """Lista de (inicio, fin) de las coincidencias en text."""
+        return [_original_span(offsets, *match.span()) for match, offsets in self._finditer(text)]
+
+    def replace(self, text, replacement):
+        """Devuelve text con las coincidencias reemplazadas (admite \\1 y \\g<nombre> si es regex)."""
+        pieces = []
+        last = 0
+        for match, offsets in self._finditer(text):
+            start, end = _original_span(offsets, *match.span())
+            pieces.append(text[last:start])
+            if self.regex:
+                pieces.append(_expand(replacement, match, offsets, text))
+            else:
+                pieces.append(replacement)
+            last = end
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return ''.join(pieces)
+
+
+TEMPLATE_RE = re.compile(r'\\(?:g<(\w+)>|(\d{1,2})|(.))', re.S)
+TEMPLATE_ESCAPES = {'n': '\n', 't': '\t', '\\': '\\'}
+
+
+def _expand(template, match, offsets, text):
+    # Como Match.expand, pero los grupos salen del texto original (con acentos)
+    def group(reference):
+        if reference.isdigit():
+            reference = int(reference)
+        start, end = match.span(reference)
+        if start < 0:
+            return ''
+        start, end = _original_span(offsets, start, end)
+        return text[start:end]
+
+    def substitute(m):
+        name, number, other = m.groups()
+        if name is not None:
+            return group(name)
+        if number is not None:
+            return group(number)
+        return TEMPLATE_ESCAPES.get(other, '\\' + other)
+
+    return TEMPLATE_RE.sub(substitute, template)
+
+
+def search_rows(query, rows):
+    """
+    rows: (ID, escena, personaje, diálogo) en el orden del guion.
+    Genera (ID, columna, [(inicio, fin), ...]) por cada celda con coincidencias.
+    """
+    columns = [column for column in (ScriptStore.COL_CHARACTER, ScriptStore.COL_DIALOGUE) if column in query.columns]
+    for row_id, scene, character, dialogue in rows:
+        if not query.in_scope(scene, character):
+            continue
+        for column in columns:
+            spans = query.find_spans(character if column == ScriptStore.COL_CHARACTER else dialogue)
+            if spans:
+                yield row_id, column, spans
+
+
+class SearchSignals(QObject):
+    hits_found = pyqtSignal(object)  # Lista de (ID, columna, [(inicio, fin), ...])
+    count_changed = pyqtSignal(int)  # Coincidencias encontradas hasta ahora
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+
+class SearchTask(QRunnable):
+    """Busca en una copia de las filas en un hilo del QThreadPool."""
+    CHUNK_SIZE = 500
+
+    def __init__(self, query, rows):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.query = query
+        self.rows = rows
+        self.signals = SearchSignals()
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            count = 0
+            for start in range(0, len(self.rows), self.CHUNK_SIZE):
+                if self._cancelled:
+                    return
+                hits = list(search_rows(self.query, self.rows[start:start + self.CHUNK_SIZE]))
+                if hits:
+                    count += sum(len(spans) for _, _, spans in hits)
+                    self.signals.hits_found.emit(hits)
+                    self.signals.count_changed.emit(count)
+            if not self._cancelled:
+                self.signals.finished.emit(count)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
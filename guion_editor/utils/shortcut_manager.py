@@ -54,6 +54,10 @@ class ShortcutManager:
                     "Pausar/Reproducir": "Ctrl+Up",
                     "Retroceder": "Ctrl+Left",
                     "Avanzar": "Ctrl+Right",
+                    "Fotograma Anterior": "Alt+Left",
+                    "Fotograma Siguiente": "Alt+Right",
+                    "Ir al IN": "Alt+Home",
+                    "Ir al OUT": "Alt+End",
                     "Copiar IN/OUT a Siguiente": "Ctrl+B",
                     "change_scene": "Ctrl+R"
                 }
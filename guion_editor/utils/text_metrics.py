@@ -0,0 +1,40 @@
+# guion_editor/utils/text_metrics.py
+
+from collections import OrderedDict
+
+
+class TextHeightCache:
+    """
+    Alturas de texto ya medidas, por (texto, ancho, fuente), con expulsión LRU.
+
+    La clave es el propio texto (el diccionario usa su hash), así que editar
+    una fila solo invalida su entrada, y cambiar la fuente o el ancho de la
+    columna da claves nuevas sin tener que vaciar la caché.
+    """
+
+    def __init__(self, max_entries=20000):
+        self.max_entries = max_entries
+        self._heights = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def height(self, text, width, font_key, measure):
+        """Altura de text; measure() la calcula si no está en la caché."""
+        key = (text, width, font_key)
+        height = self._heights.get(key)
+        if height is not None:
+            self.hits += 1
+            self._heights.move_to_end(key)
+            return height
+        self.misses += 1
+        height = measure()
+        self._heights[key] = height
+        if len(self._heights) > self.max_entries:
+            self._heights.popitem(last=False)
+        return height
+
+    def clear(self):
+        self._heights.clear()
+
+    def __len__(self):
+        return len(self._heights)
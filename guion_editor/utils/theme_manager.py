@@ -0,0 +1,62 @@
+# guion_editor/utils/theme_manager.py
+
+import os
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+STYLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'styles')
+
+# Hojas de estilo de cada tema, en el orden en que se concatenan
+THEMES = {
+    'Claro': ['main.css', 'table_styles.css'],
+    'Oscuro': ['main.css', 'table_styles.css', 'dark.css'],
+}
+DEFAULT_THEME = 'Claro'
+DEFAULT_FONT_SIZE = 12
+
+# Tamaño de letra configurable: la tabla del guion, sus cabeceras y sus editores
+FONT_RULES = """
+QTableView, QHeaderView::section, QTableView QLineEdit, QTableView QTextEdit {{
+    font-size: {size}pt;
+}}
+"""
+
+
+class ThemeManager(QObject):
+    """
+    Hoja de estilo única de la aplicación. Los .css se leen una sola vez y la
+    hoja completa (tema + tamaño de letra) se aplica sobre la QApplication,
+    así que cambiar de tema o de tamaño es un solo setStyleSheet en lugar de
+    uno por widget.
+    """
+    # (tema, tamaño de letra) tras aplicar un cambio
+    theme_changed = pyqtSignal(str, int)
+
+    def __init__(self, app, parent=None):
+        super().__init__(parent)
+        self.app = app
+        self.theme = None
+        self.font_size = None
+        self._css = {}  # Nombre de archivo -> contenido
+
+    def _read(self, name):
+        if name not in self._css:
+            with open(os.path.join(STYLES_DIR, name), 'r', encoding='utf-8') as f:
+                self._css[name] = f.read()
+        return self._css[name]
+
+    def stylesheet(self, theme, font_size):
+        parts = [self._read(name) for name in THEMES[theme]]
+        parts.append(FONT_RULES.format(size=font_size))
+        return "\n".join(parts)
+
+    def apply(self, theme=None, font_size=None):
+        """Aplica el tema y el tamaño de letra (los que no se indican se conservan). Lanza OSError si falta un .css."""
+        theme = theme or self.theme or DEFAULT_THEME
+        font_size = font_size or self.font_size or DEFAULT_FONT_SIZE
+        if (theme, font_size) == (self.theme, self.font_size):
+            return
+        self.app.setStyleSheet(self.stylesheet(theme, font_size))
+        self.theme = theme
+        self.font_size = font_size
+        self.theme_changed.emit(theme, font_size)
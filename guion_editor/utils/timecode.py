@@ -0,0 +1,200 @@
+# guion_editor/utils/timecode.py
+
+"""
+Conversión entre códigos de tiempo "HH:MM:SS:FF", fotogramas y milisegundos.
+
+Los tiempos del guion se guardan como número entero de fotogramas; el texto
+solo se genera al mostrarlo o al exportarlo. Cada función escalar tiene una
+versión vectorizada con NumPy (sufijo en plural) que procesa columnas enteras
+en una sola pasada.
+
+Soporta 24, 25 y 30 fps y 29,97 fps drop-frame (SMPTE: se omiten los números
+de fotograma 00 y 01 al empezar cada minuto salvo en los múltiplos de 10).
+"""
+
+from fractions import Fraction
+
+import numpy as np
+
+
+class FrameRate:
+    def __init__(self, label, numerator, denominator=1, drop_frame=False):
+        self.label = label
+        self.numerator = numerator
+        self.denominator = denominator
+        self.drop_frame = drop_frame
+        # Fotogramas por segundo en la numeración del código de tiempo
+        self.timebase = round(Fraction(numerator, denominator))
+        # Números de fotograma omitidos por minuto en drop-frame
+        self.dropped = round(self.timebase * 0.066666) if drop_frame else 0
+        self.frames_per_minute = self.timebase * 60 - self.dropped
+        self.frames_per_10_minutes = self.timebase * 600 - self.dropped * 9
+        self.separator = ';' if drop_frame else ':'
+
+    @property
+    def fps(self):
+        return self.numerator / self.denominator
+
+    def __repr__(self):
+        return f"FrameRate({self.label!r})"
+
+
+FPS_24 = FrameRate("24", 24)
+FPS_25 = FrameRate("25", 25)
+FPS_2997_DF = FrameRate("29.97 DF", 30000, 1001, drop_frame=True)
+FPS_30 = FrameRate("30", 30)
+
+FRAME_RATES = {rate.label: rate for rate in (FPS_24, FPS_25, FPS_2997_DF, FPS_30)}
+DEFAULT_FRAME_RATE = FPS_25
+
+
+def get_frame_rate(label):
+    return FRAME_RATES.get(str(label), DEFAULT_FRAME_RATE)
+
+
+# --- Escalares ---
+
+def parse_time_code(time_code, rate=DEFAULT_FRAME_RATE):
+    """Convierte "HH:MM:SS:FF" (o "HH:MM:SS;FF") a fotogramas. Lanza ValueError si el formato no es válido."""
+    parts = str(time_code).replace(';', ':').split(':')
+    if len(parts) != 4:
+        raise ValueError("Formato de time code inválido.")
+    hours, minutes, seconds, frames = map(int, parts)
+    total = (hours * 3600 + minutes * 60 + seconds) * rate.timebase + frames
+    if rate.drop_frame:
+        total_minutes = hours * 60 + minutes
+        total -= rate.dropped * (total_minutes - total_minutes // 10)
+    return total
+
+
+def format_time_code(frames, rate=DEFAULT_FRAME_RATE):
+    """Convierte fotogramas a "HH:MM:SS:FF" ("HH:MM:SS;FF" en drop-frame)."""
+    frames = max(int(frames), 0)
+    if rate.drop_frame:
+        frames = _drop_frame_label(frames, rate)
+    total_seconds, frame = divmod(frames, rate.timebase)
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02}:{minutes:02}:{seconds:02}{rate.separator}{frame:02}"
+
+
+def _drop_frame_label(frames, rate):
+    """Convierte un número real de fotogramas al número nominal que muestra el código drop-frame."""
+    tens, remainder = divmod(frames, rate.frames_per_10_minutes)
+    frames += rate.dropped * 9 * tens
+    if remainder > rate.dropped:
+        frames += rate.dropped * ((remainder - rate.dropped) // rate.frames_per_minute)
+    return frames
+
+
+def frames_to_milliseconds(frames, rate=DEFAULT_FRAME_RATE):
+    """Inicio del fotograma en milisegundos (redondeado hacia arriba para caer dentro del fotograma)."""
+    return -(-int(frames) * 1000 * rate.denominator // rate.numerator)
+
+
+def milliseconds_to_frames(milliseconds, rate=DEFAULT_FRAME_RATE):
+    """Fotograma que se está mostrando en la posición dada (trunca)."""
+    return int(milliseconds) * rate.numerator // (1000 * rate.denominator)
+
+
+def convert_frames(frames, from_rate, to_rate):
+    """Reinterpreta un tiempo en otra frecuencia conservando su código de tiempo."""
+    if from_rate is to_rate:
+        return frames
+    return convert_frames_array(np.asarray([frames]), from_rate, to_rate)[0].item()
+
+
+# --- Vectorizadas ---
+
+_DIGIT_POSITIONS = [0, 1, 3, 4, 6, 7, 9, 10]
+_SEPARATOR_POSITIONS = [2, 5, 8]
+
+
+def parse_time_codes(time_codes, rate=DEFAULT_FRAME_RATE, default=0):
+    """
+    Convierte una secuencia de códigos de tiempo a un array de fotogramas (int64).
+    Los valores con formato canónico de 11 caracteres se procesan en bloque;
+    el resto pasa por parse_time_code y, si no es válido, toma el valor default.
+    """
+    values = ["" if code is None else str(code) for code in time_codes]
+    if not values:
+        return np.zeros(0, dtype=np.int64)
+    chars = np.array(values, dtype='U11').view(np.uint32).reshape(len(values), 11)
+    digits = chars[:, _DIGIT_POSITIONS].astype(np.int64) - 48
+    separators = chars[:, _SEPARATOR_POSITIONS]
+    valid = (
+        (digits >= 0).all(axis=1) & (digits <= 9).all(axis=1)
+        & (separators[:, :2] == ord(':')).all(axis=1)
+        & np.isin(separators[:, 2], (ord(':'), ord(';')))
+        & np.fromiter((len(value) == 11 for value in values), dtype=bool, count=len(values))
+    )
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 2] * 10 + digits[:, 3]
+    seconds = digits[:, 4] * 10 + digits[:, 5]
+    frames = (hours * 3600 + minutes * 60 + seconds) * rate.timebase + digits[:, 6] * 10 + digits[:, 7]
+    if rate.drop_frame:
+        total_minutes = hours * 60 + minutes
+        frames -= rate.dropped * (total_minutes - total_minutes // 10)
+    for index in np.flatnonzero(~valid):
+        try:
+            frames[index] = parse_time_code(values[index], rate)
+        except ValueError:
+            frames[index] = default
+    return frames
+
+
+def format_time_codes(frames, rate=DEFAULT_FRAME_RATE):
+    """Convierte un array de fotogramas a una lista de códigos de tiempo."""
+    frames = np.maximum(np.asarray(frames, dtype=np.int64), 0)
+    if frames.size == 0:
+        return []
+    if rate.drop_frame:
+        tens, remainder = np.divmod(frames, rate.frames_per_10_minutes)
+        extra = np.where(
+            remainder > rate.dropped,
+            rate.dropped * ((remainder - rate.dropped) // rate.frames_per_minute),
+            0
+        )
+        frames = frames + rate.dropped * 9 * tens + extra
+    total_seconds, frame = np.divmod(frames, rate.timebase)
+    minutes, seconds = np.divmod(total_seconds, 60)
+    hours, minutes = np.divmod(minutes, 60)
+    hours = np.minimum(hours, 99)
+
+    chars = np.empty((frames.size, 11), dtype=np.uint32)
+    for position, field in ((0, hours), (3, minutes), (6, seconds), (9, frame)):
+        chars[:, position] = field // 10 + 48
+        chars[:, position + 1] = field % 10 + 48
+    chars[:, 2] = chars[:, 5] = ord(':')
+    chars[:, 8] = ord(rate.separator)
+    return chars.view('U11').ravel().tolist()
+
+
+def frames_to_milliseconds_array(frames, rate=DEFAULT_FRAME_RATE):
+    frames = np.asarray(frames, dtype=np.int64)
+    return -(-frames * 1000 * rate.denominator // rate.numerator)
+
+
+def milliseconds_to_frames_array(milliseconds, rate=DEFAULT_FRAME_RATE):
+    milliseconds = np.asarray(milliseconds, dtype=np.int64)
+    return milliseconds * rate.numerator // (1000 * rate.denominator)
+
+
+def shift_frames(frames, offset):
+    """Desplaza un array de fotogramas, sin bajar de cero."""
+    return np.maximum(np.asarray(frames, dtype=np.int64) + int(offset), 0)
+
+
+def convert_frames_array(frames, from_rate, to_rate):
+    """Reinterpreta un array de tiempos en otra frecuencia conservando sus códigos de tiempo."""
+    frames = np.asarray(frames, dtype=np.int64)
+    if from_rate is to_rate:
+        return frames.copy()
+    codes = format_time_codes(frames, from_rate)
+    converted = parse_time_codes(codes, to_rate)
+    # Un número de fotograma que no existe en la nueva frecuencia se lleva al último del segundo
+    over = np.array([int(code[-2:]) >= to_rate.timebase for code in codes], dtype=bool)
+    if over.any():
+        clamped = [code[:-2] + f"{to_rate.timebase - 1:02}" for code in np.asarray(codes)[over]]
+        converted[over] = parse_time_codes(clamped, to_rate)
+    return converted
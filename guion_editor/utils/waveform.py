@@ -0,0 +1,249 @@
+# guion_editor/utils/waveform.py
+
+"""
+Forma de onda del audio del video, como pirámide de picos.
+
+El nivel 0 guarda el mínimo y el máximo de cada bloque de BASE_BLOCK
+muestras (de todos los canales); cada nivel siguiente junta LEVEL_FACTOR
+bloques del anterior. Para pintar, se usa el nivel más grueso cuyo bloque
+no pasa de las muestras que caben en un píxel, así que el coste no depende
+de la duración del audio.
+
+Se calcula una sola vez con NumPy sobre el PCM del .wav mapeado en memoria,
+en un proceso aparte (WaveformTask), y se guarda junto al audio en
+<audio>.peaks.npz con el tamaño y la fecha de modificación del audio: si no
+han cambiado, la siguiente vez se lee directamente. Para un video se usa el
+.wav con el mismo nombre, si existe (p. ej. pelicula.mp4 -> pelicula.wav).
+"""
+
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from guion_editor.utils.process_pool import make_executor
+
+BASE_BLOCK = 256          # Muestras por bloque del nivel 0
+LEVEL_FACTOR = 4          # Bloques de un nivel que forman uno del siguiente
+MIN_TOP_BLOCKS = 2048     # Se dejan de añadir niveles al bajar de aquí
+CHUNK_BLOCKS = 4096       # Bloques del nivel 0 que se leen de una vez
+CACHE_SUFFIX = '.peaks.npz'
+CACHE_VERSION = 1
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+WavLayout = namedtuple('WavLayout', 'sample_rate channels format bits offset frames')
+
+
+def _pcm24_to_int(raw):
+    # raw: (muestras, canales, 3) bytes little-endian con signo
+    values = raw[..., 0].astype(np.int32) | (raw[..., 1].astype(np.int32) << 8) | (raw[..., 2].astype(np.int32) << 16)
+    return np.where(values >= 1 << 23, values - (1 << 24), values)
+
+
+# (formato, bits) -> (dtype en disco, cero, escala): muestra en [-1, 1] = (valor - cero) / escala
+SAMPLE_FORMATS = {
+    (WAVE_FORMAT_PCM, 8): ('u1', 128, 1 << 7),
+    (WAVE_FORMAT_PCM, 16): ('<i2', 0, 1 << 15),
+    (WAVE_FORMAT_PCM, 24): ('u1', 0, 1 << 23),
+    (WAVE_FORMAT_PCM, 32): ('<i4', 0, 1 << 31),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): ('<f4', 0, 1),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): ('<f8', 0, 1),
+}
+
+
+def find_audio_source(media_path):
+    """El .wav del que se saca la forma de onda de media_path, o None."""
+    if media_path.lower().endswith('.wav'):
+        return media_path
+    base = os.path.splitext(media_path)[0]
+    for extension in ('.wav', '.WAV'):
+        if os.path.exists(base + extension):
+            return base + extension
+    return None
+
+
+def read_wav_layout(path):
+    """Formato y posición de las muestras de un .wav PCM o de coma flotante."""
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError("El archivo no es un WAV.")
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError("El WAV no tiene datos de audio.")
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                data = f.read(size)
+                audio_format, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', data[:16])
+                if audio_format == WAVE_FORMAT_EXTENSIBLE and len(data) >= 26:
+                    audio_format = struct.unpack('<H', data[24:26])[0]
+                fmt = (audio_format, channels, sample_rate, bits)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError("El WAV no tiene cabecera de formato.")
+                audio_format, channels, sample_rate, bits = fmt
+                if (audio_format, bits) not in SAMPLE_FORMATS:
+                    raise ValueError(f"Formato de audio no soportado ({audio_format}, {bits} bits).")
+                offset = f.tell()
+                # Los WAV escritos en directo pueden no tener el tamaño real
+                size = min(size, file_size - offset)
+                frames = size // (channels * bits // 8)
+                return WavLayout(sample_rate, channels, audio_format, bits, offset, frames)
+            else:
+                f.seek(size + (size & 1), os.SEEK_CUR)  # Los bloques van alineados a 2 bytes
+
+
+class PeakPyramid:
+    """Mínimos y máximos por bloque a varios niveles de zoom."""
+
+    def __init__(self, sample_rate, levels):
+        self.sample_rate = sample_rate
+        self.levels = levels  # [(muestras por bloque, mínimos, máximos)], del más fino al más grueso
+
+    def duration(self):
+        block, mins, _ = self.levels[0]
+        return len(mins) * block / self.sample_rate
+
+    def peaks(self, start_seconds, seconds_per_pixel, width):
+        """(mínimos, máximos) de cada una de las width columnas a partir de start_seconds."""
+        samples_per_pixel = seconds_per_pixel * self.sample_rate
+        block, mins, maxs = self.levels[0]
+        for level in self.levels[1:]:
+            if level[0] > samples_per_pixel:
+                break
+            block, mins, maxs = level
+        # Cada columna toma los bloques que toca, aunque sea en parte, para no perder picos
+        edges = (start_seconds + np.arange(width + 1) * seconds_per_pixel) * self.sample_rate / block
+        first = np.floor(edges[:-1]).astype(np.int64)
+        last = np.ceil(edges[1:]).astype(np.int64)
+        count = len(mins)
+        column_min = np.zeros(width, dtype=np.float32)
+        column_max = np.zeros(width, dtype=np.float32)
+        inside = (first < count) & (last > 0)
+        if not inside.any():
+            return column_min, column_max
+        first = np.clip(first[inside], 0, count - 1)
+        last = np.clip(np.maximum(last[inside], first + 1), 1, count)
+        # reduceat con los índices [inicio, fin, inicio, fin...]: los resultados pares son
+        # cada [inicio, fin); se añade un elemento al final para que fin pueda valer count
+        indices = np.empty(2 * len(first), dtype=np.int64)
+        indices[0::2] = first
+        indices[1::2] = last
+        column_min[inside] = np.minimum.reduceat(np.append(mins, 0), indices)[0::2]
+        column_max[inside] = np.maximum.reduceat(np.append(maxs, 0), indices)[0::2]
+        return column_min, column_max
+
+
+def compute_peaks(path):
+    """Calcula la pirámide de picos de un .wav leyendo sus muestras mapeadas en memoria."""
+    layout = read_wav_layout(path)
+    dtype, zero, scale = SAMPLE_FORMATS[(layout.format, layout.bits)]
+    shape = (layout.frames, layout.channels, 3) if layout.bits == 24 else (layout.frames, layout.channels)
+    block_count = -(-layout.frames // BASE_BLOCK)
+    mins = np.zeros(block_count, dtype=np.float64)
+    maxs = np.zeros(block_count, dtype=np.float64)
+    if layout.frames:
+        samples = np.memmap(path, dtype=dtype, mode='r', offset=layout.offset, shape=shape)
+        step = BASE_BLOCK * CHUNK_BLOCKS
+        for start in range(0, layout.frames, step):
+            chunk = samples[start:start + step]
+            if layout.bits == 24:
+                chunk = _pcm24_to_int(chunk)
+            # Los canales van intercalados: un bloque son BASE_BLOCK muestras de todos ellos
+            chunk = chunk.reshape(-1)
+            indices = np.arange(0, len(chunk), BASE_BLOCK * layout.channels)
+            first = start // BASE_BLOCK
+            mins[first:first + len(indices)] = np.minimum.reduceat(chunk, indices)
+            maxs[first:first + len(indices)] = np.maximum.reduceat(chunk, indices)
+        del samples
+    # La conversión es creciente: basta con convertir los extremos de cada bloque
+    mins = ((mins - zero) / scale).astype(np.float32)
+    maxs = ((maxs - zero) / scale).astype(np.float32)
+    levels = [(BASE_BLOCK, mins, maxs)]
+    while len(levels[-1][1]) > MIN_TOP_BLOCKS:
+        block, mins, maxs = levels[-1]
+        indices = np.arange(0, len(mins), LEVEL_FACTOR)
+        levels.append((block * LEVEL_FACTOR, np.minimum.reduceat(mins, indices), np.maximum.reduceat(maxs, indices)))
+    return PeakPyramid(layout.sample_rate, levels)
+
+
+# --- Caché en disco ---
+
+def cache_path(path):
+    return path + CACHE_SUFFIX
+
+
+def _source_key(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_cached_peaks(path):
+    """La pirámide guardada junto a path si sigue siendo válida, o None."""
+    try:
+        with np.load(cache_path(path)) as data:
+            if int(data['version']) != CACHE_VERSION or tuple(data['source']) != _source_key(path):
+                return None
+            blocks = data['blocks']
+            levels = [(int(block), data[f'min_{level}'], data[f'max_{level}']) for level, block in enumerate(blocks)]
+            return PeakPyramid(int(data['sample_rate']), levels)
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_cached_peaks(path, pyramid):
+    arrays = {
+        'version': np.array(CACHE_VERSION),
+        'source': np.array(_source_key(path), dtype=np.int64),
+        'sample_rate': np.array(pyramid.sample_rate),
+        'blocks': np.array([block for block, _, _ in pyramid.levels], dtype=np.int64),
+    }
+    for level, (_, mins, maxs) in enumerate(pyramid.levels):
+        arrays[f'min_{level}'] = mins
+        arrays[f'max_{level}'] = maxs
+    # Se escribe aparte y se renombra: nunca queda una caché a medias
+    temporary = cache_path(path) + '.tmp'
+    with open(temporary, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(temporary, cache_path(path))
+
+
+def build_peak_cache(path):
+    """Calcula la pirámide de path y la guarda junto a él (si se puede escribir en la carpeta)."""
+    pyramid = compute_peaks(path)
+    try:
+        save_cached_peaks(path, pyramid)
+    except OSError:
+        pass  # Sin caché: se volverá a calcular la próxima vez
+    return pyramid
+
+
+class WaveformSignals(QObject):
+    finished = pyqtSignal(str, object)  # ruta del audio, PeakPyramid
+    failed = pyqtSignal(str, str)       # ruta del audio, mensaje
+
+
+class WaveformTask(QRunnable):
+    """Calcula la pirámide de picos en otro proceso sin bloquear la interfaz."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.path = path
+        self.signals = WaveformSignals()
+
+    def run(self):
+        try:
+            with make_executor(1) as executor:
+                pyramid = executor.submit(build_peak_cache, self.path).result()
+            self.signals.finished.emit(self.path, pyramid)
+        except Exception as e:
+            self.signals.failed.emit(self.path, str(e))
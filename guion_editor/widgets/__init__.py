@@ -4,5 +4,5 @@ from .video_player_widget import VideoPlayerWidget
 from .video_window import VideoWindow
 from .table_window import TableWindow
 from .config_dialog import ConfigDialog
-from .custom_table_widget import CustomTableWidget
+from .custom_table_view import CustomTableView
 from .shortcut_config_dialog import ShortcutConfigDialog
@@ -1,45 +1,148 @@
 # guion_editor/widgets/cast_window.py
 
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QMessageBox
-from PyQt5.QtCore import Qt
+from functools import partial
+
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, QMessageBox, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel, pyqtSignal
+
+from guion_editor.models.character_stats import LINES, WORDS, CHARS, FRAMES
+from guion_editor.utils.timecode import format_time_code
+
+
+class CastTableModel(QAbstractTableModel):
+    """
+    Vista de tabla sobre CharacterStats. Se mantiene al día con las
+    notificaciones del servicio: solo repinta las filas de los personajes que
+    cambian y se reinicia cuando aparece o desaparece un personaje.
+    """
+    # Emite (nombre_anterior, nombre_nuevo) al editar un nombre; la ventana decide qué hacer
+    rename_requested = pyqtSignal(str, str)
+
+    HEADERS = ["Personaje", "Intervenciones", "Palabras", "Caracteres", "Tiempo"]
+    STAT_COLUMNS = {1: LINES, 2: WORDS, 3: CHARS, 4: FRAMES}
+    SORT_ROLE = Qt.UserRole
+
+    def __init__(self, table_window, parent=None):
+        super().__init__(parent)
+        self.table_window = table_window
+        self.stats = table_window.character_stats
+        self.character_ids = self.stats.characters()
+        self.rows = {character_id: row for row, character_id in enumerate(self.character_ids)}
+        self.stats.add_listener(self.on_stats_changed)
+        # Si el modelo se destruye sin cerrar la ventana, el servicio no debe seguir avisándole
+        self.destroyed.connect(partial(self.stats.remove_listener, self.on_stats_changed))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.character_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole, self.SORT_ROLE):
+            return None
+        character_id = self.character_ids[index.row()]
+        if index.column() == 0:
+            name = self.stats.store.character_name(character_id)
+            return name.lower() if role == self.SORT_ROLE else name
+        value = self.stats.totals(character_id)[self.STAT_COLUMNS[index.column()]]
+        if role == self.SORT_ROLE:
+            return value
+        if index.column() == 4:
+            return format_time_code(value, self.stats.store.frame_rate)
+        return str(value)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or index.column() != 0 or role != Qt.EditRole:
+            return False
+        old_name = self.data(index)
+        new_name = str(value).strip()
+        if new_name != old_name:
+            self.rename_requested.emit(old_name, new_name)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == 0:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def on_stats_changed(self, characters):
+        if characters is None or any(
+            character_id not in self.rows or not self.stats.totals(character_id)[LINES]
+            for character_id in characters
+        ):
+            # Ha aparecido o desaparecido algún personaje
+            self.beginResetModel()
+            self.character_ids = self.stats.characters()
+            self.rows = {character_id: row for row, character_id in enumerate(self.character_ids)}
+            self.endResetModel()
+            return
+        for character_id in characters:
+            row = self.rows[character_id]
+            self.dataChanged.emit(self.index(row, 1), self.index(row, len(self.HEADERS) - 1))
+
+    def detach(self):
+        self.stats.remove_listener(self.on_stats_changed)
+
 
 class CastWindow(QWidget):
     def __init__(self, parent_table_window):
         super().__init__()
         self.parent_table_window = parent_table_window
         self.setWindowTitle("Reparto Completo")
-        self.setGeometry(200, 200, 400, 600)
+        self.setGeometry(200, 200, 560, 600)
         self.setup_ui()
 
     def setup_ui(self):
         layout = QVBoxLayout()
-        self.table_widget = QTableWidget()
-        self.table_widget.setColumnCount(2)
-        self.table_widget.setHorizontalHeaderLabels(["Personaje", "Intervenciones"])
-        self.table_widget.horizontalHeader().setStretchLastSection(True)
-        layout.addWidget(self.table_widget)
+        self.model = CastTableModel(self.parent_table_window, self)
+        self.model.rename_requested.connect(self.on_rename_requested)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setSortRole(CastTableModel.SORT_ROLE)
+        self.proxy_model.setDynamicSortFilter(True)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy_model)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.sortByColumn(1, Qt.DescendingOrder)  # Más intervenciones primero
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table_view)
+
+        buttons_layout = QHBoxLayout()
+        filter_button = QPushButton("Mostrar solo este personaje")
+        filter_button.clicked.connect(self.filter_selected_character)
+        clear_filter_button = QPushButton("Mostrar todos")
+        clear_filter_button.clicked.connect(self.parent_table_window.clear_character_filter)
+        buttons_layout.addWidget(filter_button)
+        buttons_layout.addWidget(clear_filter_button)
+        layout.addLayout(buttons_layout)
         self.setLayout(layout)
-        self.populate_table()
-
-    def populate_table(self):
-        character_counts = self.parent_table_window.dataframe['PERSONAJE'].value_counts()
-        self.table_widget.setRowCount(len(character_counts))
-        for row, (character, count) in enumerate(character_counts.items()):
-            character_item = QTableWidgetItem(character)
-            interventions_item = QTableWidgetItem(str(count))
-            self.table_widget.setItem(row, 0, character_item)
-            self.table_widget.setItem(row, 1, interventions_item)
-        self.table_widget.itemChanged.connect(self.on_item_changed)
-
-    def on_item_changed(self, item):
-        if item.column() == 0:
-            old_name = item.data(Qt.UserRole)
-            new_name = item.text()
-            if old_name != new_name:
-                self.parent_table_window.update_character_name(old_name, new_name)
-                item.setData(Qt.UserRole, new_name)
-                QMessageBox.information(self, "Nombre Actualizado", f"'{old_name}' ha sido cambiado a '{new_name}'.")
-
-    def showEvent(self, event):
-        super().showEvent(event)
-        self.populate_table()
+
+    def filter_selected_character(self):
+        index = self.table_view.currentIndex()
+        if not index.isValid():
+            QMessageBox.information(self, "Filtrar", "Selecciona un personaje.")
+            return
+        name = self.proxy_model.index(index.row(), 0).data()
+        self.parent_table_window.set_character_filter(name)
+
+    def on_rename_requested(self, old_name, new_name):
+        if not new_name:
+            QMessageBox.warning(self, "Entrada Inválida", "El nombre del personaje no puede estar vacío.")
+            return
+        self.parent_table_window.update_character_name(old_name, new_name)
+        QMessageBox.information(self, "Nombre Actualizado", f"'{old_name}' ha sido cambiado a '{new_name}'.")
+
+    def closeEvent(self, event):
+        self.model.detach()
+        super().closeEvent(event)
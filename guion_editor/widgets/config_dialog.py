@@ -1,18 +1,23 @@
 # guion_editor/widgets/config_dialog.py
 
 from PyQt5.QtWidgets import (
-    QDialog, QVBoxLayout, QLabel, QSpinBox, QPushButton, QHBoxLayout
+    QDialog, QVBoxLayout, QLabel, QSpinBox, QPushButton, QHBoxLayout, QComboBox, QCheckBox
 )
 from PyQt5.QtCore import Qt
+from guion_editor.utils.timecode import FRAME_RATES, DEFAULT_FRAME_RATE
+from guion_editor.utils.dialog_wrap import WrapRules, DEFAULT_WRAP_RULES, PARENTHESES, BRACKETS
+from guion_editor.utils.theme_manager import THEMES, DEFAULT_THEME
 
 class ConfigDialog(QDialog):
-    def __init__(self, current_trim=0, current_font_size=12):
+    def __init__(self, current_trim=0, current_font_size=12, current_frame_rate=DEFAULT_FRAME_RATE,
+                 current_wrap_rules=DEFAULT_WRAP_RULES, current_theme=DEFAULT_THEME):
         super().__init__()
         self.setWindowTitle("Configuración")
-        self.setFixedSize(300, 200)
-        self.init_ui(current_trim, current_font_size)
+        self.setFixedSize(300, 350)
+        self.init_ui(current_trim, current_font_size, current_frame_rate, current_wrap_rules, current_theme)
 
-    def init_ui(self, current_trim: int, current_font_size: int) -> None:
+    def init_ui(self, current_trim: int, current_font_size: int, current_frame_rate, current_wrap_rules,
+                current_theme: str) -> None:
         layout = QVBoxLayout()
 
         # Configuración de TRIM
@@ -35,6 +40,40 @@ class ConfigDialog(QDialog):
         font_layout.addWidget(self.font_spinbox)
         layout.addLayout(font_layout)
 
+        # Tema de la interfaz
+        theme_layout = QHBoxLayout()
+        theme_label = QLabel("Tema:")
+        self.theme_combo = QComboBox()
+        self.theme_combo.addItems(list(THEMES.keys()))
+        self.theme_combo.setCurrentText(current_theme)
+        theme_layout.addWidget(theme_label)
+        theme_layout.addWidget(self.theme_combo)
+        layout.addLayout(theme_layout)
+
+        # Configuración de la frecuencia de fotogramas
+        fps_layout = QHBoxLayout()
+        fps_label = QLabel("Fotogramas por segundo:")
+        self.fps_combo = QComboBox()
+        self.fps_combo.addItems(list(FRAME_RATES.keys()))
+        self.fps_combo.setCurrentText(current_frame_rate.label)
+        fps_layout.addWidget(fps_label)
+        fps_layout.addWidget(self.fps_combo)
+        layout.addLayout(fps_layout)
+
+        # Ajuste de diálogos
+        wrap_layout = QHBoxLayout()
+        wrap_label = QLabel("Caracteres por línea:")
+        self.wrap_spinbox = QSpinBox()
+        self.wrap_spinbox.setRange(20, 200)
+        self.wrap_spinbox.setValue(current_wrap_rules.width)
+        wrap_layout.addWidget(wrap_label)
+        wrap_layout.addWidget(self.wrap_spinbox)
+        layout.addLayout(wrap_layout)
+
+        self.brackets_checkbox = QCheckBox("No contar las anotaciones [ ]")
+        self.brackets_checkbox.setChecked(BRACKETS in current_wrap_rules.hidden_pairs)
+        layout.addWidget(self.brackets_checkbox)
+
         # Botones Aceptar y Cancelar
         buttons_layout = QHBoxLayout()
         self.accept_button = QPushButton("Aceptar")
@@ -49,4 +88,11 @@ class ConfigDialog(QDialog):
         self.setLayout(layout)
 
     def get_values(self) -> tuple:
-        return self.trim_spinbox.value(), self.font_spinbox.value()
+        hidden_pairs = (PARENTHESES, BRACKETS) if self.brackets_checkbox.isChecked() else (PARENTHESES,)
+        return (
+            self.trim_spinbox.value(),
+            self.font_spinbox.value(),
+            self.theme_combo.currentText(),
+            FRAME_RATES[self.fps_combo.currentText()],
+            WrapRules(self.wrap_spinbox.value(), hidden_pairs)
+        )
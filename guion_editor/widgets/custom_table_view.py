@@ -1,16 +1,24 @@
-# guion_editor/widgets/custom_table_widget.py
+# guion_editor/widgets/custom_table_view.py
 
-from PyQt5.QtWidgets import QTableWidget, QApplication
+from PyQt5.QtWidgets import QTableView, QApplication
 from PyQt5.QtCore import pyqtSignal, Qt
 
 
-class CustomTableWidget(QTableWidget):
+class CustomTableView(QTableView):
     cellCtrlClicked = pyqtSignal(int)  # Emite la fila clicada
     cellAltClicked = pyqtSignal(int)
 
     def __init__(self, parent=None):
         super().__init__(parent)
 
+    def currentRow(self):
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def rowCount(self):
+        model = self.model()
+        return model.rowCount() if model is not None else 0
+
     def mousePressEvent(self, event):
         modifiers = QApplication.keyboardModifiers()
         if event.button() == Qt.LeftButton:
@@ -1,18 +1,36 @@
 # guion_editor/widgets/find_replace_dialog.py
 
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, QMessageBox
+import re
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, QMessageBox, QCheckBox,
+    QComboBox, QSpinBox, QLabel, QGridLayout
+)
+
+from guion_editor.utils.search_engine import SearchQuery
 
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QLineEdit, QHBoxLayout, QPushButton, QMessageBox, QCheckBox
 
 class FindReplaceDialog(QDialog):
+    ALL_CHARACTERS = "Todos"
+
     def __init__(self, table_window):
         super().__init__()
         self.table_window = table_window
         self.setWindowTitle("Buscar y Reemplazar")
-        self.current_search_results = []
+        self.current_search_results = []  # IDs de las filas con coincidencias, en orden
         self.current_search_index = -1
+        self.query = None  # Última búsqueda lanzada desde el diálogo
+        self.search_version = None  # Versión del índice con la que se lanzó la búsqueda
+        self.pending_step = 0  # Paso de Buscar Siguiente/Anterior pendiente de resultados
 
         self.setup_ui()
+        # Construir el índice al abrir, para que la primera búsqueda ya sea inmediata
+        self.table_window.text_index.ensure_built()
+
+        self.table_window.search_hits_found.connect(self.on_hits_found)
+        self.table_window.search_count_changed.connect(self.on_count_changed)
+        self.table_window.search_finished.connect(self.on_search_finished)
+        self.finished.connect(self.on_dialog_finished)
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -27,10 +45,42 @@ class FindReplaceDialog(QDialog):
         self.search_in_character = QCheckBox("Buscar en Personaje")
         self.search_in_dialogue = QCheckBox("Buscar en Diálogo")
         self.search_in_dialogue.setChecked(True)  # Por defecto, buscar en Diálogo
+        self.word_prefix = QCheckBox("Solo al inicio de palabra")
+        self.whole_word = QCheckBox("Palabra completa")
+        self.use_regex = QCheckBox("Expresión regular")
+        self.case_sensitive = QCheckBox("Distinguir mayúsculas")
+        self.ignore_accents = QCheckBox("Ignorar acentos")
+        self.ignore_accents.setChecked(True)
+
+        options_layout = QGridLayout()
+        options = [
+            self.search_in_character, self.search_in_dialogue, self.word_prefix, self.whole_word,
+            self.use_regex, self.case_sensitive, self.ignore_accents
+        ]
+        for position, checkbox in enumerate(options):
+            options_layout.addWidget(checkbox, position // 2, position % 2)
+
+        # Ámbito: personaje y rango de escenas (0 = sin límite)
+        scope_layout = QFormLayout()
+        self.character_filter = QComboBox()
+        self.character_filter.addItem(self.ALL_CHARACTERS)
+        self.character_filter.addItems(self.table_window.get_character_names())
+        self.scene_from = QSpinBox()
+        self.scene_to = QSpinBox()
+        scenes_layout = QHBoxLayout()
+        for spin_box in (self.scene_from, self.scene_to):
+            spin_box.setRange(0, 99999)
+            spin_box.setSpecialValueText("Sin límite")
+            scenes_layout.addWidget(spin_box)
+        scope_layout.addRow("Personaje:", self.character_filter)
+        scope_layout.addRow("Escenas:", scenes_layout)
+
+        self.count_label = QLabel()
 
         layout.addLayout(form_layout)
-        layout.addWidget(self.search_in_character)
-        layout.addWidget(self.search_in_dialogue)
+        layout.addLayout(options_layout)
+        layout.addLayout(scope_layout)
+        layout.addWidget(self.count_label)
 
         # Botones
         button_layout = QHBoxLayout()
@@ -47,69 +97,129 @@ class FindReplaceDialog(QDialog):
 
         # Conectar señales
         self.find_text_input.textChanged.connect(self.reset_search)
+        for checkbox in options:
+            checkbox.toggled.connect(self.reset_search)
+        self.character_filter.currentIndexChanged.connect(self.reset_search)
+        self.scene_from.valueChanged.connect(self.reset_search)
+        self.scene_to.valueChanged.connect(self.reset_search)
         self.find_next_button.clicked.connect(self.find_next)
         self.find_prev_button.clicked.connect(self.find_previous)
         self.replace_button.clicked.connect(self.replace_all)
         self.close_button.clicked.connect(self.close)
 
+    def build_query(self):
+        columns = []
+        if self.search_in_character.isChecked():
+            columns.append(self.table_window.COL_CHARACTER)
+        if self.search_in_dialogue.isChecked():
+            columns.append(self.table_window.COL_DIALOGUE)
+        character = self.character_filter.currentText()
+        scene_range = None
+        if self.scene_from.value() or self.scene_to.value():
+            scene_range = (self.scene_from.value(), self.scene_to.value() or float('inf'))
+        query = SearchQuery(
+            self.find_text_input.text(),
+            regex=self.use_regex.isChecked(),
+            whole_word=self.whole_word.isChecked(),
+            word_start=self.word_prefix.isChecked(),
+            case_sensitive=self.case_sensitive.isChecked(),
+            ignore_accents=self.ignore_accents.isChecked(),
+            columns=columns,
+            characters=None if character == self.ALL_CHARACTERS else [character],
+            scene_range=scene_range
+        )
+        query.compile()
+        return query
+
     def perform_search(self):
-        search_text = self.find_text_input.text().lower()
+        # La búsqueda corre en segundo plano; los resultados llegan con on_hits_found
+        try:
+            query = self.build_query()
+        except re.error as e:
+            QMessageBox.warning(self, "Buscar", f"Expresión regular no válida: {e}")
+            return False
         self.current_search_results = []
-        if not search_text:
+        self.current_search_index = -1
+        self.query = query
+        self.search_version = self.table_window.text_index.version
+        self.count_label.setText("Buscando...")
+        self.table_window.start_search(query)
+        return True
+
+    def results_outdated(self):
+        # También si otra búsqueda (p. ej. la del panel) ha sustituido a la del diálogo
+        return (self.search_version != self.table_window.text_index.version
+                or self.table_window.search_query is not self.query)
+
+    def is_own_search(self):
+        return self.query is not None and self.table_window.search_query is self.query
+
+    def on_hits_found(self, hits):
+        if not self.is_own_search():
+            return
+        results = self.current_search_results
+        for row_id, _, _ in hits:
+            if not results or results[-1] != row_id:
+                results.append(row_id)
+        if self.pending_step:
+            self.step(self.pending_step)
+
+    def on_count_changed(self, count):
+        if not self.is_own_search():
             return
-        for row in range(self.table_window.table_widget.rowCount()):
-            found_in_row = False
-            # Buscar en 'PERSONAJE' si está seleccionado
-            if self.search_in_character.isChecked():
-                personaje_item = self.table_window.table_widget.item(row, 4)
-                personaje_text = personaje_item.text().lower() if personaje_item else ''
-                if search_text in personaje_text:
-                    found_in_row = True
-            # Buscar en 'DIÁLOGO' si está seleccionado
-            if self.search_in_dialogue.isChecked():
-                dialog_widget = self.table_window.table_widget.cellWidget(row, 5)
-                dialog_text = dialog_widget.toPlainText().lower() if dialog_widget else ''
-                if search_text in dialog_text:
-                    found_in_row = True
-            if found_in_row:
-                self.current_search_results.append(row)
+        self.count_label.setText(f"{count} coincidencias...")
 
+    def on_search_finished(self, count):
+        if not self.is_own_search():
+            return
+        if count:
+            self.count_label.setText(f"{count} coincidencias en {len(self.current_search_results)} filas")
+        else:
+            self.count_label.setText("No se encontraron coincidencias.")
+        self.pending_step = 0
 
     def find_next(self):
-        search_text = self.find_text_input.text().lower()
-        if not search_text:
-            QMessageBox.information(self, "Buscar", "Por favor, ingrese el texto a buscar.")
-            return
-        if not self.current_search_results:
-            self.perform_search()
-        if not self.current_search_results:
-            QMessageBox.information(self, "Buscar", "No se encontraron coincidencias.")
-            return
-        self.current_search_index = (self.current_search_index + 1) % len(self.current_search_results)
-        self.select_search_result()
+        self.find(1)
 
     def find_previous(self):
-        search_text = self.find_text_input.text().lower()
-        if not search_text:
+        self.find(-1)
+
+    def find(self, step):
+        if not self.find_text_input.text():
             QMessageBox.information(self, "Buscar", "Por favor, ingrese el texto a buscar.")
             return
+        if self.results_outdated():
+            self.pending_step = step
+            if not self.perform_search():
+                self.pending_step = 0
+            return
         if not self.current_search_results:
-            self.perform_search()
-        if not self.current_search_results:
-            QMessageBox.information(self, "Buscar", "No se encontraron coincidencias.")
+            if self.table_window.is_searching():
+                self.pending_step = step
             return
-        self.current_search_index = (self.current_search_index - 1) % len(self.current_search_results)
+        self.step(step)
+
+    def step(self, step):
+        self.pending_step = 0
+        self.current_search_index = (self.current_search_index + step) % len(self.current_search_results)
         self.select_search_result()
 
     def select_search_result(self):
-        row = self.current_search_results[self.current_search_index]
-        self.table_window.table_widget.selectRow(row)
-        self.table_window.table_widget.scrollToItem(self.table_window.table_widget.item(row, 0))
-        # Opcionalmente, puedes resaltar el texto encontrado
+        row = self.table_window.store.position_of(self.current_search_results[self.current_search_index])
+        if row is None:
+            return
+        self.table_window.table_view.selectRow(row)
+        self.table_window.table_view.scrollTo(self.table_window.table_model.index(row, 0))
 
     def reset_search(self):
         self.current_search_results = []
         self.current_search_index = -1
+        self.search_version = None
+        self.pending_step = 0
+        self.count_label.clear()
+        if self.is_own_search():
+            self.table_window.clear_search()
+        self.query = None
 
     def replace_all(self):
         find_text = self.find_text_input.text()
@@ -117,5 +227,26 @@ class FindReplaceDialog(QDialog):
         if not find_text:
             QMessageBox.information(self, "Reemplazar", "Por favor, ingrese el texto a buscar.")
             return
-        self.table_window.find_and_replace(find_text, replace_text, self.search_in_character.isChecked(), self.search_in_dialogue.isChecked())
-
+        try:
+            query = self.build_query()
+        except re.error as e:
+            QMessageBox.warning(self, "Reemplazar", f"Expresión regular no válida: {e}")
+            return
+        # Con una búsqueda completa y al día, solo se revisan las filas encontradas
+        row_ids = None
+        if not self.results_outdated() and not self.table_window.is_searching():
+            row_ids = list(self.current_search_results)
+        try:
+            count = self.table_window.replace_matches(query, replace_text, row_ids)
+        except Exception as e:
+            self.table_window.handle_exception(e, "Error en buscar y reemplazar")
+            return
+        self.reset_search()
+        QMessageBox.information(self, "Buscar y Reemplazar", f"Reemplazo completado en {count} celdas.")
+
+    def on_dialog_finished(self):
+        self.table_window.search_hits_found.disconnect(self.on_hits_found)
+        self.table_window.search_count_changed.disconnect(self.on_count_changed)
+        self.table_window.search_finished.disconnect(self.on_search_finished)
+        if self.is_own_search():
+            self.table_window.clear_search()
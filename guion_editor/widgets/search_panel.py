@@ -0,0 +1,234 @@
+# guion_editor/widgets/search_panel.py
+
+import re
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QCheckBox, QLabel, QListView
+)
+
+from guion_editor.utils.search_engine import SearchQuery, strip_accents
+
+
+class SearchResultsModel(QAbstractListModel):
+    """
+    Filas con coincidencias de la búsqueda actual. Solo guarda el ID de cada
+    fila y dónde empieza la primera coincidencia del diálogo; el texto de cada
+    entrada (fila, personaje y fragmento) se genera al mostrarla.
+    """
+    SNIPPET_BEFORE = 30
+    SNIPPET_LENGTH = 100
+
+    def __init__(self, table_window, parent=None):
+        super().__init__(parent)
+        self.table_window = table_window
+        self.results = []  # (ID, inicio de la coincidencia en el diálogo o None)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        row_id, start = self.results[index.row()]
+        store = self.table_window.store
+        position = store.position_of(row_id)
+        if position is None:
+            return "(fila eliminada)"
+        dialogue = store.get(position, self.table_window.COL_DIALOGUE)
+        if role == Qt.ToolTipRole:
+            return dialogue
+        character = store.get(position, self.table_window.COL_CHARACTER)
+        return f"{position + 1}  {character}: {self.snippet(dialogue, start)}"
+
+    def snippet(self, text, start):
+        begin = max(0, (start or 0) - self.SNIPPET_BEFORE)
+        snippet = text[begin:begin + self.SNIPPET_LENGTH].replace('\n', ' ')
+        if begin > 0:
+            snippet = '…' + snippet
+        if begin + self.SNIPPET_LENGTH < len(text):
+            snippet += '…'
+        return snippet
+
+    def append_hits(self, hits):
+        # Las coincidencias de una misma fila llegan seguidas (personaje y diálogo)
+        new_results = []
+        for row_id, column, spans in hits:
+            start = spans[0][0] if column == self.table_window.COL_DIALOGUE else None
+            if new_results and new_results[-1][0] == row_id:
+                if start is not None:
+                    new_results[-1] = (row_id, start)
+                continue
+            new_results.append((row_id, start))
+        if new_results:
+            first = len(self.results)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_results) - 1)
+            self.results.extend(new_results)
+            self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.results = []
+        self.endResetModel()
+
+    def row_ids(self):
+        return [row_id for row_id, _ in self.results]
+
+
+class SearchPanel(QDockWidget):
+    """
+    Panel de búsqueda no modal que se actualiza mientras se escribe.
+
+    La búsqueda se lanza tras una pausa al teclear. Si el nuevo texto amplía el
+    anterior (y la búsqueda anterior terminó sobre el mismo guion), solo se
+    buscan las filas que ya coincidían, porque cualquier fila que contenga el
+    texto nuevo contiene también el anterior.
+    """
+    DEBOUNCE_MS = 250
+
+    def __init__(self, table_window, parent=None):
+        super().__init__("Buscar en el Guion", parent)
+        self.setObjectName("SearchPanel")
+        self.table_window = table_window
+        self.query = None           # Última búsqueda lanzada desde el panel
+        self.query_version = None   # Versión del índice de texto cuando se lanzó
+        self.query_complete = False
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.run_search)
+
+        self.setup_ui()
+
+        table_window.search_hits_found.connect(self.on_hits_found)
+        table_window.search_finished.connect(self.on_search_finished)
+        table_window.table_model.modelReset.connect(self.on_script_replaced)
+
+    def setup_ui(self):
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Buscar en personajes y diálogos...")
+        self.query_input.setClearButtonEnabled(True)
+        layout.addWidget(self.query_input)
+
+        options_layout = QHBoxLayout()
+        self.case_sensitive = QCheckBox("Mayúsculas")
+        self.whole_word = QCheckBox("Palabra completa")
+        self.use_regex = QCheckBox("Expresión regular")
+        self.ignore_accents = QCheckBox("Ignorar acentos")
+        self.ignore_accents.setChecked(True)
+        for checkbox in (self.case_sensitive, self.whole_word, self.use_regex, self.ignore_accents):
+            options_layout.addWidget(checkbox)
+            checkbox.toggled.connect(self.schedule_search)
+        layout.addLayout(options_layout)
+
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+
+        self.results_model = SearchResultsModel(self.table_window, self)
+        self.results_view = QListView()
+        self.results_view.setModel(self.results_model)
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.clicked.connect(self.go_to_result)
+        self.results_view.activated.connect(self.go_to_result)
+        layout.addWidget(self.results_view)
+
+        self.query_input.textChanged.connect(self.schedule_search)
+        self.query_input.returnPressed.connect(self.go_to_next_result)
+        self.setWidget(container)
+
+    def schedule_search(self):
+        self.debounce_timer.start()
+
+    def build_query(self):
+        query = SearchQuery(
+            self.query_input.text(),
+            regex=self.use_regex.isChecked(),
+            whole_word=self.whole_word.isChecked(),
+            case_sensitive=self.case_sensitive.isChecked(),
+            ignore_accents=self.ignore_accents.isChecked()
+        )
+        query.compile()
+        return query
+
+    def normalized(self, query):
+        text = query.text if query.case_sensitive else query.text.lower()
+        return strip_accents(text) if query.ignore_accents else text
+
+    def can_narrow(self, query):
+        last = self.query
+        if last is None or not self.query_complete or self.query_version != self.table_window.text_index.version:
+            return False
+        # Con regex o palabra completa, ampliar el texto no implica menos filas
+        if query.regex or last.regex or query.whole_word or last.whole_word:
+            return False
+        if (query.case_sensitive, query.ignore_accents) != (last.case_sensitive, last.ignore_accents):
+            return False
+        return self.normalized(last) in self.normalized(query)
+
+    def run_search(self):
+        if not self.query_input.text():
+            if self._is_own_search():
+                self.table_window.clear_search()
+            self.query = None
+            self.results_model.clear()
+            self.count_label.clear()
+            return
+        try:
+            query = self.build_query()
+        except re.error as e:
+            self.count_label.setText(f"Expresión regular no válida: {e}")
+            return
+        row_ids = self.results_model.row_ids() if self.can_narrow(query) else None
+        self.results_model.clear()
+        self.query = query
+        self.query_version = self.table_window.text_index.version
+        self.query_complete = False
+        self.count_label.setText("Buscando...")
+        self.table_window.start_search(query, row_ids)
+
+    def _is_own_search(self):
+        return self.query is not None and self.table_window.search_query is self.query
+
+    def on_hits_found(self, hits):
+        if self._is_own_search():
+            self.results_model.append_hits(hits)
+            self.count_label.setText(f"{self.results_model.rowCount()} filas...")
+
+    def on_search_finished(self, count):
+        if self._is_own_search():
+            self.query_complete = True
+            rows = self.results_model.rowCount()
+            self.count_label.setText(f"{count} coincidencias en {rows} filas" if count else "Sin coincidencias")
+
+    def on_script_replaced(self):
+        self.query = None
+        self.results_model.clear()
+        if self.query_input.text():
+            self.schedule_search()
+
+    def go_to_result(self, index):
+        row = self.table_window.store.position_of(self.results_model.results[index.row()][0])
+        if row is None:
+            return
+        self.table_window.table_view.selectRow(row)
+        self.table_window.table_view.scrollTo(self.table_window.table_model.index(row, 0))
+
+    def go_to_next_result(self):
+        if self.debounce_timer.isActive():
+            self.debounce_timer.stop()
+            self.run_search()
+        if not self.results_model.rowCount():
+            return
+        current = self.results_view.currentIndex().row()
+        index = self.results_model.index((current + 1) % self.results_model.rowCount())
+        self.results_view.setCurrentIndex(index)
+        self.go_to_result(index)
+
+    def closeEvent(self, event):
+        self.debounce_timer.stop()
+        if self._is_own_search():
+            self.table_window.clear_search()
+        super().closeEvent(event)
@@ -2,24 +2,44 @@
 
 import json
 import os
-from PyQt5.QtCore import pyqtSignal, QObject, QEvent, Qt
-from PyQt5.QtGui import QFont, QKeySequence, QColor
+from PyQt5.QtCore import pyqtSignal, QObject, QEvent, Qt, QThreadPool, QTimer
+from PyQt5.QtGui import QFont, QKeySequence
 from PyQt5.QtWidgets import (
-    QWidget, QTableWidgetItem, QTextEdit, QFileDialog, QAbstractItemView,
-    QMessageBox, QVBoxLayout, QHBoxLayout, QPushButton, QShortcut, QCompleter,
-    QUndoStack, QUndoCommand
+    QWidget, QFileDialog, QAbstractItemView,
+    QMessageBox, QVBoxLayout, QHBoxLayout, QPushButton, QShortcut,
+    QUndoStack, QUndoCommand, QInputDialog, QProgressBar, QCompleter
 )
-import pandas as pd
 
-from guion_editor.delegates.custom_delegates import TimeCodeDelegate, CharacterDelegate
-from guion_editor.utils.dialog_utils import leer_guion, ajustar_dialogo
-from guion_editor.widgets.custom_table_widget import CustomTableWidget
+from guion_editor.delegates.custom_delegates import TimeCodeDelegate, CharacterDelegate, DialogueDelegate
+from guion_editor.models.character_index import CharacterIndex
+from guion_editor.models.character_names_model import CharacterNamesModel
+from guion_editor.models.character_stats import CharacterStats
+from guion_editor.models.script_store import ScriptStore
+from guion_editor.models.script_table_model import ScriptTableModel
+from guion_editor.models.text_index import TextIndex
+from guion_editor.models.time_index import TimeIndex
+from guion_editor.utils.dialog_wrap import DEFAULT_WRAP_RULES
+from guion_editor.utils.bulk_wrap import BulkWrapTask, lines_per_second
+from guion_editor.utils.edit_journal import EditJournal, recover, discard_autosave
+from guion_editor.utils.excel_writer import write_script_excel, DEFAULT_COLUMN_STYLES
+from guion_editor.utils.project_file import PROJECT_EXTENSION, open_project, write_project
+from guion_editor.utils.script_loader import ScriptLoadTask
+from guion_editor.utils.search_engine import SearchQuery, SearchTask
+from guion_editor.utils.timecode import (
+    DEFAULT_FRAME_RATE, parse_time_code, frames_to_milliseconds, milliseconds_to_frames,
+    shift_frames, convert_frames_array
+)
+from guion_editor.widgets.custom_table_view import CustomTableView
 from guion_editor.widgets.custom_text_edit import CustomTextEdit
 
 
 class TableWindow(QWidget):
     in_out_signal = pyqtSignal(str, int)
     character_name_changed = pyqtSignal()
+    frame_rate_changed = pyqtSignal(object)
+    search_hits_found = pyqtSignal(object)  # Bloque de (ID, columna, [(inicio, fin), ...])
+    search_count_changed = pyqtSignal(int)
+    search_finished = pyqtSignal(int)
 
     # Definir constantes para los índices de las columnas
     COL_ID = 0
@@ -63,16 +83,41 @@ class TableWindow(QWidget):
         self.video_player_widget = video_player_widget
         self.video_player_widget.in_out_signal.connect(self.update_in_out)
         self.video_player_widget.out_released.connect(self.select_next_row_and_set_in)
+        self.video_player_widget.out_preview.connect(self.on_out_preview)
+        self.video_player_widget.playhead_moved.connect(self.on_playhead_moved)
+        self.live_out = None  # [ID de fila, OUT anterior, OUT en vista previa] mientras se mantiene F6
         self.key_filter = self.KeyPressFilter(self)
         self.installEventFilter(self.key_filter)
         self.setFocusPolicy(Qt.StrongFocus)
         self.setFocus()
-        self.dataframe = pd.DataFrame(columns=self.TABLE_TO_DF_COL_MAP.values())  # Inicializar con columnas
         self.unsaved_changes = False  # Bandera para cambios sin guardar
         self.undo_stack = QUndoStack(self)  # Pila para deshacer/rehacer
         self.has_scene_numbers = False  # Bandera para verificar si hay números de escena en los datos importados
         self.current_script_name = None  # Atributo para almacenar el nombre del guion actual
+        self.frame_rate = DEFAULT_FRAME_RATE  # Frecuencia de fotogramas del proyecto
+        self.wrap_rules = DEFAULT_WRAP_RULES  # Ancho de línea y acotaciones para "Ajustar Diálogos"
+        self.project_path = None  # Proyecto nativo (.dlgp) abierto o guardado, si lo hay
+        self.journal = EditJournal()  # Autoguardado de cada cambio del guion
+        self.text_index = TextIndex()  # Índice de búsqueda sobre personajes y diálogos
+        self.character_stats = CharacterStats()  # Estadísticas por personaje para el reparto
+        self.character_index = CharacterIndex()  # Personaje -> filas, para renombrar y filtrar
+        self.time_index = TimeIndex()  # IN/OUT -> filas activas, para seguir la reproducción
+        self.follow_playback = False  # Resaltar y mostrar la fila que suena en el video
+        self.playback_rows = []  # IDs de las filas activas en la última posición del video
+        self.character_filter = None  # Personaje cuyas filas se muestran solas, o None
+        self.search_task = None
+        self.wrap_task = None  # Ajuste de diálogos en curso
+        self.search_query = None  # Búsqueda cuyos resultados están en search_hits
+        self.search_hits = []  # Resultados de la última búsqueda, en el orden del guion
         self.setup_ui()
+        self.text_index.attach(self.store)
+        self.character_stats.attach(self.store)
+        self.character_index.attach(self.store)
+        self.time_index.attach(self.store)
+        self.table_model.modelReset.connect(self.on_store_replaced)
+        self.table_model.rowsInserted.connect(lambda parent, first, last: self.refresh_character_filter(first, last))
+        self.table_model.rowsMoved.connect(self.on_rows_moved)
+        self.table_model.dataChanged.connect(self.on_data_changed)
 
         # Atajos para deshacer y rehacer
         undo_shortcut = QShortcut(QKeySequence("Ctrl+Z"), self)
@@ -88,8 +133,8 @@ class TableWindow(QWidget):
     def setup_ui(self):
         layout = QVBoxLayout(self)
         self.setup_buttons(layout)
-        self.setup_table_widget(layout)
-        self.load_stylesheet()
+        self.setup_load_progress(layout)
+        self.setup_table_view(layout)
 
     def setup_buttons(self, layout):
         buttons_layout = QHBoxLayout()
@@ -108,42 +153,71 @@ class TableWindow(QWidget):
             buttons_layout.addWidget(button)
         layout.addLayout(buttons_layout)
 
-    def setup_table_widget(self, layout):
-        self.table_widget = CustomTableWidget()
-        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table_widget.setSelectionMode(QAbstractItemView.SingleSelection)  # Permitir selección única
-        self.table_widget.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked)
-        layout.addWidget(self.table_widget)
-
+    def setup_load_progress(self, layout):
+        self.load_task = None
+        self.load_progress_widget = QWidget()
+        progress_layout = QHBoxLayout(self.load_progress_widget)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        self.load_progress_bar = QProgressBar()
+        self.load_progress_bar.setTextVisible(True)
+        cancel_button = QPushButton("Cancelar")
+        cancel_button.clicked.connect(self.cancel_script_load)
+        progress_layout.addWidget(self.load_progress_bar)
+        progress_layout.addWidget(cancel_button)
+        self.load_progress_widget.hide()
+        layout.addWidget(self.load_progress_widget)
+
+    def setup_table_view(self, layout):
         # Definir las columnas: "ID", "SCENE", "IN", "OUT", "PERSONAJE", "DIÁLOGO"
         self.columns = ["ID", "SCENE", "IN", "OUT", "PERSONAJE", "DIÁLOGO"]
-        self.table_widget.setColumnCount(len(self.columns))
-        self.table_widget.setHorizontalHeaderLabels(self.columns)
+        self.table_model = ScriptTableModel(self.columns, self)
+        self.table_model.edit_requested.connect(self.on_cell_edited)
+
+        self.table_view = CustomTableView()
+        self.table_view.setModel(self.table_model)
+        self.table_view.setFont(QFont("Arial", 12))
+        self.table_view.setWordWrap(True)
+        self.table_view.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table_view)
+
         # Ocultar la columna ID
-        self.table_widget.setColumnHidden(self.columns.index("ID"), True)
+        self.table_view.setColumnHidden(self.COL_ID, True)
 
         # Configurar los delegados para las columnas existentes
-        self.table_widget.setItemDelegateForColumn(self.COL_IN, TimeCodeDelegate(self.table_widget))
-        self.table_widget.setItemDelegateForColumn(self.COL_OUT, TimeCodeDelegate(self.table_widget))
-        self.table_widget.setItemDelegateForColumn(self.COL_CHARACTER, CharacterDelegate(get_names_callback=self.get_character_names, parent=self.table_widget))
-        # "DIÁLOGO" debería usar un delegado diferente, como QPlainTextEdit, pero aquí se usa QTextEdit directamente
+        self.table_view.setItemDelegateForColumn(self.COL_IN, TimeCodeDelegate(self.table_view))
+        self.table_view.setItemDelegateForColumn(self.COL_OUT, TimeCodeDelegate(self.table_view))
+        # Completer compartido por todos los editores de personaje
+        self.character_names_model = CharacterNamesModel(self.character_stats, self)
+        self.character_completer = QCompleter(self.character_names_model, self)
+        self.character_completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.table_view.setItemDelegateForColumn(self.COL_CHARACTER, CharacterDelegate(self.character_completer, self.table_view))
+        # El diálogo se pinta como texto; el editor solo existe mientras se edita la celda
+        self.dialogue_delegate = DialogueDelegate(self.table_view)
+        self.table_view.setItemDelegateForColumn(self.COL_DIALOGUE, self.dialogue_delegate)
 
         # Configurar la selección de filas completas
-        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.table_widget.setSelectionMode(QAbstractItemView.SingleSelection)
-
-        self.table_widget.cellCtrlClicked.connect(self.handle_ctrl_click)
-        self.table_widget.cellAltClicked.connect(self.handle_alt_click)
-        self.table_widget.itemChanged.connect(self.on_item_changed)
-
-    def load_stylesheet(self):
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            css_path = os.path.join(current_dir, '..', 'styles', 'table_styles.css')
-            with open(css_path, 'r') as f:
-                self.table_widget.setStyleSheet(f.read())
-        except Exception as e:
-            QMessageBox.warning(self, "Error de Estilos", f"Error al cargar el stylesheet: {str(e)}")
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_view.setSelectionMode(QAbstractItemView.SingleSelection)  # Permitir selección única
+
+        # Las alturas se miden solo para las filas que se ven: al desplazarse,
+        # al cambiar el tamaño de la vista o el ancho de las columnas, y al
+        # insertar o quitar filas. Las mediciones agrupadas en un mismo ciclo
+        # de eventos se hacen una sola vez.
+        self.row_heights_timer = QTimer(self)
+        self.row_heights_timer.setSingleShot(True)
+        self.row_heights_timer.setInterval(0)
+        self.row_heights_timer.timeout.connect(self.adjust_visible_row_heights)
+        self.table_view.verticalScrollBar().valueChanged.connect(self.adjust_visible_row_heights)
+        self.table_view.verticalScrollBar().rangeChanged.connect(self.schedule_visible_row_heights)
+        self.table_view.horizontalHeader().sectionResized.connect(self.schedule_visible_row_heights)
+
+        self.table_view.cellCtrlClicked.connect(self.handle_ctrl_click)
+        self.table_view.cellAltClicked.connect(self.handle_alt_click)
+
+    @property
+    def store(self):
+        return self.table_model.store
 
     def open_file_dialog(self):
         file_name, _ = QFileDialog.getOpenFileName(
@@ -156,182 +230,139 @@ class TableWindow(QWidget):
                 self.main_window.add_to_recent_files(file_name)
 
     def load_data(self, file_name):
-        try:
-            guion_data = leer_guion(file_name)
-            # Verificar si 'SCENE' está presente en los datos importados
-            if 'SCENE' not in guion_data[0]:
-                self.has_scene_numbers = False
-                for entry in guion_data:
-                    entry['SCENE'] = '1'  # Asignar '1' a todas las escenas si no están presentes
-                print("Importación sin números de escena. Asignando '1' a todas las escenas.")
-            else:
-                # Verificar si 'SCENE' tiene múltiples valores
-                scene_values = [entry['SCENE'] for entry in guion_data]
-                unique_scenes = set(scene_values)
-                if len(unique_scenes) > 1 or (len(unique_scenes) == 1 and unique_scenes.pop() != '1'):
-                    self.has_scene_numbers = True
-                    print("Importación con números de escena. Preservando escenas existentes.")
-                else:
-                    self.has_scene_numbers = False
-                    for entry in guion_data:
-                        entry['SCENE'] = '1'  # Asignar '1' a todas las escenas si todos son '1'
-                    print("Importación sin números de escena (todos '1'). Asignando '1' a todas las escenas.")
-            self.dataframe = pd.DataFrame(guion_data)
-            required_columns = [col for col in self.TABLE_TO_DF_COL_MAP.values() if col != 'ID']
-
-            if not all(col in self.dataframe.columns for col in required_columns):
-                raise ValueError("Faltan columnas requeridas en los datos.")
-            # Almacenar el nombre del guion actual
-            self.current_script_name = os.path.basename(file_name)
+        self.start_script_load(file_name, 'docx')
 
-            # Actualizar el título de la ventana principal
-            if self.main_window:
-                self.main_window.setWindowTitle(f"Editor de Guion - {self.current_script_name}")
-
-            # Asignar IDs únicos
-            self.dataframe.insert(0, 'ID', range(len(self.dataframe)))
-            self.populate_table()
-            self.unsaved_changes = False  # Datos cargados, no hay cambios sin guardar
-        except Exception as e:
-            self.handle_exception(e, "Error al cargar los datos")
-
-    def populate_table(self):
+    def populate_table(self, dataframe):
         try:
-            if self.dataframe.empty:
+            if dataframe.empty:
                 QMessageBox.information(self, "Información", "El archivo está vacío.")
                 return
 
-            self.table_widget.blockSignals(True)  # Bloquear señales para evitar disparar itemChanged
-            self.table_widget.clear()
-            self.table_widget.setRowCount(self.dataframe.shape[0])
-            self.table_widget.setColumnCount(len(self.columns))
-            self.table_widget.setHorizontalHeaderLabels(self.columns)
+            self.undo_stack.clear()
+            self.table_model.set_store(ScriptStore.from_dataframe(dataframe, self.frame_rate))
             # Ocultar la columna ID
-            self.table_widget.setColumnHidden(self.columns.index("ID"), True)
-
-            for i in range(self.dataframe.shape[0]):
-                # Asignar los valores de cada columna
-                for col_index, col_name in enumerate(self.columns):
-                    if col_name == "DIÁLOGO":
-                        dialogo_text = str(self.dataframe.at[i, col_name])
-                        dialogo_item = self.create_text_edit(dialogo_text, i, self.COL_DIALOGUE)
-                        self.table_widget.setCellWidget(i, self.COL_DIALOGUE, dialogo_item)
-                    else:
-                        text = str(self.dataframe.at[i, col_name])
-                        item = self.create_table_item(text, col_index)
-                        self.table_widget.setItem(i, col_index, item)
-
-                self.adjust_row_height(i)
-
-            self.table_widget.resizeColumnsToContents()
-            self.table_widget.horizontalHeader().setStretchLastSection(True)
-            self.table_widget.blockSignals(False)  # Desbloquear señales
+            self.table_view.setColumnHidden(self.COL_ID, True)
+
+            self.table_view.resizeColumnsToContents()
+            self.table_view.horizontalHeader().setStretchLastSection(True)
+            self.adjust_all_row_heights()
         except Exception as e:
             self.handle_exception(e, "Error al llenar la tabla")
 
-    def create_text_edit(self, text, row, column):
-        text_edit = CustomTextEdit()
-        text_edit.setStyleSheet("font-size: 16px;")
-        text_edit.setFont(QFont("Arial", 12))
-        text_edit.setPlainText(str(text))
-
-        # Conectar la señal editingFinished al slot correspondiente
-        text_edit.editingFinished.connect(lambda new_text, r=row, c=column: self.on_editing_finished(r, c, new_text))
-
-        return text_edit    
-
-
-    def on_editing_finished(self, row, column, new_text):
+    def adjust_dialogs(self):
+        """
+        Ajusta todos los diálogos en un hilo del QThreadPool (con varios
+        procesos si el guion es grande). El resultado se aplica como un solo
+        cambio que se puede deshacer.
+        """
+        if self.wrap_task is not None:
+            return
         try:
-            df_col = self.get_dataframe_column_name(column)
-            if not df_col:
-                return
-
-            old_text = self.dataframe.at[row, df_col]
-            if new_text != old_text:
-                command = EditCommand(self, row, column, old_text, new_text)
-                self.undo_stack.push(command)
-                self.unsaved_changes = True
+            store = self.store
+            task = BulkWrapTask(store.column(self.COL_DIALOGUE), self.wrap_rules)
+            task.row_ids = store.column(self.COL_ID)
+            task.store = store
+            task.signals.finished.connect(self.on_dialogs_wrapped)
+            task.signals.failed.connect(self.on_dialogs_wrap_failed)
+            self.wrap_task = task
+            QThreadPool.globalInstance().start(task)
         except Exception as e:
-            self.handle_exception(e, "Error al finalizar la edición del texto")
-
-    def create_table_item(self, text, column):
-        item = QTableWidgetItem(text)
-        item.setFont(QFont("Arial", 12))
-        return item
-
-    def generate_text_changed_callback(self, row, column):
-        def callback():
-            self.on_text_changed(row, column)
-        return callback
+            self.wrap_task = None
+            self.handle_exception(e, "Error al ajustar diálogos")
 
-    def adjust_dialogs(self):
+    def on_dialogs_wrapped(self, wrapped, stats):
+        task, self.wrap_task = self.wrap_task, None
+        if task is None or task.store is not self.store:
+            return  # Se ha cargado otro guion mientras tanto
         try:
-            for i in range(self.dataframe.shape[0]):
-                text_widget = self.table_widget.cellWidget(i, self.COL_DIALOGUE)
-                if text_widget:
-                    dialogo_actual = text_widget.toPlainText()
-                    dialogo_ajustado = ajustar_dialogo(dialogo_actual)
-                    text_widget.blockSignals(True)
-                    text_widget.setPlainText(dialogo_ajustado)
-                    text_widget.blockSignals(False)
-                    old_text = self.dataframe.at[i, 'DIÁLOGO']
-                    if dialogo_actual != dialogo_ajustado:
-                        command = EditCommand(self, i, self.COL_DIALOGUE, old_text, dialogo_ajustado)
-                        self.undo_stack.push(command)
-                        self.unsaved_changes = True
-                    self.adjust_row_height(i)
-            QMessageBox.information(self, "Éxito", "Diálogos ajustados correctamente.")
+            store = self.store
+            rows, old_values, new_values = [], [], []
+            changed = [(row_id, old, new) for row_id, old, new in zip(task.row_ids, task.texts, wrapped) if old != new]
+            positions = store.positions_of({row_id for row_id, _, _ in changed})
+            current = {store.get(position, self.COL_ID): position for position in positions}
+            for row_id, old, new in changed:
+                position = current.get(row_id)
+                # Las filas editadas o eliminadas durante el ajuste se dejan como están
+                if position is not None and store.get(position, self.COL_DIALOGUE) == old:
+                    rows.append(position)
+                    old_values.append(old)
+                    new_values.append(new)
+            self.push_bulk_edit("Ajustar diálogos", {self.COL_DIALOGUE: (rows, old_values, new_values)})
+            QMessageBox.information(
+                self, "Éxito",
+                f"Diálogos ajustados correctamente ({lines_per_second(stats):.0f} líneas/s)."
+            )
         except Exception as e:
             self.handle_exception(e, "Error al ajustar diálogos")
 
+    def on_dialogs_wrap_failed(self, message):
+        self.wrap_task = None
+        QMessageBox.critical(self, "Error", f"Error al ajustar diálogos: {message}")
 
     def adjust_all_row_heights(self):
-        for row in range(self.table_widget.rowCount()):
-            self.adjust_row_height(row)
+        # Las filas fuera de pantalla se miden cuando entran en la vista
+        self.schedule_visible_row_heights()
+
+    def schedule_visible_row_heights(self, *args):
+        self.row_heights_timer.start()
+
+    def adjust_visible_row_heights(self):
+        # Solo las filas en pantalla: no obliga a leer ni medir el resto del guion.
+        # Se avanza fila a fila porque al medirlas cambia cuántas caben en la vista.
+        first = self.table_view.rowAt(0)
+        if first == -1:
+            return
+        viewport_height = self.table_view.viewport().height()
+        row_count = self.table_model.rowCount()
+        row = first
+        while row < row_count and self.table_view.rowViewportPosition(row) < viewport_height:
+            if not self.table_view.isRowHidden(row):
+                self.table_view.resizeRowToContents(row)
+            row += 1
 
     def adjust_row_height(self, row):
         try:
-            text_widget = self.table_widget.cellWidget(row, self.COL_DIALOGUE)
-            if text_widget:
-                document = text_widget.document()
-                text_height = document.size().height()
-                margins = text_widget.contentsMargins()
-                total_height = text_height + margins.top() + margins.bottom() + 10
-                self.table_widget.setRowHeight(row, int(total_height))
+            self.table_view.resizeRowToContents(row)
         except Exception as e:
             self.handle_exception(e, f"Error al ajustar la altura de la fila {row}")
 
-    def on_text_changed(self, row, column):
-        try:
-            df_col = self.get_dataframe_column_name(column)
-            if not df_col:
-                return
-
-            text_widget = self.table_widget.cellWidget(row, column)
-            new_text = text_widget.toPlainText()
-            old_text = self.dataframe.at[row, df_col]
-            if new_text != old_text:
-                command = EditCommand(self, row, column, old_text, new_text)
-                self.undo_stack.push(command)
-                self.unsaved_changes = True
-        except Exception as e:
-            self.handle_exception(e, "Error al actualizar texto en la tabla")
+    def current_dialogue_editor(self, row):
+        """Devuelve el editor abierto sobre el diálogo de la fila, si lo hay."""
+        editor = self.table_view.indexWidget(self.table_model.index(row, self.COL_DIALOGUE))
+        return editor if isinstance(editor, CustomTextEdit) else None
+
+    def dialogue_cursor(self, row):
+        """
+        (texto, posición del cursor) del diálogo de la fila, del editor abierto
+        o, si ya se ha cerrado (al pulsar el botón Separar Intervención la
+        tabla pierde el foco y el editor se cierra antes), del último editor
+        cerrado sobre esa fila si el diálogo no ha cambiado desde entonces.
+        """
+        editor = self.current_dialogue_editor(row)
+        if editor is not None:
+            cursor = editor.textCursor()
+            return editor.toPlainText(), cursor.selectionEnd() if cursor.hasSelection() else cursor.position()
+        closed = self.dialogue_delegate.closed_cursor
+        if closed is not None:
+            row_id, text, position = closed
+            if row_id == self.store.get(row, self.COL_ID) and text == self.store.get(row, self.COL_DIALOGUE):
+                return text, position
+        return None
 
-    def on_item_changed(self, item):
+    def on_cell_edited(self, row, column, new_text):
         try:
-            row = item.row()
-            column = item.column()
             df_col = self.get_dataframe_column_name(column)
             if not df_col:
                 return
 
-            new_text = item.text()
-            old_text = self.dataframe.at[row, df_col]
+            old_text = self.store.get(row, column)
 
             # Si la columna es 'SCENE', convierte el valor a entero
             if df_col == 'SCENE':
                 new_text = int(new_text)
+            # IN y OUT se guardan en fotogramas
+            elif column in (self.COL_IN, self.COL_OUT):
+                new_text = parse_time_code(new_text, self.frame_rate)
 
             if new_text != old_text:
                 command = EditCommand(self, row, column, old_text, new_text)
@@ -345,9 +376,9 @@ class TableWindow(QWidget):
 
     def add_new_row(self):
         try:
-            selected_row = self.table_widget.currentRow()
+            selected_row = self.table_view.currentRow()
             if selected_row == -1:
-                selected_row = self.table_widget.rowCount()
+                selected_row = self.table_view.rowCount()
             else:
                 selected_row += 1
 
@@ -360,7 +391,7 @@ class TableWindow(QWidget):
 
     def remove_row(self):
         try:
-            selected_rows = self.table_widget.selectionModel().selectedRows()
+            selected_rows = self.table_view.selectionModel().selectedRows()
             if selected_rows:
                 rows = sorted([index.row() for index in selected_rows], reverse=False)
                 confirm = QMessageBox.question(
@@ -379,65 +410,67 @@ class TableWindow(QWidget):
 
     def move_row_up(self):
         try:
-            selected_row = self.table_widget.currentRow()
+            selected_row = self.table_view.currentRow()
             if selected_row > 0:
                 command = MoveRowCommand(self, selected_row, selected_row - 1)
                 self.undo_stack.push(command)
-                self.table_widget.selectRow(selected_row - 1)
+                self.table_view.selectRow(selected_row - 1)
                 self.unsaved_changes = True
         except Exception as e:
             self.handle_exception(e, "Error al mover la fila hacia arriba")
 
     def move_row_down(self):
         try:
-            selected_row = self.table_widget.currentRow()
-            if selected_row < self.table_widget.rowCount() - 1:
+            selected_row = self.table_view.currentRow()
+            if selected_row < self.table_view.rowCount() - 1:
                 command = MoveRowCommand(self, selected_row, selected_row + 1)
                 self.undo_stack.push(command)
-                self.table_widget.selectRow(selected_row + 1)
+                self.table_view.selectRow(selected_row + 1)
                 self.unsaved_changes = True
         except Exception as e:
             self.handle_exception(e, "Error al mover la fila hacia abajo")
 
+    def seek_to_frame(self, frame):
+        """Lleva el video a frame por la misma vía que Ctrl+clic (in_out_signal)."""
+        self.in_out_signal.emit("IN", frames_to_milliseconds(frame, self.frame_rate))
+
+    def seek_to_selected(self, edge='in'):
+        """Lleva el video al IN (o al OUT) de la fila seleccionada."""
+        row = self.table_view.currentRow()
+        if row == -1:
+            return
+        self.seek_to_frame(self.store.get(row, self.COL_OUT if edge == 'out' else self.COL_IN))
+
+    def retime_row(self, row_id, new_in, new_out, edge='in'):
+        """Cambia el IN y el OUT de una fila en un solo paso de deshacer y lleva el video al borde editado."""
+        try:
+            position = self.store.position_of(row_id)
+            if position is None:
+                return
+            changes = {}
+            for column, value in ((self.COL_IN, new_in), (self.COL_OUT, new_out)):
+                old_value = self.store.get(position, column)
+                if value != old_value:
+                    changes[column] = ([position], [old_value], [value])
+            if self.push_bulk_edit("Mover intervención", changes):
+                self.seek_to_frame(new_out if edge == 'out' else new_in)
+        except Exception as e:
+            self.handle_exception(e, "Error al mover la intervención")
+
     def handle_ctrl_click(self, row):
         try:
-            in_time_code = self.dataframe.at[row, 'IN']
-            milliseconds = self.convert_time_code_to_milliseconds(in_time_code)
+            milliseconds = frames_to_milliseconds(self.store.get(row, self.COL_IN), self.frame_rate)
             self.in_out_signal.emit("IN", milliseconds)
         except Exception as e:
             self.handle_exception(e, "Error al desplazar el video")
 
     def handle_alt_click(self, row):
         try:
-            out_time_code = self.dataframe.at[row, 'OUT']
-            milliseconds = self.convert_time_code_to_milliseconds(out_time_code)
+            milliseconds = frames_to_milliseconds(self.store.get(row, self.COL_OUT), self.frame_rate)
             self.in_out_signal.emit("OUT", milliseconds)
         except Exception as e:
             self.handle_exception(e, "Error al desplazar el video")
 
-    def convert_time_code_to_milliseconds(self, time_code):
-        try:
-            parts = time_code.split(':')
-            if len(parts) != 4:
-                raise ValueError("Formato de time code inválido.")
-            hours, minutes, seconds, frames = map(int, parts)
-            milliseconds = (hours * 3600 + minutes * 60 + seconds) * 1000 + int((frames / 25) * 1000)
-            return milliseconds
-        except Exception as e:
-            self.handle_exception(e, "Error al convertir time code a milisegundos")
-            raise
-
-    def convert_milliseconds_to_time_code(self, ms):
-        try:
-            total_seconds = ms // 1000
-            frames = int((ms % 1000) / (1000 / 25))
-            seconds = total_seconds % 60
-            minutes = (total_seconds // 60) % 60
-            hours = total_seconds // 3600
-            return f"{hours:02}:{minutes:02}:{seconds:02}:{frames:02}"
-        except Exception as e:
-            return "00:00:00:00"
-
     def export_to_excel(self):
         try:
             path, _ = QFileDialog.getSaveFileName(self, "Guardar archivo", "", "Archivos Excel (*.xlsx)")
@@ -453,14 +486,8 @@ class TableWindow(QWidget):
 
     def save_to_excel(self, path):
         try:
-            # Actualizar el DataFrame con los diálogos actuales
-            for row in range(self.table_widget.rowCount()):
-                dialog_widget = self.table_widget.cellWidget(row, self.COL_DIALOGUE)
-                if dialog_widget:
-                    self.dataframe.at[row, 'DIÁLOGO'] = dialog_widget.toPlainText()
-            # No incluir la columna 'ID' en la exportación
-            df_to_export = self.dataframe.drop(columns=['ID'])
-            df_to_export.to_excel(path, index=False)
+            # Las filas se escriben directamente desde el store (sin la columna 'ID')
+            write_script_excel(path, self.store, DEFAULT_COLUMN_STYLES)
 
             # Almacenar el nombre del guion actual
             self.current_script_name = os.path.basename(path)
@@ -490,23 +517,18 @@ class TableWindow(QWidget):
 
     def split_intervention(self):
         try:
-            selected_row = self.table_widget.currentRow()
+            selected_row = self.table_view.currentRow()
             if selected_row == -1:
                 QMessageBox.warning(self, "Separar Intervención", "Por favor, selecciona una fila para separar.")
                 return
 
-            dialog_widget = self.table_widget.cellWidget(selected_row, self.COL_DIALOGUE)
-            if not dialog_widget:
-                QMessageBox.warning(self, "Separar Intervención", "No hay diálogo para separar.")
+            # El punto de corte es el cursor del editor del diálogo
+            split_point = self.dialogue_cursor(selected_row)
+            if split_point is None:
+                QMessageBox.warning(self, "Separar Intervención", "Edita el diálogo y sitúa el cursor donde quieras separar.")
                 return
 
-            cursor = dialog_widget.textCursor()
-            if cursor.hasSelection():
-                position = cursor.selectionEnd()
-            else:
-                position = cursor.position()
-
-            text = dialog_widget.toPlainText()
+            text, position = split_point
             if position >= len(text):
                 QMessageBox.warning(self, "Separar Intervención", "No hay texto para separar después de la posición seleccionada.")
                 return
@@ -514,6 +536,11 @@ class TableWindow(QWidget):
             before = text[:position]
             after = text[position:]
 
+            # Cerrar el editor sin volcar su texto: el comando fija ambos diálogos
+            self.table_view.closePersistentEditor(self.table_model.index(selected_row, self.COL_DIALOGUE))
+            self.dialogue_delegate.closed_cursor = None
+            self.table_view.setFocus()
+
             # Crear comando para separar intervención
             command = SplitInterventionCommand(self, selected_row, before, after)
             self.undo_stack.push(command)
@@ -526,47 +553,106 @@ class TableWindow(QWidget):
             if not action or position_ms is None:
                 return
 
-            selected_row = self.table_widget.currentRow()
+            selected_row = self.table_view.currentRow()
             if selected_row == -1:
                 QMessageBox.warning(self, "Error", "No hay fila seleccionada para actualizar IN/OUT.")
                 return
 
-            time_code = self.convert_milliseconds_to_time_code(position_ms)
+            frames = milliseconds_to_frames(position_ms, self.frame_rate)
             if action.upper() == "IN":
-                old_value = self.dataframe.at[selected_row, 'IN']
-                if time_code != old_value:
-                    command = EditCommand(self, selected_row, self.COL_IN, old_value, time_code)
+                old_value = self.store.get(selected_row, self.COL_IN)
+                if frames != old_value:
+                    command = EditCommand(self, selected_row, self.COL_IN, old_value, frames)
                     self.undo_stack.push(command)
                     self.unsaved_changes = True
             elif action.upper() == "OUT":
-                old_value = self.dataframe.at[selected_row, 'OUT']
-                if time_code != old_value:
-                    command = EditCommand(self, selected_row, self.COL_OUT, old_value, time_code)
+                old_value = self.store.get(selected_row, self.COL_OUT)
+                if frames != old_value:
+                    command = EditCommand(self, selected_row, self.COL_OUT, old_value, frames)
                     self.undo_stack.push(command)
                     self.unsaved_changes = True
         except Exception as e:
             self.handle_exception(e, "Error en update_in_out")
 
-    def select_next_row_and_set_in(self):
+    def on_out_preview(self, position_ms):
+        """
+        Muestra el OUT mientras se mantiene F6 sin tocar el store ni la pila de
+        deshacer; select_next_row_and_set_in lo confirma al soltar la tecla.
+        """
         try:
-            current_row = self.table_widget.currentRow()
-            if current_row == -1:
-                return
+            frames = milliseconds_to_frames(position_ms, self.frame_rate)
+            if self.live_out is None:
+                row = self.table_view.currentRow()
+                if row == -1:
+                    return
+                self.live_out = [self.store.get(row, self.COL_ID), self.store.get(row, self.COL_OUT), frames]
+            else:
+                row = self.store.position_of(self.live_out[0])
+                if row is None:
+                    self.live_out = None
+                    return
+                self.live_out[2] = frames
+            self.table_model.set_preview_value(row, self.COL_OUT, frames)
+        except Exception as e:
+            self.handle_exception(e, "Error al marcar el OUT")
+
+    def set_follow_playback(self, enabled):
+        self.follow_playback = enabled
+        self.playback_rows = []
+        if enabled:
+            self.on_playhead_moved(self.video_player_widget.last_frame or 0)
+        else:
+            self.table_model.set_playback_rows(())
 
-            current_out_time = self.dataframe.at[current_row, 'OUT']
-            current_out_ms = self.convert_time_code_to_milliseconds(current_out_time)
+    def on_playhead_moved(self, frame):
+        """Resalta las filas activas en frame y desplaza la tabla hasta la primera."""
+        if not self.follow_playback:
+            return
+        rows = self.time_index.active_rows(frame)
+        if rows == self.playback_rows:
+            return
+        self.playback_rows = rows
+        self.table_model.set_playback_rows(rows)
+        if rows:
+            position = self.store.position_of(rows[0])
+            if position is not None and not self.table_view.isRowHidden(position):
+                index = self.table_model.index(position, self.COL_SCENE)
+                if not self.table_view.viewport().rect().contains(self.table_view.visualRect(index)):
+                    # Arriba del todo: medir las filas que entran por debajo no la vuelve a sacar
+                    self.table_view.scrollTo(index, QAbstractItemView.PositionAtTop)
+
+    def select_next_row_and_set_in(self):
+        """
+        Al soltar F6: confirma el OUT de la fila y lo copia como IN de la
+        siguiente, en un solo cambio que se deshace de una vez.
+        """
+        try:
+            changes = {}
+            live_out, self.live_out = self.live_out, None
+            if live_out is not None:
+                self.table_model.clear_preview_values()
+                row_id, old_out, current_out = live_out
+                current_row = self.store.position_of(row_id)
+                if current_row is None:
+                    return
+                if current_out != old_out:
+                    changes[self.COL_OUT] = ([current_row], [old_out], [current_out])
+            else:
+                current_row = self.table_view.currentRow()
+                if current_row == -1:
+                    return
+                current_out = self.store.get(current_row, self.COL_OUT)
 
             next_row = current_row + 1
-            if next_row < self.table_widget.rowCount():
-                self.table_widget.selectRow(next_row)
-                time_code = self.convert_milliseconds_to_time_code(current_out_ms)
-                old_in = self.dataframe.at[next_row, 'IN']
-                if time_code != old_in:
-                    command = EditCommand(self, next_row, self.COL_IN, old_in, time_code)
-                    self.undo_stack.push(command)
-                    self.unsaved_changes = True
+            if next_row < self.table_view.rowCount():
+                self.table_view.selectRow(next_row)
+                old_in = self.store.get(next_row, self.COL_IN)
+                if current_out != old_in:
+                    changes[self.COL_IN] = ([next_row], [old_in], [current_out])
+            self.push_bulk_edit("Marcar OUT", changes)
+            if next_row < self.table_view.rowCount():
                 self.adjust_row_height(next_row)
-                self.table_widget.scrollToItem(self.table_widget.item(next_row, self.COL_SCENE), QAbstractItemView.PositionAtCenter)
+                self.table_view.scrollTo(self.table_model.index(next_row, self.COL_SCENE), QAbstractItemView.PositionAtCenter)
         except Exception as e:
             self.handle_exception(e, "Error al seleccionar la siguiente fila")
 
@@ -575,43 +661,7 @@ class TableWindow(QWidget):
             if not path:
                 path, _ = QFileDialog.getOpenFileName(self, "Abrir archivo Excel", "", "Archivos Excel (*.xlsx)")
             if path:
-                df = pd.read_excel(path)
-                # Asignar IDs si no existen
-                if 'ID' not in df.columns:
-                    df.insert(0, 'ID', range(len(df)))
-                required_columns = [col for col in self.TABLE_TO_DF_COL_MAP.values() if col != 'ID']
-                if not all(col in df.columns for col in required_columns):
-                    raise ValueError("Faltan columnas requeridas en los datos.")
-                # Verificar si 'SCENE' está presente
-                if 'SCENE' not in df.columns:
-                    self.has_scene_numbers = False
-                    df['SCENE'] = 1  # Asignar 1 a todas las escenas si no están presentes
-                    print("Importación desde Excel sin números de escena. Asignando 1 a todas las escenas.")
-                else:
-                    # Verificar si 'SCENE' tiene múltiples valores
-                    scene_values = df['SCENE'].astype(str).tolist()
-                    unique_scenes = set(scene_values)
-                    if len(unique_scenes) > 1 or (len(unique_scenes) == 1 and unique_scenes.pop() != '1'):
-                        self.has_scene_numbers = True
-                        print("Importación desde Excel con números de escena. Preservando escenas existentes.")
-                    else:
-                        self.has_scene_numbers = False
-                        df['SCENE'] = 1  # Asignar 1 a todas las escenas si todos son '1'
-                        print("Importación desde Excel sin números de escena (todos '1'). Asignando 1 a todas las escenas.")
-                self.dataframe = df
-                self.populate_table()
-                QMessageBox.information(self, "Éxito", "Datos importados correctamente desde Excel.")
-                self.unsaved_changes = False  # Datos cargados, no hay cambios sin guardar
-
-                # Almacenar el nombre del guion actual
-                self.current_script_name = os.path.basename(path)
-
-                # Actualizar el título de la ventana principal
-                self.update_window_title()
-
-                # Agregar a archivos recientes
-                if self.main_window:
-                    self.main_window.add_to_recent_files(path)
+                self.start_script_load(path, 'excel')
             else:
                 # El usuario canceló la carga
                 QMessageBox.information(self, "Carga cancelada", "La carga del archivo Excel ha sido cancelada.")
@@ -621,30 +671,24 @@ class TableWindow(QWidget):
 
     def merge_interventions(self):
         try:
-            selected_row = self.table_widget.currentRow()
+            selected_row = self.table_view.currentRow()
             if selected_row == -1:
                 QMessageBox.warning(self, "Juntar Intervenciones", "Por favor, selecciona una fila para juntar.")
                 return
 
-            if selected_row >= self.table_widget.rowCount() - 1:
+            if selected_row >= self.table_view.rowCount() - 1:
                 QMessageBox.warning(self, "Juntar Intervenciones", "No hay una segunda fila para juntar.")
                 return
 
-            personaje_current = self.dataframe.at[selected_row, 'PERSONAJE']
-            personaje_next = self.dataframe.at[selected_row + 1, 'PERSONAJE']
+            personaje_current = self.store.get(selected_row, self.COL_CHARACTER)
+            personaje_next = self.store.get(selected_row + 1, self.COL_CHARACTER)
 
             if personaje_current != personaje_next:
                 QMessageBox.warning(self, "Juntar Intervenciones", "Las filas seleccionadas no tienen el mismo personaje.")
                 return
 
-            dialog_current_widget = self.table_widget.cellWidget(selected_row, self.COL_DIALOGUE)
-            dialog_next_widget = self.table_widget.cellWidget(selected_row + 1, self.COL_DIALOGUE)
-            if not dialog_current_widget or not dialog_next_widget:
-                QMessageBox.warning(self, "Juntar Intervenciones", "No hay diálogos para juntar.")
-                return
-
-            dialog_current = dialog_current_widget.toPlainText().strip()
-            dialog_next = dialog_next_widget.toPlainText().strip()
+            dialog_current = self.store.get(selected_row, self.COL_DIALOGUE).strip()
+            dialog_next = self.store.get(selected_row + 1, self.COL_DIALOGUE).strip()
 
             if not dialog_current and not dialog_next:
                 QMessageBox.warning(self, "Juntar Intervenciones", "Ambos diálogos están vacíos.")
@@ -676,13 +720,8 @@ class TableWindow(QWidget):
 
     def save_to_json_file(self, path):
         try:
-            # Actualizar el DataFrame con los diálogos actuales
-            for row in range(self.table_widget.rowCount()):
-                dialog_widget = self.table_widget.cellWidget(row, self.COL_DIALOGUE)
-                if dialog_widget:
-                    self.dataframe.at[row, 'DIÁLOGO'] = dialog_widget.toPlainText()
             # No incluir la columna 'ID' en la exportación
-            data = self.dataframe.drop(columns=['ID']).to_dict(orient='records')
+            data = self.store.to_dataframe().to_dict(orient='records')
             with open(path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=4)
 
@@ -700,87 +739,283 @@ class TableWindow(QWidget):
             raise e
 
 
+    def open_project_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Abrir proyecto", "", f"Proyectos de DialogApp (*{PROJECT_EXTENSION})"
+        )
+        if path:
+            self.load_project(path)
+
+    def load_project(self, path):
+        """
+        Abre un proyecto nativo. El archivo se mapea en memoria y solo se
+        decodifican las filas que se muestran, así que abrir no depende de la
+        longitud del guion.
+        """
+        try:
+            self.cancel_script_load()
+            store, metadata = open_project(path)
+            self.undo_stack.clear()
+            self.table_model.set_store(store, metadata.get('scene_change_ids', []))
+            self.apply_frame_rate(store.frame_rate)
+            self.has_scene_numbers = metadata.get('has_scene_numbers', False)
+            self.table_view.setColumnHidden(self.COL_ID, True)
+            self.adjust_visible_row_heights()
+            self.project_path = path
+            self.current_script_name = os.path.basename(path)
+            self.unsaved_changes = False
+            self.update_window_title()
+            if self.main_window:
+                self.main_window.add_to_recent_files(path)
+        except Exception as e:
+            self.handle_exception(e, "Error al abrir el proyecto")
+
+    def save_project(self):
+        # Guardar sobre el proyecto abierto; si no hay ninguno, preguntar dónde
+        if self.project_path:
+            self.save_project_file(self.project_path)
+        else:
+            self.save_project_as()
+
+    def save_project_as(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Guardar proyecto", "", f"Proyectos de DialogApp (*{PROJECT_EXTENSION})"
+        )
+        if path:
+            if not path.lower().endswith(PROJECT_EXTENSION):
+                path += PROJECT_EXTENSION
+            self.save_project_file(path)
+
+    def save_project_file(self, path):
+        try:
+            write_project(path, self.store, self.table_model.scene_change_ids, self.has_scene_numbers)
+            self.project_path = path
+            self.current_script_name = os.path.basename(path)
+            self.unsaved_changes = False  # Cambios guardados
+            self.update_window_title()
+            if self.main_window:
+                self.main_window.add_to_recent_files(path)
+        except Exception as e:
+            self.handle_exception(e, "Error al guardar el proyecto")
+
     def update_window_title(self):
         prefix = "*" if self.unsaved_changes else ""
         script_name = self.current_script_name if self.current_script_name else "Sin Título"
+        filter_suffix = f" [Solo {self.character_filter}]" if self.character_filter else ""
         if self.main_window:
-            self.main_window.setWindowTitle(f"{prefix}Editor de Guion - {script_name}")
+            self.main_window.setWindowTitle(f"{prefix}Editor de Guion - {script_name}{filter_suffix}")
+        self.journal.note_info(
+            name=self.current_script_name, project_path=self.project_path,
+            has_scene_numbers=self.has_scene_numbers, unsaved=self.unsaved_changes
+        )
+
+    # --- Autoguardado ---
+
+    def on_store_replaced(self):
+        # El guion recién cargado pasa a ser la base del diario de autoguardado
+        self.journal.attach(self.store)
+        self.text_index.attach(self.store)
+        self.character_stats.attach(self.store)
+        self.character_index.attach(self.store)
+        self.time_index.attach(self.store)
+        self.playback_rows = []
+        self.character_filter = None  # El reinicio del modelo ya muestra todas las filas
+        self.cancel_search()
+        self.search_hits = []
+        self.live_out = None  # La vista previa del OUT era de las filas del guion anterior
+
+    def offer_autosave_recovery(self):
+        if self.journal.is_active():
+            # Ya se ha cargado otro guion y el diario anterior se ha sustituido
+            return
+        try:
+            recovered = recover(self.journal.directory)
+        except Exception as e:
+            discard_autosave(self.journal.directory)
+            # Sin nada que recuperar, el guion inicial es la base del diario
+            self.journal.attach(self.store)
+            self.handle_exception(e, "Error al recuperar el autoguardado")
+            return
+        if recovered is None:
+            discard_autosave(self.journal.directory)
+            self.journal.attach(self.store)
+            return
+        store, info = recovered
+        script_name = info.get('name') or "Sin Título"
+        reply = QMessageBox.question(
+            self,
+            "Recuperar guion",
+            f"La sesión anterior no se cerró correctamente. ¿Desea recuperar los cambios sin guardar de \"{script_name}\"?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes
+        )
+        if reply != QMessageBox.Yes:
+            discard_autosave(self.journal.directory)
+            self.journal.attach(self.store)
+            return
+        self.undo_stack.clear()
+        self.table_model.set_store(store)
+        self.apply_frame_rate(store.frame_rate)
+        self.has_scene_numbers = info.get('has_scene_numbers', False)
+        self.current_script_name = info.get('name')
+        self.project_path = info.get('project_path')
+        self.table_view.setColumnHidden(self.COL_ID, True)
+        self.table_view.resizeColumnsToContents()
+        self.adjust_all_row_heights()
+        self.unsaved_changes = True
+        self.update_window_title()
 
 
     def load_from_json(self):
         try:
             path, _ = QFileDialog.getOpenFileName(self, "Abrir archivo JSON", "", "Archivos JSON (*.json)")
             if path:
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                df = pd.DataFrame(data)
-                # Asignar IDs si no existen
-                if 'ID' not in df.columns:
-                    df.insert(0, 'ID', range(len(df)))
-                required_columns = [col for col in self.TABLE_TO_DF_COL_MAP.values() if col != 'ID']
-                if not all(col in df.columns for col in required_columns):
-                    raise ValueError("Faltan columnas requeridas en los datos.")
-                # Verificar si 'SCENE' está presente
-                if 'SCENE' not in df.columns:
-                    self.has_scene_numbers = False
-                    df['SCENE'] = 1  # Asignar 1 a todas las escenas si no están presentes
-                    print("Importación desde JSON sin números de escena. Asignando 1 a todas las escenas.")
-                else:
-                    # Verificar si 'SCENE' tiene múltiples valores
-                    scene_values = df['SCENE'].astype(str).tolist()
-                    unique_scenes = set(scene_values)
-                    if len(unique_scenes) > 1 or (len(unique_scenes) == 1 and unique_scenes.pop() != '1'):
-                        self.has_scene_numbers = True
-                        print("Importación desde JSON con números de escena. Preservando escenas existentes.")
-                    else:
-                        self.has_scene_numbers = False
-                        df['SCENE'] = 1  # Asignar 1 a todas las escenas si todos son '1'
-                        print("Importación desde JSON sin números de escena (todos '1'). Asignando 1 a todas las escenas.")
-                self.dataframe = df
-                self.populate_table()
-                QMessageBox.information(self, "Éxito", "Datos cargados correctamente desde JSON.")
-                self.unsaved_changes = False  # Datos cargados, no hay cambios sin guardar
-
-                # Almacenar el nombre del guion actual
-                self.current_script_name = os.path.basename(path)
-
-                # Actualizar el título de la ventana principal
-                self.update_window_title()
-
+                self.start_script_load(path, 'json')
             else:
                 # El usuario canceló la carga
                 QMessageBox.information(self, "Carga cancelada", "La carga del archivo JSON ha sido cancelada.")
         except Exception as e:
             self.handle_exception(e, "Error al cargar desde JSON")
 
+    # --- Carga en segundo plano ---
+
+    def start_script_load(self, path, kind):
+        """
+        Lee el guion en un hilo del QThreadPool. Las filas llegan por bloques y
+        se añaden al final del modelo, así que las primeras se pueden ver y
+        editar antes de que termine la lectura.
+        """
+        self.cancel_script_load()
+        self._previous_store = self.store
+        self._load_path = path
+        self._load_kind = kind
+        self.undo_stack.clear()
+        self.table_model.set_store(ScriptStore(frame_rate=self.frame_rate))
+
+        task = ScriptLoadTask(path, kind, self.frame_rate, self.wrap_rules)
+        task.signals.columns_found.connect(self.on_load_columns_found)
+        task.signals.chunk_loaded.connect(self.on_load_chunk)
+        task.signals.progress.connect(self.on_load_progress)
+        task.signals.finished.connect(self.on_load_finished)
+        task.signals.failed.connect(self.on_load_failed)
+        task.signals.cancelled.connect(self.on_load_cancelled)
+        self.load_task = task
+
+        self.load_progress_bar.setRange(0, 0)
+        self.load_progress_bar.setFormat(f"Cargando {os.path.basename(path)}... %v filas")
+        self.load_progress_widget.show()
+        QThreadPool.globalInstance().start(task)
+
+    def cancel_script_load(self):
+        if self.load_task is not None:
+            self.load_task.cancel()
+            self.load_progress_bar.setFormat("Cancelando...")
+
+    def _is_current_load(self):
+        # Ignorar señales que aún lleguen de una carga ya sustituida
+        return self.sender() is not None and self.load_task is not None and self.sender() is self.load_task.signals
+
+    def on_load_columns_found(self, extra_columns):
+        if self._is_current_load():
+            self.store.extra_columns = list(extra_columns)
+
+    def on_load_chunk(self, rows):
+        if not self._is_current_load():
+            return
+        first_chunk = len(self.store) == 0
+        lines = []
+        for values, extras in rows:
+            line = self.store.make_line(values)
+            if extras is not None:
+                line.extra = extras
+            lines.append(line)
+        start = self.table_model.rowCount()
+        self.table_model.insert_rows(start, lines)
+        if first_chunk:
+            self.table_view.resizeColumnsToContents()
+            self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.schedule_visible_row_heights()
+
+    def on_load_progress(self, loaded, total):
+        if not self._is_current_load():
+            return
+        if total > 0:
+            self.load_progress_bar.setRange(0, max(total, loaded))
+        self.load_progress_bar.setValue(loaded)
+
+    def on_load_finished(self, info):
+        if not self._is_current_load():
+            return
+        self._finish_script_load()
+        if info['rows'] == 0:
+            self.table_model.set_store(self._previous_store)
+            QMessageBox.information(self, "Información", "El archivo está vacío.")
+            return
+        self.has_scene_numbers = info['has_scene_numbers']
+        self.project_path = None  # Importado: aún no hay proyecto nativo
+        print(f"Importación con {info['rows']} filas. "
+              f"{'Preservando escenas existentes.' if self.has_scene_numbers else 'Asignando 1 a todas las escenas.'}")
+        self.unsaved_changes = False  # Datos cargados, no hay cambios sin guardar
+        # Almacenar el nombre del guion actual y actualizar el título de la ventana principal
+        self.current_script_name = os.path.basename(self._load_path)
+        self.update_window_title()
+        if self._load_kind == 'excel':
+            QMessageBox.information(self, "Éxito", "Datos importados correctamente desde Excel.")
+            # Agregar a archivos recientes
+            if self.main_window:
+                self.main_window.add_to_recent_files(self._load_path)
+        elif self._load_kind == 'json':
+            QMessageBox.information(self, "Éxito", "Datos cargados correctamente desde JSON.")
+
+    def on_load_failed(self, message):
+        if not self._is_current_load():
+            return
+        self._finish_script_load()
+        self.undo_stack.clear()
+        self.table_model.set_store(self._previous_store)
+        QMessageBox.critical(self, "Error", f"Error al cargar los datos: {message}")
+
+    def on_load_cancelled(self):
+        if not self._is_current_load():
+            return
+        self._finish_script_load()
+        # Una carga parcial no debe poder confundirse con el guion completo
+        self.undo_stack.clear()
+        self.table_model.set_store(self._previous_store)
+        QMessageBox.information(self, "Carga cancelada", "La carga del guion ha sido cancelada.")
+
+    def _finish_script_load(self):
+        self.load_task = None
+        self.load_progress_widget.hide()
+
 
     def copy_in_out_to_next(self):
         try:
-            selected_row = self.table_widget.currentRow()
+            selected_row = self.table_view.currentRow()
             if selected_row == -1:
                 QMessageBox.warning(self, "Copiar IN/OUT", "Por favor, selecciona una fila para copiar IN y OUT.")
                 return
 
-            if selected_row >= self.table_widget.rowCount() - 1:
+            if selected_row >= self.table_view.rowCount() - 1:
                 QMessageBox.warning(self, "Copiar IN/OUT", "No hay una fila siguiente para pegar los tiempos.")
                 return
 
             # Obtener los tiempos IN y OUT de la fila seleccionada
-            in_time = self.dataframe.at[selected_row, 'IN']
-            out_time = self.dataframe.at[selected_row, 'OUT']
+            in_time = self.store.get(selected_row, self.COL_IN)
+            out_time = self.store.get(selected_row, self.COL_OUT)
 
             # Crear comandos para copiar IN y OUT
             next_row = selected_row + 1
 
             # Copiar IN
-            old_in = self.dataframe.at[next_row, 'IN']
+            old_in = self.store.get(next_row, self.COL_IN)
             if in_time != old_in:
                 command_in = EditCommand(self, next_row, self.COL_IN, old_in, in_time)
                 self.undo_stack.push(command_in)
                 self.unsaved_changes = True
 
             # Copiar OUT
-            old_out = self.dataframe.at[next_row, 'OUT']
+            old_out = self.store.get(next_row, self.COL_OUT)
             if out_time != old_out:
                 command_out = EditCommand(self, next_row, self.COL_OUT, old_out, out_time)
                 self.undo_stack.push(command_out)
@@ -791,53 +1026,199 @@ class TableWindow(QWidget):
             self.handle_exception(e, "Error al copiar IN/OUT a la siguiente intervención")
 
     def get_character_names(self):
-        return sorted(set(self.dataframe['PERSONAJE'].tolist()))
-
-    def update_character_completer(self):
-        # Actualizar el completer en el delegado
-        self.table_widget.setItemDelegateForColumn(self.COL_CHARACTER, CharacterDelegate(get_names_callback=self.get_character_names, parent=self.table_widget))
+        return self.character_index.names()
 
     def update_character_name(self, old_name, new_name):
-        # Actualizar nombres en el dataframe
-        self.dataframe.loc[self.dataframe['PERSONAJE'] == old_name, 'PERSONAJE'] = new_name
-        # Actualizar la tabla visualmente
-        for row in range(self.table_widget.rowCount()):
-            item = self.table_widget.item(row, self.COL_CHARACTER)
-            if item and item.text() == old_name:
-                item.setText(new_name)
+        # Un solo comando que solo toca las filas del personaje
+        rows = self.character_index.positions(old_name)
+        follow_filter = self.character_filter == old_name
+        self.push_bulk_edit(f"Renombrar '{old_name}' a '{new_name}'", {
+            self.COL_CHARACTER: (rows, [old_name] * len(rows), [new_name] * len(rows))
+        })
+        if follow_filter:
+            self.set_character_filter(new_name)
+
+    # --- Filtro por personaje ---
+
+    def set_character_filter(self, name):
+        """
+        Muestra solo las filas de name (None: todas). Las demás se ocultan en la
+        vista con setRowHidden; el modelo y el guion no cambian.
+        """
+        self.character_filter = name or None
+        visible = set(self.character_index.positions(name)) if name else None
+        for row in range(self.table_model.rowCount()):
+            self.table_view.setRowHidden(row, visible is not None and row not in visible)
+        if name:
+            self.adjust_visible_row_heights()
+        self.update_window_title()
+
+    def clear_character_filter(self):
+        self.set_character_filter(None)
+
+    def filter_by_character(self):
+        names = self.get_character_names()
+        if not names:
+            return
+        current = self.table_view.currentIndex()
+        selected = self.store.get(current.row(), self.COL_CHARACTER) if current.isValid() else self.character_filter
+        default = names.index(selected) if selected in names else 0
+        name, ok = QInputDialog.getItem(
+            self, "Filtrar por Personaje", "Mostrar solo las intervenciones de:", names, default, False
+        )
+        if ok and name:
+            self.set_character_filter(name)
+
+    def refresh_character_filter(self, first, last):
+        # Filas nuevas o cuyo personaje ha cambiado mientras el filtro está activo
+        if self.character_filter is None:
+            return
+        for row in range(first, last + 1):
+            self.table_view.setRowHidden(row, self.store.get(row, self.COL_CHARACTER) != self.character_filter)
+
+    def on_rows_moved(self, parent, start, end, destination, row):
+        if self.character_filter is not None:
+            first = min(start, row)
+            self.refresh_character_filter(first, min(max(end, row), self.table_model.rowCount() - 1))
+
+    def on_data_changed(self, top_left, bottom_right):
+        if self.character_filter is not None and top_left.column() <= self.COL_CHARACTER <= bottom_right.column():
+            self.refresh_character_filter(top_left.row(), bottom_right.row())
+
+    def push_bulk_edit(self, text, changes):
+        """Apila un BulkEditCommand si hay algún cambio. changes: {columna: (filas, antiguos, nuevos)}."""
+        changes = {column: change for column, change in changes.items() if change[0]}
+        if not changes:
+            return False
+        self.undo_stack.push(BulkEditCommand(self, text, changes))
         self.unsaved_changes = True
-        self.update_character_completer()
-        # Emitir señal de cambio de nombre
-        self.character_name_changed.emit()
+        return True
+
+    def on_bulk_edit_applied(self, columns):
+        # Actualizaciones de la interfaz agrupadas al final de cada lote
+        if self.COL_DIALOGUE in columns:
+            self.adjust_visible_row_heights()
+        if self.COL_CHARACTER in columns:
+            self.character_name_changed.emit()
+            if self.character_filter and not self.character_index.row_ids(self.character_filter):
+                # El personaje filtrado ya no tiene filas (p. ej. al deshacer un renombrado)
+                self.clear_character_filter()
 
     def find_and_replace(self, find_text, replace_text, search_in_character=True, search_in_dialogue=True):
         try:
-            for row in range(self.table_widget.rowCount()):
-                # Reemplazar en diálogos si está seleccionado
-                if search_in_dialogue:
-                    dialog_widget = self.table_widget.cellWidget(row, self.COL_DIALOGUE)
-                    if dialog_widget:
-                        text = dialog_widget.toPlainText()
-                        if find_text in text:
-                            new_text = text.replace(find_text, replace_text)
-                            command = EditCommand(self, row, self.COL_DIALOGUE, text, new_text)
-                            self.undo_stack.push(command)
-                            self.unsaved_changes = True
-
-                # Reemplazar en personajes si está seleccionado
-                if search_in_character:
-                    character_item = self.table_widget.item(row, self.COL_CHARACTER)
-                    if character_item:
-                        text = character_item.text()
-                        if find_text in text:
-                            new_text = text.replace(find_text, replace_text)
-                            command = EditCommand(self, row, self.COL_CHARACTER, text, new_text)
-                            self.undo_stack.push(command)
-                            self.unsaved_changes = True
+            columns = []
+            if search_in_character:
+                columns.append(self.COL_CHARACTER)
+            if search_in_dialogue:
+                columns.append(self.COL_DIALOGUE)
+            # Reemplazo literal, distinguiendo mayúsculas y acentos
+            query = SearchQuery(find_text, case_sensitive=True, ignore_accents=False, columns=columns)
+            self.replace_matches(query, replace_text)
             QMessageBox.information(self, "Buscar y Reemplazar", "Reemplazo completado.")
         except Exception as e:
             self.handle_exception(e, "Error en buscar y reemplazar")
 
+    def candidate_positions(self, query):
+        # Sin regex, el índice de texto descarta las filas que no pueden coincidir
+        if query.regex:
+            return range(len(self.store))
+        return self.text_index.search(query.text, query.columns)
+
+    def replace_matches(self, query, replacement, row_ids=None):
+        """
+        Reemplaza las coincidencias de query en un solo paso de deshacer.
+        row_ids limita el reemplazo a esas filas (por ejemplo, las de search_hits).
+        Devuelve el número de celdas modificadas.
+        """
+        store = self.store
+        if row_ids is None:
+            positions = self.candidate_positions(query)
+        else:
+            positions = store.positions_of(set(row_ids))
+        positions = [
+            position for position in positions
+            if query.in_scope(store.get(position, self.COL_SCENE), store.get(position, self.COL_CHARACTER))
+        ]
+        changes = {}
+        for column in query.columns:
+            rows, old_values, new_values = [], [], []
+            for position in positions:
+                text = store.get(position, column)
+                replaced = query.replace(text, replacement)
+                if replaced != text:
+                    rows.append(position)
+                    old_values.append(text)
+                    new_values.append(replaced)
+            changes[column] = (rows, old_values, new_values)
+        self.push_bulk_edit(f"Reemplazar '{query.text}' por '{replacement}'", changes)
+        return sum(len(change[0]) for change in changes.values())
+
+    # --- Búsqueda en segundo plano ---
+
+    def start_search(self, query, row_ids=None):
+        """
+        Busca query en un hilo del QThreadPool. Las coincidencias llegan por
+        bloques (search_hits_found), se acumulan en search_hits y se resaltan
+        en la tabla. row_ids limita la búsqueda a esas filas (para refinar una
+        búsqueda anterior). Lanza re.error si la expresión no es válida.
+        """
+        query.compile()
+        self.clear_search()
+        self.search_query = query
+        store = self.store
+        if row_ids is None:
+            positions = self.candidate_positions(query)
+        else:
+            positions = store.positions_of(set(row_ids))
+        rows = []
+        for position in positions:
+            line = store.row(position)
+            rows.append((line.id, line.scene, store.character_name(line.character_id), line.dialogue))
+        task = SearchTask(query, rows)
+        task.signals.hits_found.connect(self.on_search_hits)
+        task.signals.count_changed.connect(self.on_search_count)
+        task.signals.finished.connect(self.on_search_finished)
+        task.signals.failed.connect(self.on_search_failed)
+        self.search_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def cancel_search(self):
+        if self.search_task is not None:
+            self.search_task.cancel()
+            self.search_task = None
+
+    def clear_search(self):
+        self.cancel_search()
+        self.search_query = None
+        self.search_hits = []
+        self.table_model.clear_match_spans()
+
+    def is_searching(self):
+        return self.search_task is not None
+
+    def _is_current_search(self):
+        return self.search_task is not None and self.sender() is self.search_task.signals
+
+    def on_search_hits(self, hits):
+        if self._is_current_search():
+            self.search_hits.extend(hits)
+            self.table_model.add_match_spans(hits)
+            self.search_hits_found.emit(hits)
+
+    def on_search_count(self, count):
+        if self._is_current_search():
+            self.search_count_changed.emit(count)
+
+    def on_search_finished(self, count):
+        if self._is_current_search():
+            self.search_task = None
+            self.search_finished.emit(count)
+
+    def on_search_failed(self, message):
+        if self._is_current_search():
+            self.search_task = None
+            QMessageBox.warning(self, "Buscar", f"Error en la búsqueda: {message}")
+
 
     def handle_exception(self, exception, message):
         QMessageBox.critical(self, "Error", f"{message}: {str(exception)}")
@@ -851,12 +1232,8 @@ class TableWindow(QWidget):
         try:
             if not self.has_scene_numbers:
                 print("Renumerando escenas: Asignando '1' a todas las escenas.")
-                for row in range(self.table_widget.rowCount()):
-                    self.dataframe.at[row, 'SCENE'] = '1'
-                    # Actualizar la vista de la tabla
-                    item = self.table_widget.item(row, self.COL_SCENE)
-                    if item:
-                        item.setText('1')
+                for row in range(self.table_view.rowCount()):
+                    self.table_model.set_value(row, self.COL_SCENE, 1)
                 self.unsaved_changes = True
             else:
                 print("No se renumeran escenas porque los datos importados tienen números de escena.")
@@ -864,28 +1241,48 @@ class TableWindow(QWidget):
             self.handle_exception(e, "Error al renumerar escenas")
 
     def get_next_id(self):
-        if not self.dataframe.empty and 'ID' in self.dataframe.columns:
-            return int(self.dataframe['ID'].max()) + 1
-        else:
-            return 0
+        return self.store.next_id()
 
     def find_dataframe_index_by_id(self, id_value):
-        df_index = self.dataframe.index[self.dataframe['ID'] == id_value]
-        if not df_index.empty:
-            return df_index[0]
-        else:
-            return None
+        return self.table_model.find_row_by_id(id_value)
 
     def find_table_row_by_id(self, id_value):
-        for row in range(self.table_widget.rowCount()):
-            item = self.table_widget.item(row, self.COL_ID)
-            if item and int(item.text()) == id_value:
-                return row
-        return None
+        # El modelo y la tabla comparten el mismo orden de filas
+        return self.table_model.find_row_by_id(id_value)
     
+    def set_frame_rate(self, frame_rate):
+        """Cambia la frecuencia del proyecto conservando los códigos de tiempo del guion."""
+        if frame_rate is self.frame_rate:
+            return
+        if len(self.store) == 0:
+            self.apply_frame_rate(frame_rate)
+            return
+        command = ChangeFrameRateCommand(self, frame_rate)
+        self.undo_stack.push(command)
+        self.unsaved_changes = True
+
+    def apply_frame_rate(self, frame_rate):
+        self.frame_rate = frame_rate
+        self.store.frame_rate = frame_rate
+        self.frame_rate_changed.emit(frame_rate)
+
+    def shift_time_codes(self):
+        try:
+            offset, ok = QInputDialog.getInt(
+                self, "Desplazar Tiempos",
+                "Fotogramas a desplazar todos los IN/OUT (negativo para adelantar):",
+                0, -10_000_000, 10_000_000
+            )
+            if ok and offset:
+                command = ShiftTimeCodesCommand(self, offset)
+                self.undo_stack.push(command)
+                self.unsaved_changes = True
+        except Exception as e:
+            self.handle_exception(e, "Error al desplazar los tiempos")
+
     # En table_window.py
     def change_scene(self):
-        selected_row = self.table_widget.currentRow()
+        selected_row = self.table_view.currentRow()
         if selected_row == -1:
             QMessageBox.warning(self, "Cambio de Escena", "Por favor, selecciona una intervención para marcar el cambio de escena.")
             return
@@ -919,11 +1316,11 @@ class EditCommand(QUndoCommand):
             # La columna no está en el DataFrame
             return
 
-        # Asignar el valor al DataFrame
+        # Asignar el valor al modelo
         if df_col_name in ['SCENE', 'ID']:
             # Convertir el valor a entero
             try:
-                int_value = int(value)
+                value = int(value)
             except ValueError:
                 QMessageBox.warning(
                     self.table_window,
@@ -931,24 +1328,37 @@ class EditCommand(QUndoCommand):
                     f"El valor '{value}' no es un número entero válido."
                 )
                 return
-            self.table_window.dataframe.at[self.row, df_col_name] = int_value
-        else:
-            self.table_window.dataframe.at[self.row, df_col_name] = value
+        self.table_window.table_model.set_value(self.row, self.column, value)
 
-        # Actualizar la interfaz de usuario
+        # Ajustar la altura de la fila si es necesario
         if self.column == self.table_window.COL_DIALOGUE:
-            # Actualizar el CustomTextEdit en la celda
-            text_widget = self.table_window.table_widget.cellWidget(self.row, self.column)
-            if text_widget:
-                text_widget.blockSignals(True)
-                text_widget.setPlainText(str(value))
-                text_widget.blockSignals(False)
-            # Ajustar la altura de la fila si es necesario
             self.table_window.adjust_row_height(self.row)
-        else:
-            item = self.table_window.table_widget.item(self.row, self.column)
-            if item:
-                item.setText(str(value))
+
+
+class BulkEditCommand(QUndoCommand):
+    """
+    Aplica de una vez un conjunto de cambios por columna ({columna: (filas,
+    antiguos, nuevos)}) y lo deshace de forma atómica. Cada columna se escribe
+    con una sola notificación a la vista y al diario de autoguardado.
+    """
+    def __init__(self, table_window, text, changes):
+        super().__init__()
+        self.table_window = table_window
+        self.changes = changes
+        rows = sum(len(change[0]) for change in changes.values())
+        self.setText(f"{text} ({rows} cambios)")
+
+    def undo(self):
+        self._apply(1)
+
+    def redo(self):
+        self._apply(2)
+
+    def _apply(self, values_index):
+        model = self.table_window.table_model
+        for column, change in self.changes.items():
+            model.set_values(column, change[0], change[values_index])
+        self.table_window.on_bulk_edit_applied(self.changes.keys())
 
 
 class AddRowCommand(QUndoCommand):
@@ -956,86 +1366,44 @@ class AddRowCommand(QUndoCommand):
         super().__init__()
         self.table_window = table_window
         self.row = row
-        self.new_row_data = {
-            'ID': int(self.table_window.get_next_id()),  # Asegurarse de que ID es int
-            'SCENE': int(1),  # Número de SCENE por defecto como entero
-            'IN': '00:00:00:00',
-            'OUT': '00:00:00:00',
-            'PERSONAJE': 'Personaje',
-            'DIÁLOGO': 'Nuevo diálogo'
-        }
+        self.new_row_data = self.table_window.store.make_line([
+            self.table_window.get_next_id(),
+            1,  # Número de SCENE por defecto
+            0,  # IN en fotogramas
+            0,  # OUT en fotogramas
+            'Personaje',
+            'Nuevo diálogo'
+        ])
         self.setText("Agregar fila")
 
     def undo(self):
-        # Remove the row from the table and DataFrame
-        self.table_window.table_widget.removeRow(self.row)
-        df_row = self.table_window.find_dataframe_index_by_id(self.new_row_data['ID'])
+        # Eliminar la fila del modelo
+        df_row = self.table_window.find_dataframe_index_by_id(self.new_row_data.id)
         if df_row is not None:
-            self.table_window.dataframe = self.table_window.dataframe.drop(df_row).reset_index(drop=True)
+            self.table_window.table_model.remove_rows(df_row)
 
     def redo(self):
-        # Insert row into the table
-        self.table_window.table_widget.insertRow(self.row)
-        for col_index, col_name in enumerate(self.table_window.columns):
-            value = self.new_row_data.get(col_name, '')
-            if col_name == "DIÁLOGO":
-                dialogo_item = self.table_window.create_text_edit(value, self.row, self.table_window.COL_DIALOGUE)
-                self.table_window.table_widget.setCellWidget(self.row, self.table_window.COL_DIALOGUE, dialogo_item)
-            else:
-                item = self.table_window.create_table_item(str(value), col_index)
-                self.table_window.table_widget.setItem(self.row, col_index, item)
+        # Insertar la fila en el modelo
+        self.table_window.table_model.insert_rows(self.row, [self.new_row_data])
         self.table_window.adjust_row_height(self.row)
 
-        # Insert data into the DataFrame
-        df_new_row = pd.DataFrame([self.new_row_data])
-        self.table_window.dataframe = pd.concat(
-            [
-                self.table_window.dataframe.iloc[:self.row],
-                df_new_row,
-                self.table_window.dataframe.iloc[self.row:]
-            ],
-            ignore_index=True
-        )
-
 
 class RemoveRowsCommand(QUndoCommand):
     def __init__(self, table_window, rows):
         super().__init__()
         self.table_window = table_window
         self.rows = sorted(rows)
-        self.removed_data = self.table_window.dataframe.iloc[self.rows].copy()
+        self.removed_data = [self.table_window.table_model.row_data(row) for row in self.rows]
         self.setText("Eliminar filas")
 
     def undo(self):
         for i, row in enumerate(self.rows):
-            self.table_window.table_widget.insertRow(row)
-            data_row = self.removed_data.iloc[i]
-
-            # Asignar los valores de la fila
-            for col_index, col_name in enumerate(self.table_window.columns):
-                value = data_row[col_name]
-                if col_name == "DIÁLOGO":
-                    dialogo_text = str(value)
-                    dialogo_item = self.table_window.create_text_edit(dialogo_text, row, self.table_window.COL_DIALOGUE)
-                    self.table_window.table_widget.setCellWidget(row, self.table_window.COL_DIALOGUE, dialogo_item)
-                else:
-                    item = self.table_window.create_table_item(str(value), col_index)
-                    self.table_window.table_widget.setItem(row, col_index, item)
-
+            self.table_window.table_model.insert_rows(row, [self.removed_data[i]])
             self.table_window.adjust_row_height(row)
 
-            # Insertar datos en el DataFrame
-            upper_df = self.table_window.dataframe.iloc[:row] if row > 0 else pd.DataFrame(columns=self.table_window.dataframe.columns)
-            lower_df = self.table_window.dataframe.iloc[row:] if row < self.table_window.dataframe.shape[0] else pd.DataFrame(columns=self.table_window.dataframe.columns)
-            new_df = pd.DataFrame([data_row.to_dict()])
-            self.table_window.dataframe = pd.concat([upper_df, new_df, lower_df], ignore_index=True)
-
     def redo(self):
         for row in reversed(self.rows):
-            self.table_window.table_widget.removeRow(row)
-            df_row = self.table_window.find_dataframe_index_by_id(self.removed_data.at[row, 'ID'])
-            if df_row is not None:
-                self.table_window.dataframe = self.table_window.dataframe.drop(df_row).reset_index(drop=True)
+            self.table_window.table_model.remove_rows(row)
 
 
 class MoveRowCommand(QUndoCommand):
@@ -1053,45 +1421,7 @@ class MoveRowCommand(QUndoCommand):
         self._move_row(self.source_row, self.target_row)
 
     def _move_row(self, from_row, to_row):
-        # Mover datos en el DataFrame
-        df = self.table_window.dataframe
-        row_data = df.iloc[from_row].copy()
-        df = df.drop(from_row).reset_index(drop=True)
-        df = pd.concat([df.iloc[:to_row], pd.DataFrame([row_data]), df.iloc[to_row:]]).reset_index(drop=True)
-        self.table_window.dataframe = df
-
-        # Mover visualmente en la tabla
-        self.table_widget = self.table_window.table_widget
-        self.table_widget.blockSignals(True)
-
-        # Extraer datos antes de eliminar la fila
-        row_data_items = {}
-        for col in range(self.table_widget.columnCount()):
-            if col == self.table_window.COL_DIALOGUE:
-                widget = self.table_widget.cellWidget(from_row, col)
-                if widget:
-                    text = widget.toPlainText()
-                    row_data_items[col] = text
-            else:
-                item = self.table_widget.item(from_row, col)
-                if item:
-                    text = item.text()
-                    row_data_items[col] = text
-
-        self.table_widget.removeRow(from_row)
-        self.table_widget.insertRow(to_row)
-
-        for col in range(self.table_widget.columnCount()):
-            if col == self.table_window.COL_DIALOGUE:
-                text = row_data_items.get(col, '')
-                text_edit = self.table_window.create_text_edit(text, to_row, col)
-                self.table_widget.setCellWidget(to_row, col, text_edit)
-            else:
-                text = row_data_items.get(col, '')
-                item = self.table_window.create_table_item(text, col)
-                self.table_window.table_widget.setItem(to_row, col, item)
-
-        self.table_widget.blockSignals(False)
+        self.table_window.table_model.move_row(from_row, to_row)
         self.table_window.adjust_row_height(to_row)
 
 
@@ -1103,84 +1433,46 @@ class SplitInterventionCommand(QUndoCommand):
         self.after_text = after_text
         self.original_text = before_text + after_text
         # Capturar el ID, PERSONAJE y SCENE de la fila actual
-        self.row_id = int(self.table_window.dataframe.at[row, 'ID'])
-        self.personaje = self.table_window.dataframe.at[row, 'PERSONAJE']
-        self.scene = int(self.table_window.dataframe.at[row, 'SCENE'])
-        self.new_row_id = int(self.table_window.get_next_id())
-        self.new_row_data = {
-            'ID': self.new_row_id,
-            'SCENE': self.scene,
-            'IN': '00:00:00:00',
-            'OUT': '00:00:00:00',
-            'PERSONAJE': self.personaje,
-            'DIÁLOGO': self.after_text
-        }
+        self.row_id = self.table_window.store.get(row, self.table_window.COL_ID)
+        self.personaje = self.table_window.store.get(row, self.table_window.COL_CHARACTER)
+        self.scene = self.table_window.store.get(row, self.table_window.COL_SCENE)
+        self.new_row_id = self.table_window.get_next_id()
+        self.new_row_data = self.table_window.store.make_line([
+            self.new_row_id,
+            self.scene,
+            0,
+            0,
+            self.personaje,
+            self.after_text
+        ])
         self.setText("Separar intervención")
 
     def undo(self):
+        model = self.table_window.table_model
         # Restaurar el diálogo original
         df_row = self.table_window.find_dataframe_index_by_id(self.row_id)
         if df_row is None:
             return
-        self.table_window.dataframe.at[df_row, 'DIÁLOGO'] = self.original_text
-
-        table_row = self.table_window.find_table_row_by_id(self.row_id)
-        if table_row is None:
-            return
-        text_widget = self.table_window.table_widget.cellWidget(table_row, self.table_window.COL_DIALOGUE)
-        if text_widget:
-            text_widget.blockSignals(True)
-            text_widget.setPlainText(self.original_text)
-            text_widget.blockSignals(False)
-            self.table_window.adjust_row_height(table_row)
+        model.set_value(df_row, self.table_window.COL_DIALOGUE, self.original_text)
+        self.table_window.adjust_row_height(df_row)
 
         # Eliminar la nueva fila
         new_df_row = self.table_window.find_dataframe_index_by_id(self.new_row_id)
         if new_df_row is not None:
-            self.table_window.dataframe = self.table_window.dataframe.drop(new_df_row).reset_index(drop=True)
-
-        new_table_row = self.table_window.find_table_row_by_id(self.new_row_id)
-        if new_table_row is not None:
-            self.table_window.table_widget.removeRow(new_table_row)
+            model.remove_rows(new_df_row)
 
     def redo(self):
+        model = self.table_window.table_model
         # Actualizar el diálogo en la fila original
         df_row = self.table_window.find_dataframe_index_by_id(self.row_id)
         if df_row is None:
             return
-        self.table_window.dataframe.at[df_row, 'DIÁLOGO'] = self.before_text
+        model.set_value(df_row, self.table_window.COL_DIALOGUE, self.before_text)
+        self.table_window.adjust_row_height(df_row)
 
-        table_row = self.table_window.find_table_row_by_id(self.row_id)
-        if table_row is None:
-            return
-        text_widget = self.table_window.table_widget.cellWidget(table_row, self.table_window.COL_DIALOGUE)
-        if text_widget:
-            text_widget.blockSignals(True)
-            text_widget.setPlainText(self.before_text)
-            text_widget.blockSignals(False)
-            self.table_window.adjust_row_height(table_row)
-
-        # Insertar nueva fila en el DataFrame
-        df_new_row = df_row + 1
-        self.table_window.dataframe = pd.concat([
-            self.table_window.dataframe.iloc[:df_new_row],
-            pd.DataFrame([self.new_row_data]),
-            self.table_window.dataframe.iloc[df_new_row:]
-        ]).reset_index(drop=True)
-
-        # Insertar nueva fila en la tabla
-        table_new_row = table_row + 1
-        self.table_window.table_widget.insertRow(table_new_row)
-        for col_index, col_name in enumerate(self.table_window.columns):
-            if col_name == "DIÁLOGO":
-                dialogo_text = self.new_row_data['DIÁLOGO']
-                dialogo_item = self.table_window.create_text_edit(dialogo_text, table_new_row, self.table_window.COL_DIALOGUE)
-                self.table_window.table_widget.setCellWidget(table_new_row, self.table_window.COL_DIALOGUE, dialogo_item)
-            else:
-                value = self.new_row_data.get(col_name, '')
-                item = self.table_window.create_table_item(str(value), col_index)
-                self.table_window.table_widget.setItem(table_new_row, col_index, item)
-        self.table_window.adjust_row_height(table_new_row)
+        # Insertar nueva fila a continuación
+        model.insert_rows(df_row + 1, [self.new_row_data])
+        self.table_window.adjust_row_height(df_row + 1)
 
 
 class MergeInterventionsCommand(QUndoCommand):
@@ -1189,85 +1481,100 @@ class MergeInterventionsCommand(QUndoCommand):
         self.table_window = table_window
         self.row = row
         self.merged_dialog = merged_dialog
-        self.next_row_data = self.table_window.dataframe.iloc[row + 1].copy()
-        self.original_dialog = self.table_window.dataframe.at[row, 'DIÁLOGO']
+        self.next_row_data = self.table_window.table_model.row_data(row + 1)
+        self.original_dialog = self.table_window.store.get(row, self.table_window.COL_DIALOGUE)
         self.setText("Juntar intervenciones")
 
     def undo(self):
+        model = self.table_window.table_model
         # Restaurar diálogo original
-        command = EditCommand(self.table_window, self.row, self.table_window.COL_DIALOGUE, self.merged_dialog, self.original_dialog)
-        self.table_window.undo_stack.push(command)
+        model.set_value(self.row, self.table_window.COL_DIALOGUE, self.original_dialog)
+        self.table_window.adjust_row_height(self.row)
 
         # Restaurar fila eliminada
-        self.table_window.table_widget.insertRow(self.row + 1)
-        for col_index, col_name in enumerate(self.table_window.columns):
-            if col_name == "DIÁLOGO":
-                dialogo_text = self.next_row_data[col_name]
-                dialogo_item = self.table_window.create_text_edit(dialogo_text, self.row + 1, self.table_window.COL_DIALOGUE)
-                self.table_window.table_widget.setCellWidget(self.row + 1, self.table_window.COL_DIALOGUE, dialogo_item)
-            else:
-                value = self.next_row_data[col_name]
-                item = self.table_window.create_table_item(str(value), col_index)
-                self.table_window.table_widget.setItem(self.row + 1, col_index, item)
-
+        model.insert_rows(self.row + 1, [self.next_row_data])
         self.table_window.adjust_row_height(self.row + 1)
 
-        # Insertar datos en el DataFrame
-        upper_df = self.table_window.dataframe.iloc[:self.row + 1]
-        lower_df = self.table_window.dataframe.iloc[self.row + 1:]
-        new_df = pd.DataFrame([self.next_row_data.to_dict()])
-        self.table_window.dataframe = pd.concat([upper_df, new_df, lower_df], ignore_index=True)
-
     def redo(self):
+        model = self.table_window.table_model
         # Actualizar diálogo
-        command = EditCommand(self.table_window, self.row, self.table_window.COL_DIALOGUE, self.original_dialog, self.merged_dialog)
-        self.table_window.undo_stack.push(command)
+        model.set_value(self.row, self.table_window.COL_DIALOGUE, self.merged_dialog)
+        self.table_window.adjust_row_height(self.row)
 
         # Eliminar siguiente fila
-        self.table_window.table_widget.removeRow(self.row + 1)
-        self.table_window.dataframe = self.table_window.dataframe.drop(self.row + 1).reset_index(drop=True)
+        model.remove_rows(self.row + 1)
 
 class ChangeSceneCommand(QUndoCommand):
     def __init__(self, table_window, selected_row):
         super().__init__()
         self.table_window = table_window
         self.selected_row = selected_row
+        self.row_id = self.table_window.store.get(selected_row, self.table_window.COL_ID)
         self.setText("Cambiar número de escena")
 
         # Almacenar los números de escena antiguos desde la fila seleccionada en adelante
-        self.old_scene_numbers = self.table_window.dataframe['SCENE'].iloc[selected_row:].tolist()
+        self.old_scene_numbers = self.table_window.store.column(self.table_window.COL_SCENE)[selected_row:]
         
         # Calcular los nuevos números de escena incrementando cada uno en +1
-        self.new_scene_numbers = [scene + 1 for scene in self.old_scene_numbers]
+        self.new_scene_numbers = [int(scene) + 1 for scene in self.old_scene_numbers]
 
     def undo(self):
         # Restaurar los números de escena antiguos
-        for idx, scene_number in enumerate(self.old_scene_numbers):
-            row = self.selected_row + idx
-            self.table_window.dataframe.at[row, 'SCENE'] = scene_number
-            item = self.table_window.table_widget.item(row, self.table_window.COL_SCENE)
-            if item:
-                item.setText(str(scene_number))
-                # Restaurar el color de fondo si es la fila seleccionada
-                if idx == 0:
-                    for col in range(self.table_window.table_widget.columnCount()):
-                        cell_item = self.table_window.table_widget.item(row, col)
-                        if cell_item:
-                            cell_item.setBackground(Qt.white)
+        self._apply_scene_numbers(self.old_scene_numbers)
+        # Quitar el resaltado de la fila seleccionada
+        self.table_window.table_model.set_scene_change(self.row_id, False)
 
     def redo(self):
         # Asignar el nuevo número de escena a todas las filas subsiguientes
-        total_rows = self.table_window.table_widget.rowCount()
-        for idx, row in enumerate(range(self.selected_row, total_rows)):
-            new_number = self.new_scene_numbers[idx]
-            self.table_window.dataframe.at[row, 'SCENE'] = new_number
-            item = self.table_window.table_widget.item(row, self.table_window.COL_SCENE)
-            if item:
-                item.setText(str(new_number))
-                # Resaltar la fila seleccionada
-                if row == self.selected_row:
-                    for col in range(self.table_window.table_widget.columnCount()):
-                        cell_item = self.table_window.table_widget.item(row, col)
-                        if cell_item:
-                            cell_item.setBackground(QColor("#FFD700"))  # Amarillo dorado
+        self._apply_scene_numbers(self.new_scene_numbers)
+        # Resaltar la fila seleccionada
+        self.table_window.table_model.set_scene_change(self.row_id, True)
+
+    def _apply_scene_numbers(self, scene_numbers):
+        rows = range(self.selected_row, self.selected_row + len(scene_numbers))
+        self.table_window.table_model.set_values(self.table_window.COL_SCENE, rows, scene_numbers)
+
+
+class ShiftTimeCodesCommand(QUndoCommand):
+    """Desplaza todos los IN/OUT en una sola pasada sobre las columnas de tiempo."""
+    def __init__(self, table_window, offset):
+        super().__init__()
+        self.table_window = table_window
+        self.old_in, self.old_out = self.table_window.store.time_columns()
+        self.new_in = shift_frames(self.old_in, offset)
+        self.new_out = shift_frames(self.old_out, offset)
+        self.setText(f"Desplazar tiempos {offset:+d} fotogramas")
+
+    def undo(self):
+        self._apply(self.old_in, self.old_out)
+
+    def redo(self):
+        self._apply(self.new_in, self.new_out)
+
+    def _apply(self, in_frames, out_frames):
+        self.table_window.store.set_time_columns(in_frames, out_frames)
+        self.table_window.table_model.notify_columns_changed(self.table_window.COL_IN, self.table_window.COL_OUT)
+
+
+class ChangeFrameRateCommand(QUndoCommand):
+    """Cambia la frecuencia del proyecto reinterpretando los fotogramas para conservar los códigos de tiempo."""
+    def __init__(self, table_window, frame_rate):
+        super().__init__()
+        self.table_window = table_window
+        self.old_rate = self.table_window.store.frame_rate
+        self.new_rate = frame_rate
+        self.old_in, self.old_out = self.table_window.store.time_columns()
+        self.new_in = convert_frames_array(self.old_in, self.old_rate, self.new_rate)
+        self.new_out = convert_frames_array(self.old_out, self.old_rate, self.new_rate)
+        self.setText(f"Cambiar frecuencia a {frame_rate.label} fps")
+
+    def undo(self):
+        self._apply(self.old_rate, self.old_in, self.old_out)
+
+    def redo(self):
+        self._apply(self.new_rate, self.new_in, self.new_out)
 
+    def _apply(self, frame_rate, in_frames, out_frames):
+        self.table_window.store.set_time_columns(in_frames, out_frames)
+        self.table_window.apply_frame_rate(frame_rate)
+        self.table_window.table_model.notify_columns_changed(self.table_window.COL_IN, self.table_window.COL_OUT)
@@ -3,14 +3,16 @@
 from PyQt5.QtWidgets import QLineEdit, QMessageBox
 from PyQt5.QtCore import Qt, QMimeData
 from PyQt5.QtGui import QFont, QKeyEvent
+from guion_editor.utils.timecode import DEFAULT_FRAME_RATE
 
 class TimeCodeEdit(QLineEdit):
-    def __init__(self, parent=None, initial_time_code="00:00:00:00"):
+    def __init__(self, parent=None, initial_time_code="00:00:00:00", frame_rate=DEFAULT_FRAME_RATE):
         super().__init__(parent)
+        self.frame_rate = frame_rate
         self.setFixedWidth(120)
         self.setAlignment(Qt.AlignCenter)
         self.setFont(QFont("Arial", 12))
-        self.setStyleSheet("font-size: 16px;")
+        self.setObjectName("time_code_edit")  # Tamaño de letra en table_styles.css
         self.setMaxLength(11)
         self.setReadOnly(False)  # Permitir edición
         self.setText(initial_time_code)
@@ -60,7 +62,8 @@ class TimeCodeEdit(QLineEdit):
 
     def update_display(self):
         """
-        Actualiza la visualización del código de tiempo en el formato HH:MM:SS:FF.
+        Actualiza la visualización del código de tiempo en el formato HH:MM:SS:FF
+        (HH:MM:SS;FF en drop-frame).
         Aplica validaciones de rangos para cada segmento.
         """
         hours = self.digits[0] * 10 + self.digits[1]
@@ -68,7 +71,9 @@ class TimeCodeEdit(QLineEdit):
         seconds = self.digits[4] * 10 + self.digits[5]
         frames = self.digits[6] * 10 + self.digits[7]
 
-        formatted = "{:02}:{:02}:{:02}:{:02}".format(hours, minutes, seconds, frames)
+        formatted = "{:02}:{:02}:{:02}{}{:02}".format(
+            hours, minutes, seconds, self.frame_rate.separator, frames
+        )
         self.blockSignals(True)  # Evitar emitir señales mientras se actualiza el texto
         self.setText(formatted)
         self.blockSignals(False)
@@ -78,7 +83,7 @@ class TimeCodeEdit(QLineEdit):
         Establece un nuevo código de tiempo, asegurándose de que tenga el formato correcto.
         """
         try:
-            parts = time_code.split(':')
+            parts = time_code.replace(';', ':').split(':')
             if len(parts) != 4:
                 raise ValueError
             self.digits = [
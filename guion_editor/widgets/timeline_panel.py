@@ -0,0 +1,434 @@
+# guion_editor/widgets/timeline_panel.py
+
+from bisect import bisect_left, bisect_right
+from math import floor, log2
+
+import numpy as np
+
+from PyQt5.QtCore import Qt, QLineF, QRect, QRectF, QThreadPool
+from PyQt5.QtGui import QPainter, QColor, QPen
+from PyQt5.QtWidgets import QDockWidget, QMessageBox, QWidget
+
+from guion_editor.utils.timecode import format_time_code
+from guion_editor.utils.waveform import WaveformTask, find_audio_source, load_cached_peaks
+
+
+def character_color(character_id):
+    # Tonos repartidos con el ángulo áureo: personajes consecutivos no se parecen
+    return QColor.fromHsv(int(character_id * 137.508) % 360, 120, 225)
+
+
+class TimelineWidget(QWidget):
+    """
+    Línea de tiempo del guion: un carril por personaje (los que más hablan
+    arriba) con un bloque por intervención de IN a OUT.
+
+    Para cada carril se guardan las intervenciones ordenadas por IN; con la
+    duración máxima del carril, una búsqueda binaria da las que se ven (al
+    pintar) o las que están bajo el ratón (al hacer clic). Con poco zoom, cuando
+    un fotograma ocupa menos de un píxel, se pintan tramos ya agrupados para
+    ese nivel de zoom en lugar de cada bloque. Los datos se recalculan solo
+    cuando cambia el guion.
+
+    Si el video tiene audio WAV, su forma de onda se pinta bajo la regla con
+    el mismo eje de tiempo.
+
+    Clic: lleva el video a ese punto. Arrastrar un bloque lo mueve; arrastrar
+    uno de sus bordes cambia el IN o el OUT. El cambio se apila al soltar.
+    Rueda: desplaza; Ctrl+rueda: zoom; Mayús+rueda: cambia de carriles.
+    """
+    RULER_HEIGHT = 18
+    WAVE_HEIGHT = 48
+    MIN_LANE_HEIGHT = 8
+    MAX_LANE_HEIGHT = 22
+    EDGE = 4  # Píxeles alrededor de un borde que lo agarran
+    MIN_FRAMES_PER_PIXEL = 1 / 16
+    LABEL_MIN_WIDTH = 40
+    BACKGROUND = QColor("#F5F5DC")
+    PLAYHEAD_COLOR = QColor("#D32F2F")
+    WAVE_COLOR = QColor("#607D8B")
+    SELECTED_PEN = QPen(QColor("#000000"), 2)
+
+    def __init__(self, table_window, parent=None):
+        super().__init__(parent)
+        self.table_window = table_window
+        self.store = None
+        self.frames_per_pixel = 4.0
+        self.first_frame = 0.0
+        self.first_lane = 0
+        self.playhead = 0
+        self.waveform = None  # PeakPyramid del audio del video, si hay
+        self.drag = None  # Arrastre en curso: fila, borde, valores originales y nuevos
+        self._dirty = True
+        self._lanes = []         # IDs de personaje, un carril por personaje
+        self._lane_of = {}       # ID de personaje -> carril
+        self._colors = []
+        self._spans = []         # Por carril: [(IN, OUT, ID)] ordenada por IN
+        self._arrays = []        # Por carril: (IN, OUT) como arrays, en el mismo orden
+        self._starts = []        # Por carril: [IN] (para bisect)
+        self._max_span = []      # Por carril: duración máxima
+        self._lod = {}           # Nivel -> por carril ([inicios], [(inicio, fin)])
+        self.setMinimumHeight(80)
+        self.setMouseTracking(True)
+        table_window.table_model.modelReset.connect(self.attach)
+        table_window.table_view.selectionModel().currentRowChanged.connect(lambda *args: self.update())
+        self.attach()
+
+    # --- Datos ---
+
+    def attach(self):
+        if self.store is not None:
+            self.store.remove_listener(self._on_store_changed)
+        self.store = self.table_window.store
+        self.store.add_listener(self._on_store_changed)
+        self.drag = None
+        self.invalidate()
+
+    def _on_store_changed(self, operation, args):
+        if operation == 'frame_rate':
+            self.update()  # Solo cambian las etiquetas de la regla
+            return
+        if operation in ('move', 'extra_columns'):
+            return
+        if operation in ('set', 'set_many'):
+            column = args[0] if operation == 'set_many' else args[1]
+            if column not in (self.store.COL_ID, self.store.COL_IN, self.store.COL_OUT, self.store.COL_CHARACTER):
+                return
+        self.invalidate()
+
+    def invalidate(self):
+        self._dirty = True
+        self._lod = {}
+        self.update()
+
+    def ensure_built(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        ids, ins, outs, characters = self.store.timing_arrays()
+        keep = outs > ins
+        ids, ins, outs, characters = ids[keep], ins[keep], outs[keep], characters[keep]
+        # Por personaje y, dentro de cada uno, por (IN, OUT, ID)
+        order = np.lexsort((ids, outs, ins, characters))
+        ids, ins, outs, characters = ids[order], ins[order], outs[order], characters[order]
+        lane_ids, firsts, counts = np.unique(characters, return_index=True, return_counts=True)
+        lanes = sorted(range(len(lane_ids)), key=lambda lane: (-counts[lane], lane_ids[lane]))
+        self._lanes = [int(lane_ids[lane]) for lane in lanes]
+        self._lane_of = {character_id: lane for lane, character_id in enumerate(self._lanes)}
+        self._colors = [character_color(character_id) for character_id in self._lanes]
+        self._arrays = [(ins[firsts[lane]:firsts[lane] + counts[lane]], outs[firsts[lane]:firsts[lane] + counts[lane]]) for lane in lanes]
+        self._starts = [lane_ins.tolist() for lane_ins, _ in self._arrays]
+        self._spans = [
+            list(zip(starts, lane_outs.tolist(), ids[firsts[lane]:firsts[lane] + counts[lane]].tolist()))
+            for starts, (_, lane_outs), lane in zip(self._starts, self._arrays, lanes)
+        ]
+        self._max_span = [int((lane_outs - lane_ins).max()) for lane_ins, lane_outs in self._arrays]
+        self.first_lane = min(self.first_lane, max(0, len(self._lanes) - 1))
+
+    def lod_runs(self, level):
+        """Tramos por carril uniendo los bloques separados por menos de 2**level fotogramas."""
+        if level not in self._lod:
+            gap = 2 ** level
+            lanes = []
+            for lane_ins, lane_outs in self._arrays:
+                # Empieza un tramo nuevo cuando el bloque queda a más de gap del final más lejano anterior
+                reach = np.maximum.accumulate(lane_outs)
+                new_run = np.empty(len(lane_ins), dtype=bool)
+                new_run[0] = True
+                new_run[1:] = lane_ins[1:] > reach[:-1] + gap
+                first = np.flatnonzero(new_run)
+                run_starts = lane_ins[first].tolist()
+                lanes.append((run_starts, list(zip(run_starts, np.maximum.reduceat(lane_outs, first).tolist()))))
+            self._lod[level] = lanes
+        return self._lod[level]
+
+    def visible_spans(self, lane, first, last):
+        """Intervenciones del carril que se solapan con [first, last], por IN."""
+        starts = self._starts[lane]
+        low = bisect_left(starts, first - self._max_span[lane])
+        high = bisect_right(starts, last)
+        return [span for span in self._spans[lane][low:high] if span[1] >= first]
+
+    # --- Geometría ---
+
+    def lane_height(self):
+        lanes = max(1, len(self._lanes))
+        height = (self.height() - self.lanes_top()) // lanes
+        return max(self.MIN_LANE_HEIGHT, min(self.MAX_LANE_HEIGHT, height))
+
+    def lanes_top(self):
+        return self.RULER_HEIGHT + (self.WAVE_HEIGHT if self.waveform is not None else 0)
+
+    def frame_at(self, x):
+        return self.first_frame + x * self.frames_per_pixel
+
+    def x_of(self, frame):
+        return (frame - self.first_frame) / self.frames_per_pixel
+
+    def lane_at(self, y):
+        if y < self.lanes_top():
+            return None
+        lane = self.first_lane + int((y - self.lanes_top()) // self.lane_height())
+        return lane if lane < len(self._lanes) else None
+
+    def hit_test(self, pos):
+        """(ID, 'in' | 'out' | 'move') del bloque bajo pos, o None."""
+        self.ensure_built()
+        lane = self.lane_at(pos.y())
+        if lane is None:
+            return None
+        frame = self.frame_at(pos.x())
+        margin = self.EDGE * self.frames_per_pixel
+        hit = None
+        for time_in, time_out, row_id in self.visible_spans(lane, frame - margin, frame + margin):
+            if abs(frame - time_out) <= margin:
+                hit = (row_id, 'out')
+            elif abs(frame - time_in) <= margin:
+                hit = (row_id, 'in')
+            elif time_in <= frame <= time_out:
+                hit = (row_id, 'move')
+        return hit
+
+    # --- Pintado ---
+
+    def paintEvent(self, event):
+        self.ensure_built()
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.fillRect(rect, self.BACKGROUND)
+        first = self.frame_at(rect.left())
+        last = self.frame_at(rect.right() + 1)
+        self.paint_ruler(painter, first, last)
+        if self.waveform is not None:
+            self.paint_waveform(painter, rect)
+
+        top = self.lanes_top()
+        lane_height = self.lane_height()
+        selected_id = self.selected_row_id()
+        selected_lane = self._lane_of.get(self.selected_character())
+        fpp = self.frames_per_pixel
+        lod = self.lod_runs(int(floor(log2(fpp)))) if fpp >= 1 else None
+        for lane in range(self.first_lane, len(self._lanes)):
+            y = top + (lane - self.first_lane) * lane_height
+            if y > rect.bottom():
+                break
+            if y + lane_height < rect.top():
+                continue
+            color = self._colors[lane]
+            if lod is not None:
+                starts, runs = lod[lane]
+                # El tramo anterior al primer inicio visible puede seguir abierto
+                low = max(0, bisect_right(starts, first) - 1)
+                high = bisect_right(starts, last)
+                for run_start, run_end in runs[low:high]:
+                    x0 = self.x_of(run_start)
+                    painter.fillRect(QRectF(x0, y + 1, max(1.0, self.x_of(run_end) - x0), lane_height - 2), color)
+            else:
+                for time_in, time_out, _ in self.visible_spans(lane, first, last):
+                    self.paint_block(painter, time_in, time_out, y, lane_height, color, lane)
+            if selected_id is not None and selected_lane == lane:
+                self.paint_selected(painter, selected_id, y, lane_height)
+
+        if self.drag is not None and (self.drag['new_in'], self.drag['new_out']) != (self.drag['in'], self.drag['out']):
+            lane = self._lane_of.get(self.drag['character_id'])
+            if lane is not None and lane >= self.first_lane:
+                y = top + (lane - self.first_lane) * lane_height
+                x0 = self.x_of(self.drag['new_in'])
+                painter.setPen(QPen(Qt.black, 1, Qt.DashLine))
+                painter.drawRect(QRectF(x0, y + 1, self.x_of(self.drag['new_out']) - x0, lane_height - 2))
+
+        x = self.x_of(self.playhead)
+        painter.setPen(QPen(self.PLAYHEAD_COLOR, 1))
+        painter.drawLine(int(x), 0, int(x), self.height())
+
+    def paint_ruler(self, painter, first, last):
+        painter.setPen(Qt.darkGray)
+        painter.drawLine(0, self.RULER_HEIGHT - 1, self.width(), self.RULER_HEIGHT - 1)
+        rate = self.store.frame_rate
+        fps = max(1, round(rate.fps))
+        # Marca cada 1, 2, 5, 10, 30, 60... segundos, con al menos 90 píxeles entre marcas
+        step = fps
+        for seconds in (1, 2, 5, 10, 30, 60, 120, 300, 600, 1800, 3600):
+            step = seconds * fps
+            if step / self.frames_per_pixel >= 90:
+                break
+        frame = int(max(0, first) // step) * step
+        while frame <= last:
+            x = int(self.x_of(frame))
+            painter.drawLine(x, self.RULER_HEIGHT - 6, x, self.RULER_HEIGHT - 1)
+            painter.drawText(x + 3, self.RULER_HEIGHT - 5, format_time_code(frame, rate)[:8])
+            frame += step
+
+    def paint_waveform(self, painter, rect):
+        # Una línea vertical por columna, del mínimo al máximo de sus muestras
+        left = max(0, rect.left())
+        width = rect.right() + 1 - left
+        if width <= 0:
+            return
+        rate = self.store.frame_rate
+        seconds_per_frame = rate.denominator / rate.numerator
+        mins, maxs = self.waveform.peaks(
+            self.frame_at(left) * seconds_per_frame, self.frames_per_pixel * seconds_per_frame, width
+        )
+        middle = self.RULER_HEIGHT + self.WAVE_HEIGHT / 2
+        scale = self.WAVE_HEIGHT / 2 - 1
+        painter.setPen(self.WAVE_COLOR)
+        painter.drawLines([
+            QLineF(x, middle - high * scale, x, middle - low * scale)
+            for x, low, high in zip(range(left, left + width), mins.tolist(), maxs.tolist())
+            if high > low
+        ])
+        painter.setPen(Qt.lightGray)
+        painter.drawLine(0, self.RULER_HEIGHT + self.WAVE_HEIGHT - 1, self.width(), self.RULER_HEIGHT + self.WAVE_HEIGHT - 1)
+
+    def paint_block(self, painter, time_in, time_out, y, lane_height, color, lane):
+        x0 = self.x_of(time_in)
+        width = max(1.0, self.x_of(time_out) - x0)
+        block = QRectF(x0, y + 1, width, lane_height - 2)
+        painter.fillRect(block, color)
+        if width >= self.LABEL_MIN_WIDTH and lane_height >= 14:
+            painter.setPen(Qt.black)
+            name = self.store.character_name(self._lanes[lane])
+            painter.drawText(block.adjusted(3, 0, -2, 0), Qt.AlignVCenter | Qt.AlignLeft, name)
+
+    def paint_selected(self, painter, row_id, y, lane_height):
+        position = self.store.position_of(row_id)
+        if position is None:
+            return
+        line = self.store.row(position)
+        x0 = self.x_of(line.in_frames)
+        painter.setPen(self.SELECTED_PEN)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(QRectF(x0, y + 1, max(1.0, self.x_of(line.out_frames) - x0), lane_height - 2))
+
+    def selected_row_id(self):
+        row = self.table_window.table_view.currentIndex().row()
+        if row < 0 or row >= len(self.store):
+            return None
+        return self.store.get(row, self.store.COL_ID)
+
+    def selected_character(self):
+        row = self.table_window.table_view.currentIndex().row()
+        return self.store.row(row).character_id if 0 <= row < len(self.store) else None
+
+    def set_waveform(self, pyramid):
+        self.waveform = pyramid
+        self.update()
+
+    def set_playhead(self, frame):
+        """Mueve el cabezal repintando solo las dos franjas afectadas."""
+        old_x = int(self.x_of(self.playhead))
+        self.playhead = frame
+        new_x = int(self.x_of(frame))
+        if not 0 <= new_x < self.width() and self.isVisible():
+            # El cabezal ha salido de la vista: pasar de página
+            self.first_frame = max(0.0, frame - self.width() * self.frames_per_pixel * 0.1)
+            self.update()
+            return
+        self.update(QRect(old_x - 1, 0, 3, self.height()))
+        self.update(QRect(new_x - 1, 0, 3, self.height()))
+
+    # --- Ratón ---
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        hit = self.hit_test(event.pos())
+        frame = max(0, int(round(self.frame_at(event.x()))))
+        if hit is None:
+            self.drag = None
+            self.table_window.seek_to_frame(frame)
+            return
+        row_id, part = hit
+        position = self.store.position_of(row_id)
+        line = self.store.row(position)
+        self.table_window.table_view.selectRow(position)
+        self.drag = {
+            'row_id': row_id, 'part': part, 'character_id': line.character_id, 'x': event.x(), 'frame': frame,
+            'in': line.in_frames, 'out': line.out_frames, 'new_in': line.in_frames, 'new_out': line.out_frames,
+        }
+
+    def mouseMoveEvent(self, event):
+        if self.drag is None:
+            hit = self.hit_test(event.pos())
+            self.setCursor(Qt.SizeHorCursor if hit and hit[1] != 'move' else Qt.ArrowCursor)
+            return
+        drag = self.drag
+        delta = int(round((event.x() - drag['x']) * self.frames_per_pixel))
+        if drag['part'] == 'in':
+            drag['new_in'] = max(0, min(drag['in'] + delta, drag['out'] - 1))
+        elif drag['part'] == 'out':
+            drag['new_out'] = max(drag['in'] + 1, drag['out'] + delta)
+        else:
+            delta = max(delta, -drag['in'])
+            drag['new_in'] = drag['in'] + delta
+            drag['new_out'] = drag['out'] + delta
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        drag, self.drag = self.drag, None
+        if drag is None or event.button() != Qt.LeftButton:
+            return
+        if (drag['new_in'], drag['new_out']) == (drag['in'], drag['out']):
+            # Clic sin arrastrar sobre un bloque: el video va a ese punto
+            self.table_window.seek_to_frame(drag['frame'])
+            self.update()
+            return
+        self.table_window.retime_row(drag['row_id'], drag['new_in'], drag['new_out'], drag['part'])
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if not steps:
+            return
+        if event.modifiers() & Qt.ControlModifier:
+            anchor = self.frame_at(event.x())
+            total = max((spans[-1][1] for spans in self._spans if spans), default=0)
+            max_fpp = max(1.0, total / max(1, self.width()) * 2)
+            self.frames_per_pixel = min(max_fpp, max(self.MIN_FRAMES_PER_PIXEL, self.frames_per_pixel / (1.25 ** steps)))
+            self.first_frame = max(0.0, anchor - event.x() * self.frames_per_pixel)
+        elif event.modifiers() & Qt.ShiftModifier:
+            self.first_lane = max(0, min(len(self._lanes) - 1, self.first_lane - int(steps)))
+        else:
+            self.first_frame = max(0.0, self.first_frame - steps * self.width() * self.frames_per_pixel * 0.1)
+        self.update()
+        event.accept()
+
+
+class TimelinePanel(QDockWidget):
+    def __init__(self, table_window, video_player_widget, parent=None):
+        super().__init__("Línea de Tiempo", parent)
+        self.timeline = TimelineWidget(table_window, self)
+        self.setWidget(self.timeline)
+        self.waveform_source = None
+        self.waveform_task = None
+        video_player_widget.playhead_moved.connect(self.timeline.set_playhead)
+        video_player_widget.media_loaded.connect(self.load_waveform)
+
+    def load_waveform(self, media_path):
+        """Muestra la forma de onda del audio de media_path: de la caché si la hay, si no la calcula aparte."""
+        self.timeline.set_waveform(None)
+        self.waveform_source = find_audio_source(media_path)
+        if self.waveform_source is None:
+            return
+        pyramid = load_cached_peaks(self.waveform_source)
+        if pyramid is not None:
+            self.timeline.set_waveform(pyramid)
+            return
+        task = WaveformTask(self.waveform_source)
+        task.signals.finished.connect(self.on_waveform_ready)
+        task.signals.failed.connect(self.on_waveform_failed)
+        self.waveform_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def is_loading_waveform(self):
+        return self.waveform_task is not None
+
+    def on_waveform_ready(self, path, pyramid):
+        self.waveform_task = None
+        if path == self.waveform_source:  # Si no, se ha abierto otro video mientras tanto
+            self.timeline.set_waveform(pyramid)
+
+    def on_waveform_failed(self, path, message):
+        self.waveform_task = None
+        if path == self.waveform_source:
+            QMessageBox.warning(self, "Error", f"No se pudo calcular la forma de onda: {message}")
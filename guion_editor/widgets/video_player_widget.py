@@ -7,7 +7,9 @@ from PyQt5.QtMultimediaWidgets import QVideoWidget
 from PyQt5.QtCore import QUrl, Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QKeySequence, QFont
 
-import os
+from guion_editor.utils.timecode import (
+    DEFAULT_FRAME_RATE, format_time_code, frames_to_milliseconds, milliseconds_to_frames
+)
 
 
 class VideoPlayerWidget(QWidget):
@@ -16,19 +18,27 @@ class VideoPlayerWidget(QWidget):
     """
     in_out_signal = pyqtSignal(str, int)
     out_released = pyqtSignal()
+    # Posición (ms) del OUT mientras se mantiene F6; solo se confirma al soltar (out_released)
+    out_preview = pyqtSignal(int)
+    # Fotograma del cabezal de reproducción, cada vez que cambia
+    playhead_moved = pyqtSignal(int)
+    # Ruta del video recién cargado
+    media_loaded = pyqtSignal(str)
     detach_requested = pyqtSignal(QWidget)
     set_position_signal = pyqtSignal(int)
+    SEEK_INTERVAL = 50  # ms mínimos entre dos saltos enviados al reproductor
 
     def __init__(self):
         super().__init__()
+        self.frame_rate = DEFAULT_FRAME_RATE
+        self.last_frame = None
         self.init_ui()
-        self.load_stylesheet()
         self.setup_shortcuts()
         self.setup_timers()
         self.f6_pressed = False
         self.out_timer = QTimer(self)
-        self.out_timer.setInterval(40)
-        self.out_timer.timeout.connect(self.mark_out)
+        self.out_timer.setInterval(self.frame_interval())
+        self.out_timer.timeout.connect(self.preview_out)
         self.out_timer.setSingleShot(False)
 
     def init_ui(self) -> None:
@@ -131,16 +141,6 @@ class VideoPlayerWidget(QWidget):
 
         self.setLayout(layout)
 
-    def load_stylesheet(self) -> None:
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            css_path = os.path.join(current_dir, '..', 'styles', 'main.css')
-
-            with open(css_path, 'r') as f:
-                self.setStyleSheet(f.read())
-        except Exception as e:
-            QMessageBox.warning(self, "Error de Estilos", f"Error al cargar el stylesheet: {str(e)}")
-
     def setup_shortcuts(self) -> None:
         shortcuts = {
             "F8": self.toggle_play,
@@ -153,30 +153,51 @@ class VideoPlayerWidget(QWidget):
 
     def setup_timers(self) -> None:
         self.timer = QTimer(self)
-        self.timer.setInterval(int(1000 / 25))
+        self.timer.setInterval(self.frame_interval())
         self.timer.timeout.connect(self.update_time_code)
         self.timer.start()
 
+        # Saltos agrupados: mientras seek_timer está activo, solo se guarda el último destino
+        self.seek_target = None  # Último destino pedido (ms), None si no hay saltos en curso
+        self.seek_sent = None    # Último destino enviado al reproductor
+        self.seek_timer = QTimer(self)
+        self.seek_timer.setSingleShot(True)
+        self.seek_timer.setInterval(self.SEEK_INTERVAL)
+        self.seek_timer.timeout.connect(self.flush_seek)
+
+    def frame_interval(self) -> int:
+        return max(1, int(1000 / self.frame_rate.fps))
+
+    def set_frame_rate(self, frame_rate) -> None:
+        self.frame_rate = frame_rate
+        self.timer.setInterval(self.frame_interval())
+        self.out_timer.setInterval(self.frame_interval())
+        self.last_frame = None
+        self.update_time_code()
+
     def start_out_timer(self):
         if not self.out_timer.isActive():
+            self.preview_out()
             self.out_timer.start()
 
     def stop_out_timer(self):
         if self.out_timer.isActive():
             self.out_timer.stop()
+            self.preview_out()  # La posición al soltar es la que se confirma
             self.out_released.emit()
 
+    def preview_out(self) -> None:
+        self.out_preview.emit(self.snapped_position())
+
     def mark_in(self) -> None:
         try:
-            position_ms = self.media_player.position()
-            self.in_out_signal.emit("IN", position_ms)
+            self.in_out_signal.emit("IN", self.snapped_position())
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error en mark_in: {str(e)}")
 
     def mark_out(self) -> None:
         try:
-            position_ms = self.media_player.position()
-            self.in_out_signal.emit("OUT", position_ms)
+            self.in_out_signal.emit("OUT", self.snapped_position())
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error en mark_out: {str(e)}")
 
@@ -187,12 +208,47 @@ class VideoPlayerWidget(QWidget):
             self.media_player.play()
 
     def change_position(self, change: int) -> None:
-        new_position = self.media_player.position() + change
+        new_position = self.current_position() + change
         new_position = max(0, min(new_position, self.media_player.duration()))
-        self.media_player.setPosition(new_position)
+        self.seek(new_position)
+
+    def step_frames(self, count: int) -> None:
+        """Avanza (o retrocede, si count < 0) count fotogramas a la frecuencia del proyecto."""
+        frame = max(0, milliseconds_to_frames(self.current_position(), self.frame_rate) + count)
+        new_position = frames_to_milliseconds(frame, self.frame_rate)
+        if new_position > self.media_player.duration():
+            return
+        self.seek(new_position)
 
     def set_position(self, position: int) -> None:
-        self.media_player.setPosition(position)
+        self.seek(position)
+
+    def seek(self, milliseconds: int) -> None:
+        """
+        Lleva el video a milliseconds. Si llegan saltos muy seguidos (al mantener
+        pulsada la tecla de avanzar un fotograma o al arrastrar la barra), solo
+        se envía el último de cada SEEK_INTERVAL en lugar de encolarlos todos.
+        """
+        self.seek_target = milliseconds
+        if not self.seek_timer.isActive():
+            self.flush_seek()
+
+    def flush_seek(self) -> None:
+        if self.seek_target == self.seek_sent:
+            # Ningún salto nuevo en el último intervalo: se ha terminado
+            self.seek_target = self.seek_sent = None
+            return
+        self.seek_sent = self.seek_target
+        self.media_player.setPosition(self.seek_target)
+        self.seek_timer.start()
+
+    def current_position(self) -> int:
+        """Posición en ms, contando el salto pedido aunque el reproductor aún no haya llegado."""
+        return self.seek_target if self.seek_target is not None else self.media_player.position()
+
+    def snapped_position(self) -> int:
+        """Inicio (ms) del fotograma que se está mostrando: las marcas caen siempre en un fotograma exacto."""
+        return frames_to_milliseconds(milliseconds_to_frames(self.current_position(), self.frame_rate), self.frame_rate)
 
     def set_volume(self, volume: int) -> None:
         self.media_player.setVolume(volume)
@@ -210,17 +266,21 @@ class VideoPlayerWidget(QWidget):
         self.slider.setRange(0, duration)
 
     def update_time_code(self) -> None:
-        position = self.media_player.position()
-        hours, remainder = divmod(position, 3600000)
-        minutes, remainder = divmod(remainder, 60000)
-        seconds, msecs = divmod(remainder, 1000)
-        frames = int(msecs / (1000 / 25))
-        self.time_code_label.setText(f"{hours:02}:{minutes:02}:{seconds:02}:{frames:02}")
+        frames = milliseconds_to_frames(self.current_position(), self.frame_rate)
+        if frames == self.last_frame:
+            return
+        self.last_frame = frames
+        self.time_code_label.setText(format_time_code(frames, self.frame_rate))
+        self.playhead_moved.emit(frames)
 
     def load_video(self, video_path: str) -> None:
         try:
+            # Los saltos pendientes eran del video anterior
+            self.seek_timer.stop()
+            self.seek_target = self.seek_sent = None
             self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(video_path)))
             self.media_player.play()
+            self.media_loaded.emit(video_path)
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Error al cargar el video: {str(e)}")
 
@@ -234,7 +294,7 @@ class VideoPlayerWidget(QWidget):
     def set_position_public(self, milliseconds: int) -> None:
         try:
             if 0 <= milliseconds <= self.media_player.duration():
-                self.media_player.setPosition(milliseconds)
+                self.seek(milliseconds)
             else:
                 QMessageBox.warning(self, "Error", "La posición especificada está fuera del rango del video.")
         except Exception as e:
@@ -246,18 +306,3 @@ class VideoPlayerWidget(QWidget):
     def toggle_volume_slider(self) -> None:
         self.volume_slider_vertical.setVisible(not self.volume_slider_vertical.isVisible())
 
-    def update_fonts(self, font_size: int) -> None:
-        font = QFont()
-        font.setPointSize(font_size)
-
-        self.play_button.setFont(font)
-        self.rewind_button.setFont(font)
-        self.forward_button.setFont(font)
-        self.detach_button.setFont(font)
-        self.in_button.setFont(font)
-        self.out_button.setFont(font)
-        self.volume_button.setFont(font)
-
-        tc_font = QFont()
-        tc_font.setPointSize(max(font_size - 2, 8))
-        self.time_code_label.setFont(tc_font)
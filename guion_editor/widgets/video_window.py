@@ -1,9 +1,8 @@
 # guion_editor/widgets/video_window.py
 
-import os
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QFont
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QPushButton, QMessageBox
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QPushButton
 
 
 class VideoWindow(QMainWindow):
@@ -17,7 +16,6 @@ class VideoWindow(QMainWindow):
         self.setWindowTitle("Reproductor de Video Independiente")
         self.setGeometry(150, 150, 800, 600)
         self.init_ui(video_widget)
-        self.load_stylesheet()
 
     def init_ui(self, video_widget: QWidget) -> None:
         central_widget = QWidget()
@@ -36,16 +34,6 @@ class VideoWindow(QMainWindow):
 
         self.setCentralWidget(central_widget)
 
-    def load_stylesheet(self) -> None:
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            css_path = os.path.join(current_dir, '..', 'styles', 'main.css')
-
-            with open(css_path, 'r') as f:
-                self.setStyleSheet(f.read())
-        except Exception as e:
-            QMessageBox.warning(self, "Error de Estilos", f"Error al cargar el stylesheet: {str(e)}")
-
     def attach_back(self) -> None:
         self.close_detached.emit()
         self.close()
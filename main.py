@@ -1,5 +1,6 @@
 # main.py
 
+import multiprocessing
 import sys
 import traceback
 import json
@@ -9,15 +10,20 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QWidget, QSplitter, QAction,
     QFileDialog, QMessageBox, QDialog, QInputDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QKeySequence, QColor
 
 from guion_editor.widgets.video_player_widget import VideoPlayerWidget
 from guion_editor.widgets.table_window import TableWindow
+from guion_editor.widgets.search_panel import SearchPanel
+from guion_editor.widgets.timeline_panel import TimelinePanel
 from guion_editor.widgets.video_window import VideoWindow
 from guion_editor.widgets.config_dialog import ConfigDialog
 from guion_editor.widgets.shortcut_config_dialog import ShortcutConfigDialog
 from guion_editor.utils.shortcut_manager import ShortcutManager
+from guion_editor.utils.timecode import DEFAULT_FRAME_RATE
+from guion_editor.utils.project_file import PROJECT_EXTENSION
+from guion_editor.utils.theme_manager import ThemeManager, DEFAULT_THEME, DEFAULT_FONT_SIZE
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -27,7 +33,9 @@ class MainWindow(QMainWindow):
 
         # Inicializar valores de configuración
         self.trim_value = 0
-        self.font_size = 12
+        self.font_size = DEFAULT_FONT_SIZE
+        self.theme = DEFAULT_THEME
+        self.frame_rate = DEFAULT_FRAME_RATE
 
         # Crear el widget central y el layout
         central_widget = QWidget()
@@ -42,6 +50,22 @@ class MainWindow(QMainWindow):
         self.splitter.addWidget(self.tableWindow)
         layout.addWidget(self.splitter)
 
+        # Hoja de estilo única para toda la aplicación (tema y tamaño de letra)
+        self.theme_manager = ThemeManager(QApplication.instance(), self)
+        self.theme_manager.theme_changed.connect(self.tableWindow.schedule_visible_row_heights)
+        self.apply_theme()
+
+        # Panel de búsqueda acoplable, oculto hasta que se abre con Ctrl+F
+        self.search_panel = SearchPanel(self.tableWindow, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.search_panel)
+        self.search_panel.hide()
+
+        # Línea de tiempo con las intervenciones de cada personaje
+        self.timeline_panel = TimelinePanel(self.tableWindow, self.videoPlayerWidget, self)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.timeline_panel)
+        self.find_replace_dialog = None
+        self.cast_window = None
+
         # Diccionario para almacenar las acciones
         self.actions = {}
 
@@ -63,10 +87,14 @@ class MainWindow(QMainWindow):
         # Conectar señales
         self.videoPlayerWidget.detach_requested.connect(self.detach_video)
         self.tableWindow.in_out_signal.connect(self.handle_set_position)
+        self.tableWindow.frame_rate_changed.connect(self.on_frame_rate_changed)
 
         # Variable para la ventana independiente
         self.videoWindow = None
 
+        # Ofrecer recuperar el trabajo de una sesión que terminó sin cerrarse
+        QTimer.singleShot(0, self.tableWindow.offer_autosave_recovery)
+
         if "change_scene" not in self.actions:
             # Crear una acción invisible solo para manejar el atajo
             self.actions["change_scene"] = QAction(self)
@@ -90,6 +118,9 @@ class MainWindow(QMainWindow):
             ("&Importar Guion desde Excel", self.tableWindow.import_from_excel, "Ctrl+I"),
             ("&Guardar Guion como JSON", self.tableWindow.save_to_json, "Ctrl+S"),
             ("&Cargar Guion desde JSON", self.tableWindow.load_from_json, "Ctrl+D"),
+            ("Abrir &Proyecto", self.tableWindow.open_project_dialog, None),
+            ("Guardar P&royecto", self.tableWindow.save_project, None),
+            ("Guardar Proyecto &como...", self.tableWindow.save_project_as, None),
         ]
 
         for name, slot, shortcut in actions:
@@ -114,6 +145,9 @@ class MainWindow(QMainWindow):
             ("&Ajustar Diálogos", self.tableWindow.adjust_dialogs, None),
             ("&Separar Intervención", self.tableWindow.split_intervention, "Alt+I"),
             ("&Juntar Intervenciones", self.tableWindow.merge_interventions, "Alt+J"),
+            ("Desplazar &Tiempos", self.tableWindow.shift_time_codes, None),
+            ("&Filtrar por Personaje", self.tableWindow.filter_by_character, None),
+            ("Mostrar &Todos los Personajes", self.tableWindow.clear_character_filter, None),
         ]
 
         view_cast_action = self.create_action("Ver Reparto Completo", self.open_cast_window)
@@ -124,11 +158,25 @@ class MainWindow(QMainWindow):
         editMenu.addAction(find_replace_action)
         self.actions["Buscar y Reemplazar"] = find_replace_action
 
+        search_panel_action = self.create_action("&Buscar en el Guion", self.open_search_panel, "Ctrl+F")
+        editMenu.addAction(search_panel_action)
+        self.actions["&Buscar en el Guion"] = search_panel_action
+
         for name, slot, shortcut in actions:
             action = self.create_action(name, slot, shortcut)
             editMenu.addAction(action)
             self.actions[name] = action
 
+        follow_playback_action = self.create_action("&Seguir Reproducción", self.tableWindow.set_follow_playback)
+        follow_playback_action.setCheckable(True)
+        editMenu.addAction(follow_playback_action)
+        self.actions["&Seguir Reproducción"] = follow_playback_action
+
+        timeline_action = self.timeline_panel.toggleViewAction()
+        timeline_action.setText("&Línea de Tiempo")
+        editMenu.addAction(timeline_action)
+        self.actions["&Línea de Tiempo"] = timeline_action
+
     def create_config_menu(self, menuBar):
         configMenu = menuBar.addMenu("&Configuración")
 
@@ -190,25 +238,53 @@ class MainWindow(QMainWindow):
         self.addAction(forward_action)
         self.actions["Avanzar"] = forward_action
 
+        # Paso a paso y saltos a la fila seleccionada, a la frecuencia del proyecto
+        frame_actions = [
+            ("Fotograma Anterior", lambda: self.videoPlayerWidget.step_frames(-1), "Alt+Left"),
+            ("Fotograma Siguiente", lambda: self.videoPlayerWidget.step_frames(1), "Alt+Right"),
+            ("Ir al IN", lambda: self.tableWindow.seek_to_selected('in'), "Alt+Home"),
+            ("Ir al OUT", lambda: self.tableWindow.seek_to_selected('out'), "Alt+End"),
+        ]
+        for name, slot, shortcut in frame_actions:
+            action = self.create_action(name, slot, shortcut)
+            self.addAction(action)
+            self.actions[name] = action
+
     def open_cast_window(self):
         from guion_editor.widgets.cast_window import CastWindow
-        self.cast_window = CastWindow(self.tableWindow)
+        # Una sola ventana de reparto: al cerrarla deja de escuchar las estadísticas
+        if self.cast_window is None or not self.cast_window.isVisible():
+            self.cast_window = CastWindow(self.tableWindow)
         self.cast_window.show()
+        self.cast_window.raise_()
+        self.cast_window.activateWindow()
 
     def open_find_replace_dialog(self):
         from guion_editor.widgets.find_replace_dialog import FindReplaceDialog
-        dialog = FindReplaceDialog(self.tableWindow)
-        dialog.exec_()
+        # No modal: se puede seguir editando la tabla con el diálogo abierto
+        if self.find_replace_dialog is None or not self.find_replace_dialog.isVisible():
+            self.find_replace_dialog = FindReplaceDialog(self.tableWindow)
+        self.find_replace_dialog.show()
+        self.find_replace_dialog.raise_()
+        self.find_replace_dialog.activateWindow()
+
+    def open_search_panel(self):
+        self.search_panel.show()
+        self.search_panel.raise_()
+        self.search_panel.query_input.setFocus()
+        self.search_panel.query_input.selectAll()
 
     def open_recent_file(self, file_path):
         if os.path.exists(file_path):
             # Determinar si es un video, guion o Excel basado en la extensión
-            if file_path.lower().endswith(('.mp4', '.avi', '.mkv')):
+            if file_path.lower().endswith(('.mp4', '.avi', '.mkv', '.wav')):
                 self.videoPlayerWidget.load_video(file_path)
             elif file_path.lower().endswith('.xlsx'):
                 self.tableWindow.load_from_excel(file_path)
             elif file_path.lower().endswith('.docx'):
                 self.tableWindow.load_data(file_path)
+            elif file_path.lower().endswith(PROJECT_EXTENSION):
+                self.tableWindow.load_project(file_path)
             else:
                 QMessageBox.warning(self, "Error", "Tipo de archivo no soportado.")
         else:
@@ -218,11 +294,21 @@ class MainWindow(QMainWindow):
     def open_config_dialog(self):
         config_dialog = ConfigDialog(
             current_trim=self.trim_value,
-            current_font_size=self.font_size
+            current_font_size=self.font_size,
+            current_theme=self.theme,
+            current_frame_rate=self.frame_rate,
+            current_wrap_rules=self.tableWindow.wrap_rules
         )
         if config_dialog.exec_() == QDialog.Accepted:
-            self.trim_value, self.font_size = config_dialog.get_values()
-            self.apply_font_size()
+            self.trim_value, self.font_size, self.theme, frame_rate, wrap_rules = config_dialog.get_values()
+            self.apply_theme()
+            self.tableWindow.set_frame_rate(frame_rate)
+            self.tableWindow.wrap_rules = wrap_rules
+
+    def on_frame_rate_changed(self, frame_rate):
+        # La tabla es la fuente de verdad (el cambio de frecuencia se puede deshacer)
+        self.frame_rate = frame_rate
+        self.videoPlayerWidget.set_frame_rate(frame_rate)
 
     def add_to_recent_files(self, file_path):
         if file_path in self.recent_files:
@@ -251,23 +337,12 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", f"Error al guardar archivos recientes: {str(e)}")
 
 
-    def apply_font_size(self):
-        # Ajustar el tamaño de la fuente en la tabla del guion
-        font = self.tableWindow.tableWidget.font()
-        font.setPointSize(self.font_size)
-        self.tableWindow.tableWidget.setFont(font)
-
-        # Ajustar la fuente de los encabezados
-        header = self.tableWindow.tableWidget.horizontalHeader()
-        header_font = header.font()
-        header_font.setPointSize(self.font_size)
-        header.setFont(header_font)
-
-        # Ajustar la fuente de los diálogos
-        self.tableWindow.apply_font_size_to_dialogs(self.font_size)
-
-        # Actualizar fuentes en VideoPlayerWidget
-        self.videoPlayerWidget.update_fonts(self.font_size)
+    def apply_theme(self):
+        # Un solo cambio de hoja de estilo; la tabla vuelve a medir solo las filas visibles
+        try:
+            self.theme_manager.apply(self.theme, self.font_size)
+        except Exception as e:
+            QMessageBox.warning(self, "Error de Estilos", f"Error al cargar el stylesheet: {str(e)}")
 
     def open_shortcut_config_dialog(self):
         dialog = ShortcutConfigDialog(self.shortcut_manager)
@@ -306,7 +381,7 @@ class MainWindow(QMainWindow):
                     self.create_shortcuts_menu(menuBar=self.menuBar())
 
     def open_video_file(self):
-        file_name, _ = QFileDialog.getOpenFileName(self, "Abrir Video", "", "Videos (*.mp4 *.avi *.mkv)")
+        file_name, _ = QFileDialog.getOpenFileName(self, "Abrir Video", "", "Videos (*.mp4 *.avi *.mkv);;Audio (*.wav)")
         if file_name:
             self.videoPlayerWidget.load_video(file_name)
             self.add_to_recent_files(file_name)
@@ -365,15 +440,13 @@ class MainWindow(QMainWindow):
         self.tableWindow.change_scene()
 
     def increment_scenes_from_row(self, start_row):
-        total_rows = self.tableWindow.table_widget.rowCount()
-        for row in range(start_row, total_rows):
-            scene_item = self.tableWindow.table_widget.item(row, 0)
-            if scene_item:
-                try:
-                    current_scene = int(scene_item.text())
-                    scene_item.setText(str(current_scene + 1))  # Incrementar el número de escena
-                except ValueError:
-                    print(f"Advertencia: El valor en la fila {row} no es un número válido.")
+        model = self.tableWindow.table_model
+        for row in range(start_row, model.rowCount()):
+            try:
+                current_scene = int(model.get_value(row, self.tableWindow.COL_SCENE))
+                model.set_value(row, self.tableWindow.COL_SCENE, current_scene + 1)  # Incrementar el número de escena
+            except ValueError:
+                print(f"Advertencia: El valor en la fila {row} no es un número válido.")
 
     def closeEvent(self, event):
         # Verificar si hay cambios sin guardar en TableWindow
@@ -404,6 +477,10 @@ class MainWindow(QMainWindow):
         else:
             event.accept()
 
+        if event.isAccepted():
+            # Cierre limpio: el autoguardado ya no hace falta
+            self.tableWindow.journal.close()
+
 def handle_exception(exc_type, exc_value, exc_traceback):
     if issubclass(exc_type, KeyboardInterrupt):
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
@@ -418,4 +495,6 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    # En el ejecutable de PyInstaller, los procesos de trabajo arrancan desde aquí
+    multiprocessing.freeze_support()
     main()